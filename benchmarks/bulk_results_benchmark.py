@@ -0,0 +1,164 @@
+"""
+This file benchmarks submitting the results of a whole round. It
+creates an event with a ranking for every player, then times sending
+their new results one 'POST /rankings/' at a time against sending them
+all in a single 'POST /rankings/bulk', and counts the statements each
+one ran.
+
+It exits with an error when the bulk results do not match the ones
+sent one at a time, so it can be run as a check after changing the
+bulk submission code.
+
+Usage (from the project root):
+    python -m benchmarks.bulk_results_benchmark --players 256
+"""
+
+# Built-in imports
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+def _build_app(arguments):
+    """
+    Create the app against the benchmark database, recreating it with
+    enough players for the event.
+    """
+    os.environ["DATABASE_URI"] = arguments.database_uri
+    os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+
+    # Imported here so the environment above is in place first
+    from main import create_app
+    from init import db
+    from utils.synthetic_data import generate
+
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        generate(
+            {
+                "cards": 1,
+                "decks": 1,
+                "players": arguments.players,
+                "organisers": 1,
+                "venues": 1,
+                "events": 2,
+            },
+            seed = arguments.seed,
+            report = lambda line: print(line, file = sys.stderr)
+        )
+    return app
+
+
+def _round_results(player_ids, seed):
+    """
+    A round's worth of results for every player.
+    """
+    generator = random.Random(seed)
+    results = []
+    for player_id in player_ids:
+        wins, losses = generator.randint(0, 5), generator.randint(0, 5)
+        results.append({
+            "player_id": player_id,
+            "wins": wins,
+            "losses": losses,
+            "ties": 0,
+            "points": 3 * wins
+        })
+    return results
+
+
+def _count_statements(app, function):
+    """
+    Run the function, returning how long it took and the statements it
+    sent to the database.
+    """
+    from sqlalchemy import event
+    from init import db
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+
+    def count(*_):
+        statements.append(1)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return elapsed, len(statements)
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark bulk ranking submission.")
+    parser.add_argument("--database-uri", default = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'digiscan_bulk_results.sqlite')}")
+    parser.add_argument("--players", type = int, default = 256)
+    parser.add_argument("--seed", type = int, default = 0)
+    arguments = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    app = _build_app(arguments)
+
+    from init import db
+    from models.player import Player
+    from models.ranking import Ranking
+
+    client = app.test_client()
+    events = [
+        client.post("/events/", json = {
+            "organiser_id": 1,
+            "venue_id": 1,
+            "event_name": f"Digimon Store Championship {number}",
+            "event_status": "Running"
+        }).get_json()["event_id"]
+        for number in (1, 2)
+    ]
+    with app.app_context():
+        player_ids = list(db.session.scalars(
+            db.select(Player.player_id).order_by(Player.player_id).limit(arguments.players)
+        ))
+    results = _round_results(player_ids, arguments.seed)
+
+    def one_at_a_time():
+        for result in results:
+            client.post("/rankings/", json = {"event_id": events[0], **result})
+
+    def bulk():
+        response = client.post("/rankings/bulk", json = {"event_id": events[1], "rankings": results})
+        assert response.status_code == 201, response.get_json()
+
+    print(f"{'submission':15} {'requests':>9} {'statements':>11} {'total ms':>9}")
+    for name, function, requests in (
+        ("one at a time", one_at_a_time, len(results)),
+        ("bulk", bulk, 1),
+    ):
+        elapsed, statements = _count_statements(app, function)
+        print(f"{name:15} {requests:>9} {statements:>11} {elapsed * 1000:>9.0f}")
+
+    # Both events should now hold the same results
+    with app.app_context():
+        recorded = []
+        for event_id in events:
+            statement = (
+                db.select(Ranking.player_id, Ranking.wins, Ranking.losses, Ranking.ties, Ranking.points)
+                .where(Ranking.event_id == event_id)
+                .order_by(Ranking.player_id)
+            )
+            recorded.append(db.session.execute(statement).all())
+
+    if recorded[0] != recorded[1]:
+        print("The bulk results do not match the ones sent one at a time.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
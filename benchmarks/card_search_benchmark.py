@@ -0,0 +1,106 @@
+"""
+This file benchmarks the card search index. It seeds a database with
+synthetic cards, builds the index, and times a mix of prefix, substring,
+card number and misspelt searches against it.
+
+It exits with an error when any search took longer than the budget,
+so it can be run as a check after changing the search code.
+
+Usage (from the project root):
+    python -m benchmarks.card_search_benchmark --cards 50000
+"""
+
+# Built-in imports
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+
+# Searches players make, from a few letters to a misspelt name
+QUERIES = (
+    "a",
+    "Agu",
+    "greymon",
+    "Garurumon",
+    "Greymn",
+    "Angemn",
+    "SYN0-00012",
+    "SYN0-",
+    "lillymon 12",
+    "impmon 4999",
+)
+
+
+def _build_app(arguments):
+    """
+    Create the app against the benchmark database, recreating it with
+    the given number of cards and a handful of every other record.
+    """
+    os.environ["DATABASE_URI"] = arguments.database_uri
+
+    # Imported here so the environment above is in place first
+    from main import create_app
+    from init import db
+    from utils.synthetic_data import generate
+
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        generate(
+            {
+                "cards": arguments.cards,
+                "decks": 1,
+                "players": 1,
+                "organisers": 1,
+                "venues": 1,
+                "events": 1,
+            },
+            seed = arguments.seed,
+            report = lambda line: print(line, file = sys.stderr)
+        )
+    return app
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark the card search index.")
+    parser.add_argument("--database-uri", default = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'digiscan_search.sqlite')}")
+    parser.add_argument("--cards", type = int, default = 50000)
+    parser.add_argument("--repeat", type = int, default = 20)
+    parser.add_argument("--limit", type = int, default = 50)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--budget-ms", type = float, default = 50.0, help = "Slowest a single search may take.")
+    arguments = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    app = _build_app(arguments)
+
+    slowest = 0.0
+    with app.app_context():
+        index = app.extensions["card_search"]
+
+        start = time.perf_counter()
+        index.rebuild()
+        print(f"Index of {arguments.cards} cards built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        print(f"{'query':15} {'results':>8} {'median ms':>10} {'max ms':>8}")
+        for query in QUERIES:
+            timings = []
+            for _ in range(arguments.repeat):
+                start = time.perf_counter()
+                results = index.search(query, limit = arguments.limit)
+                timings.append((time.perf_counter() - start) * 1000)
+            slowest = max(slowest, max(timings))
+            print(f"{query:15} {len(results):>8} {statistics.median(timings):>10.2f} {max(timings):>8.2f}")
+
+    if slowest > arguments.budget_ms:
+        print(f"Slowest search took longer than the {arguments.budget_ms:.0f} ms budget.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,397 @@
+"""
+This file benchmarks every API route end to end. It builds the Flask 
+app through create_app(), fills a local database with synthetic data 
+of a chosen size, then drives each blueprint's list, get by ID, 
+filtered list, create, update and delete routes through the Flask test 
+client from several threads at once.
+
+For every route it records the p50/p95/p99 latency, throughput and the 
+number of SQL statements each request ran, and writes them to a JSON 
+report. Passing an earlier report with --compare prints the change for 
+each route and exits with an error when a route has regressed.
+
+Usage (from the project root):
+    python -m benchmarks.http_benchmark --players 5000 --output after.json
+    python -m benchmarks.http_benchmark --compare before.json
+
+The database defaults to a temporary SQLite file. Point --database-uri 
+at a PostgreSQL database to benchmark against the real thing, it will 
+be dropped and recreated unless --skip-seed is given.
+"""
+
+# Built-in imports
+import argparse
+import itertools
+import json
+import os
+import queue
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+
+
+"""
+Query Counting
+"""
+
+# Statements run by the request currently being handled on each thread
+_statements = threading.local()
+
+
+def _count_statement(*args):
+    _statements.count = getattr(_statements, "count", 0) + 1
+
+
+"""
+Route Scenarios
+"""
+
+# The key in each created row's response that later scenarios update and 
+# delete it by
+CREATED_KEYS = {
+    "cards": "card_id",
+    "decks": "deck_id",
+    "players": "player_id",
+    "organisers": "organiser_id",
+    "venues": "venue_id",
+    "events": "event_id",
+    "collections": "collection_id",
+}
+
+
+class Scenario:
+    """
+    One route to benchmark. make_request is called with a running 
+    request number and returns the method, URL and JSON body to send.
+    Statuses lists the responses that count as a success.
+    """
+
+    def __init__(self, name, make_request, statuses = (200,)):
+        self.name = name
+        self.make_request = make_request
+        self.statuses = statuses
+
+
+def _scenarios(sizes, fixtures):
+    """
+    Build the scenarios for every blueprint. IDs are spread over the 
+    seeded rows, and rows created by the create scenarios are the ones 
+    later updated and deleted, so the seeded data is left alone.
+    """
+    unique = itertools.count(1)
+    created = {resource: queue.Queue() for resource in CREATED_KEYS}
+
+    def pick(count, index):
+        # Walk through the seeded IDs in a fixed stride
+        return (index * 7919) % count + 1
+
+    def created_id(resource):
+        # Take a created row off the queue, it is about to be deleted
+        return created[resource].get_nowait()
+
+    def any_created_id(resource, index):
+        # Look at a created row without taking it off the queue
+        rows = created[resource].queue
+        if not rows:
+            raise queue.Empty
+        return rows[index % len(rows)]
+
+    def entity(resource, make_body, update_body):
+        """
+        The list, get, create, update and delete routes shared by the 
+        card, deck, player, organiser and venue blueprints.
+        """
+        count = sizes[resource]
+        return [
+            Scenario(f"GET /{resource}/", lambda i: ("GET", f"/{resource}/", None)),
+            Scenario(f"GET /{resource}/<id>", lambda i: ("GET", f"/{resource}/{pick(count, i)}", None)),
+            Scenario(f"POST /{resource}/", lambda i: ("POST", f"/{resource}/", make_body(next(unique))), (201,)),
+            Scenario(f"PATCH /{resource}/<id>", lambda i: ("PATCH", f"/{resource}/{any_created_id(resource, i)}", update_body(i))),
+            Scenario(f"DELETE /{resource}/<id>", lambda i: ("DELETE", f"/{resource}/{created_id(resource)}", None)),
+        ]
+
+    scenarios = []
+    scenarios += entity("cards", lambda n: {
+        "card_number": f"BENCH-{os.getpid()}-{n}", 
+        "card_name": f"Benchmon {n}", 
+        "card_type": "Digimon", 
+        "card_rarity": "Common"
+    }, lambda i: {"card_name": f"Benchmon {i}"})
+    scenarios += entity("decks", lambda n: {"deck_name": f"Bench deck {n}"}, lambda i: {"deck_name": f"Bench deck {i}"})
+    scenarios += entity("players", lambda n: {"player_name": f"Bench player {n}"}, lambda i: {"player_name": f"Bench player {i}"})
+    scenarios += entity("organisers", lambda n: {"organiser_name": f"Bench organiser {n}"}, lambda i: {"organiser_name": f"Bench organiser {i}"})
+    scenarios += entity("venues", lambda n: {"venue_name": f"Bench venue {n}"}, lambda i: {"venue_name": f"Bench venue {i}"})
+
+    # Junction tables and events: list, filtered list, create and delete
+    scenarios += [
+        Scenario("GET /events/", lambda i: ("GET", "/events/", None)),
+        Scenario("GET /events/?organiser_id=", lambda i: ("GET", f"/events/?organiser_id={pick(sizes['organisers'], i)}", None), (200, 404)),
+        Scenario("POST /events/", lambda i: ("POST", "/events/", {
+            "organiser_id": pick(sizes["organisers"], i), 
+            "venue_id": pick(sizes["venues"], i), 
+            "event_name": f"Bench event {next(unique)}", 
+            "player_cap": 64, 
+            "event_date": date.today().isoformat(), 
+            "event_status": "Planned"
+        }), (201,)),
+        Scenario("DELETE /events/<id>", lambda i: ("DELETE", f"/events/{created_id('events')}", None)),
+        Scenario("GET /decklists/", lambda i: ("GET", "/decklists/", None)),
+        Scenario("GET /decklists/?deck_id=", lambda i: ("GET", f"/decklists/?deck_id={pick(sizes['decks'], i)}", None), (200, 404)),
+        Scenario("POST /decklists/", lambda i: ("POST", "/decklists/", {
+            "deck_id": fixtures["deck_id"], 
+            "card_id": i + 1, 
+            "card_quantity": 1
+        }), (201,)),
+        Scenario("DELETE /decklists/<deck_id>&<card_id>", lambda i: ("DELETE", f"/decklists/deck_id={fixtures['deck_id']}&card_id={i + 1}", None)),
+        Scenario("GET /collections/", lambda i: ("GET", "/collections/", None)),
+        Scenario("GET /collections/?player_id=", lambda i: ("GET", f"/collections/?player_id={pick(sizes['players'], i)}", None), (200, 404)),
+        Scenario("POST /collections/", lambda i: ("POST", "/collections/", {
+            "player_id": pick(sizes["players"], i), 
+            "deck_id": fixtures["deck_id"]
+        }), (201,)),
+        Scenario("DELETE /collections/<id>", lambda i: ("DELETE", f"/collections/{created_id('collections')}", None)),
+        Scenario("GET /registrations/", lambda i: ("GET", "/registrations/", None)),
+        Scenario("GET /registrations/?event_id=", lambda i: ("GET", f"/registrations/?event_id={pick(sizes['events'], i)}", None), (200, 404)),
+        Scenario("POST /registrations/", lambda i: ("POST", "/registrations/", {
+            "event_id": fixtures["event_id"], 
+            "player_id": i + 1, 
+            "registration_date": date.today().isoformat()
+        }), (201,)),
+        Scenario("GET /rankings/", lambda i: ("GET", "/rankings/", None)),
+        Scenario("GET /rankings/?event_id=", lambda i: ("GET", f"/rankings/?event_id={pick(sizes['events'], i)}", None), (200, 404)),
+        Scenario("POST /rankings/", lambda i: ("POST", "/rankings/", {
+            "event_id": fixtures["event_id"], 
+            "player_id": i + 1, 
+            "placement": 0
+        }), (201,)),
+    ]
+    return scenarios, created
+
+
+"""
+Load Generation
+"""
+
+def _percentile(sorted_values, percent):
+    """
+    Nearest rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def _run_scenario(app, scenario, created, request_count, threads):
+    """
+    Send request_count requests for one scenario from a pool of threads 
+    and summarise their latency, throughput and query counts.
+    """
+    timings = []
+    statements = []
+    errors = 0
+    lock = threading.Lock()
+    local = threading.local()
+
+    def send(index):
+        nonlocal errors
+        # Each thread keeps its own test client
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        try:
+            method, url, body = scenario.make_request(index)
+        except queue.Empty:
+            # Nothing left to update or delete
+            return
+
+        _statements.count = 0
+        started = time.perf_counter()
+        response = local.client.open(url, method = method, json = body)
+        elapsed = time.perf_counter() - started
+
+        with lock:
+            timings.append(elapsed)
+            statements.append(_statements.count)
+            if response.status_code not in scenario.statuses:
+                errors += 1
+
+        # Remember created rows so they can be updated and deleted later
+        if method == "POST" and response.status_code == 201:
+            resource = url.strip("/").split("/")[0]
+            if resource in created:
+                created[resource].put(response.get_json()[CREATED_KEYS[resource]])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers = threads) as pool:
+        list(pool.map(send, range(request_count)))
+    wall_time = time.perf_counter() - started
+
+    timings.sort()
+    milliseconds = lambda value: None if value is None else round(value * 1000, 3)
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "p50_ms": milliseconds(_percentile(timings, 50)),
+        "p95_ms": milliseconds(_percentile(timings, 95)),
+        "p99_ms": milliseconds(_percentile(timings, 99)),
+        "mean_ms": milliseconds(statistics.fmean(timings)) if timings else None,
+        "throughput_rps": round(len(timings) / wall_time, 2) if wall_time else None,
+        "queries_per_request": round(statistics.fmean(statements), 2) if statements else None,
+    }
+
+
+"""
+Setup and Reporting
+"""
+
+def _build_app(arguments):
+    """
+    Create the app against the benchmark database, recreating and 
+    seeding it unless told to reuse the existing data.
+    """
+    os.environ["DATABASE_URI"] = arguments.database_uri
+    if arguments.no_cache:
+        os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+
+    # Imported here so the environment above is in place first
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from sqlalchemy import event
+    from main import create_app
+    from init import db
+    from utils.synthetic_data import generate
+
+    app = create_app()
+    with app.app_context():
+        if not arguments.skip_seed:
+            db.drop_all()
+            db.create_all()
+            generate(
+                {
+                    "cards": arguments.cards,
+                    "decks": arguments.decks,
+                    "players": arguments.players,
+                    "organisers": arguments.organisers,
+                    "venues": arguments.venues,
+                    "events": arguments.events,
+                }, 
+                seed = arguments.seed, 
+                report = lambda line: print(line, file = sys.stderr)
+            )
+        event.listen(db.engine, "before_cursor_execute", _count_statement)
+    return app
+
+
+def _fixtures(app):
+    """
+    Create an empty deck and event for the create scenarios to add 
+    decklists, registrations and rankings to without clashing with 
+    the seeded rows.
+    """
+    client = app.test_client()
+    deck = client.post("/decks/", json = {"deck_name": "Benchmark deck"}).get_json()
+    event = client.post("/events/", json = {
+        "organiser_id": 1, 
+        "venue_id": 1, 
+        "event_name": "Benchmark event", 
+        "player_cap": 100000, 
+        "event_status": "Running"
+    }).get_json()
+    return {"deck_id": deck["deck_id"], "event_id": event["event_id"]}
+
+
+def compare_reports(baseline, current, threshold):
+    """
+    Print the change in p95 latency and throughput for every route both 
+    reports share. Returns the routes that got slower by more than the 
+    threshold percentage.
+    """
+    regressions = []
+    print(f"{'route':45} {'p95 ms':>20} {'req/s':>20}")
+    for name, result in current["routes"].items():
+        before = baseline["routes"].get(name)
+        if not before or not before["p95_ms"] or not result["p95_ms"]:
+            continue
+        latency_change = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+        throughput_change = (result["throughput_rps"] - before["throughput_rps"]) / before["throughput_rps"] * 100
+        flag = " REGRESSION" if latency_change > threshold else ""
+        print(
+            f"{name:45} {before['p95_ms']:>8} -> {result['p95_ms']:<8} "
+            f"{before['throughput_rps']:>8} -> {result['throughput_rps']:<8}"
+            f"({latency_change:+.1f}% / {throughput_change:+.1f}%){flag}"
+        )
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark every API route end to end.")
+    parser.add_argument("--database-uri", default = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'digiscan_benchmark.sqlite')}")
+    parser.add_argument("--cards", type = int, default = 2000)
+    parser.add_argument("--decks", type = int, default = 1000)
+    parser.add_argument("--players", type = int, default = 2000)
+    parser.add_argument("--organisers", type = int, default = 20)
+    parser.add_argument("--venues", type = int, default = 40)
+    parser.add_argument("--events", type = int, default = 100)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--skip-seed", action = "store_true", help = "Reuse the data already in the database.")
+    parser.add_argument("--no-cache", action = "store_true", help = "Switch the response cache off.")
+    parser.add_argument("--requests", type = int, default = 200, help = "Requests sent per route.")
+    parser.add_argument("--threads", type = int, default = 8)
+    parser.add_argument("--routes", default = "", help = "Only run routes whose name contains this text.")
+    parser.add_argument("--output", default = "benchmark_report.json")
+    parser.add_argument("--compare", help = "An earlier report to compare against.")
+    parser.add_argument("--threshold", type = float, default = 10.0, help = "Percent p95 slowdown counted as a regression.")
+    arguments = parser.parse_args(argv)
+
+    app = _build_app(arguments)
+    sizes = {
+        "cards": arguments.cards, 
+        "decks": arguments.decks, 
+        "players": arguments.players, 
+        "organisers": arguments.organisers, 
+        "venues": arguments.venues, 
+        "events": arguments.events
+    }
+    scenarios, created = _scenarios(sizes, _fixtures(app))
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "database": arguments.database_uri.split("://")[0],
+            "sizes": sizes,
+            "requests_per_route": arguments.requests,
+            "threads": arguments.threads,
+            "response_cache": not arguments.no_cache,
+        },
+        "routes": {},
+    }
+    for scenario in scenarios:
+        if arguments.routes not in scenario.name:
+            continue
+        result = _run_scenario(app, scenario, created, arguments.requests, arguments.threads)
+        report["routes"][scenario.name] = result
+        print(
+            f"{scenario.name:45} p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, "
+            f"p99 {result['p99_ms']} ms, {result['throughput_rps']} req/s, "
+            f"{result['queries_per_request']} queries, {result['errors']} errors"
+        )
+
+    with open(arguments.output, "w", encoding = "utf-8") as output:
+        json.dump(report, output, indent = 2)
+    print(f"Report written to {arguments.output}")
+
+    if arguments.compare:
+        with open(arguments.compare, encoding = "utf-8") as baseline_file:
+            regressions = compare_reports(json.load(baseline_file), report, arguments.threshold)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
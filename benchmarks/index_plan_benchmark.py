@@ -0,0 +1,200 @@
+"""
+This file benchmarks the filtered list routes against large tables. It
+seeds a database with synthetic data, a million or so rows in the
+decklist, registration and ranking tables by default, then requests
+every filtered GET route ('/rankings/?event_id=' and the rest) and asks
+the database for the plan of the query each one ran.
+
+It exits with an error when any of those queries reads its whole table
+rather than going through an index, so it can be run as a check after
+changing the models or the routes. Point it at PostgreSQL with
+--database-uri to check the plans of the production database, and pass
+--reuse to run against a database seeded by an earlier run.
+
+Usage (from the project root):
+    python -m benchmarks.index_plan_benchmark
+    python -m benchmarks.index_plan_benchmark --decks 2000 --events 500
+"""
+
+# Built-in imports
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+
+# The filtered list routes, the table each one reads and the column
+# its filter is on
+ROUTES = (
+    ("/rankings/", "rankings", "event_id"),
+    ("/rankings/", "rankings", "player_id"),
+    ("/registrations/", "registrations", "event_id"),
+    ("/registrations/", "registrations", "player_id"),
+    ("/collections/", "collections", "player_id"),
+    ("/collections/", "collections", "deck_id"),
+    ("/decklists/", "decklists", "deck_id"),
+    ("/decklists/", "decklists", "card_id"),
+    ("/events/", "events", "organiser_id"),
+    ("/events/", "events", "venue_id"),
+)
+
+
+def _build_app(arguments):
+    """
+    Create the app against the benchmark database, recreating it with
+    the given amount of synthetic data unless an earlier run's data is
+    being reused.
+    """
+    os.environ["DATABASE_URI"] = arguments.database_uri
+    os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+
+    # Imported here so the environment above is in place first
+    from main import create_app
+    from init import db
+    from utils.synthetic_data import generate
+
+    app = create_app()
+    with app.app_context():
+        if not arguments.reuse:
+            db.drop_all()
+            db.create_all()
+            generate(
+                {
+                    "cards": arguments.cards,
+                    "decks": arguments.decks,
+                    "players": arguments.players,
+                    "organisers": arguments.organisers,
+                    "venues": arguments.venues,
+                    "events": arguments.events,
+                },
+                seed = arguments.seed,
+                report = lambda line: print(line, file = sys.stderr)
+            )
+
+        # Fresh statistics so the planner knows how big the tables are
+        with db.engine.connect().execution_options(isolation_level = "AUTOCOMMIT") as connection:
+            connection.exec_driver_sql("ANALYZE")
+    return app
+
+
+def _filter_value(table, column):
+    """
+    A value of the column from the middle of the table to filter on.
+    """
+    from init import db
+
+    table = db.metadata.tables[table]
+    statement = db.select(table.c[column]).order_by(table.c[column])
+    count = db.session.scalar(db.select(db.func.count()).select_from(table))
+    return db.session.scalar(statement.offset(count // 2).limit(1))
+
+
+def _capture_statements(engine):
+    """
+    Listen for the statements sent to the database, returning the list
+    they are collected in and a function to stop listening.
+    """
+    from sqlalchemy import event
+
+    statements = []
+
+    def capture(connection, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", capture)
+
+
+def _full_scans(connection, statement, parameters, table):
+    """
+    Ask the database for the plan of the statement. Returns the steps
+    of the plan that read the whole table, either row by row or by
+    walking every entry of an index to get the rows in order.
+    """
+    if connection.dialect.name == "postgresql":
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        scans = []
+        nodes = [plan[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            if node.get("Relation Name") == table and (
+                node["Node Type"] == "Seq Scan"
+                or (node["Node Type"].startswith("Index") and "Index Cond" not in node)
+            ):
+                scans.append(f"{node['Node Type']} on {table}")
+            nodes.extend(node.get("Plans", ()))
+        return scans
+
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[-1] for row in rows if row[-1].startswith(f"SCAN {table}")]
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Check the filtered list routes read through an index.")
+    parser.add_argument("--database-uri", default = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'digiscan_index_plan.sqlite')}")
+    parser.add_argument("--cards", type = int, default = 5000)
+    parser.add_argument("--decks", type = int, default = 62500)
+    parser.add_argument("--players", type = int, default = 50000)
+    parser.add_argument("--organisers", type = int, default = 500)
+    parser.add_argument("--venues", type = int, default = 1000)
+    parser.add_argument("--events", type = int, default = 16000)
+    parser.add_argument("--repeat", type = int, default = 20)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--reuse", action = "store_true", help = "Use the data of an earlier run.")
+    arguments = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    app = _build_app(arguments)
+
+    from init import db
+
+    client = app.test_client()
+    failures = []
+    with app.app_context():
+        print(f"{'route':32} {'rows in table':>14} {'median ms':>10}  plan")
+        for path, table, column in ROUTES:
+            value = _filter_value(table, column)
+            url = f"{path}?{column}={value}"
+            rows = db.session.scalar(
+                db.select(db.func.count()).select_from(db.metadata.tables[table])
+            )
+
+            # Time the route, then capture the queries of one request
+            timings = []
+            for _ in range(arguments.repeat):
+                start = time.perf_counter()
+                client.get(url)
+                timings.append((time.perf_counter() - start) * 1000)
+            statements, stop = _capture_statements(db.engine)
+            try:
+                client.get(url)
+            finally:
+                stop()
+
+            # The route's main query is the first one reading its table
+            statement, parameters = next(
+                (statement, parameters) for statement, parameters in statements
+                if f"FROM {table}" in statement
+            )
+            with db.engine.connect() as connection:
+                scans = _full_scans(connection, statement, parameters, table)
+
+            plan = "; ".join(scans) if scans else "index"
+            print(f"{url:32} {rows:>14} {statistics.median(timings):>10.2f}  {plan}")
+            if scans:
+                failures.append(url)
+
+    if failures:
+        print(f"These routes read their whole table: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
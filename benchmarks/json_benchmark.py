@@ -0,0 +1,83 @@
+"""
+This file benchmarks the JSON encoders the app can use for its
+responses. It seeds a database with synthetic data, displays a large
+page of cards and of rankings the way the list routes do, and times
+building the response for each with the standard library encoder and
+with orjson.
+
+It exits with an error when the two encoders produce JSON that reads
+back differently, so it can be run as a check after changing the JSON
+provider.
+
+Usage (from the project root):
+    python -m benchmarks.json_benchmark --rows 5000 --repeat 5
+"""
+
+# Built-in imports
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+# Local imports
+from benchmarks.serialiser_benchmark import _best_time, _build_app
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark the JSON encoders.")
+    parser.add_argument("--database-uri", default = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'digiscan_json.sqlite')}")
+    parser.add_argument("--rows", type = int, default = 5000, help = "Records in each payload.")
+    parser.add_argument("--repeat", type = int, default = 5)
+    parser.add_argument("--seed", type = int, default = 0)
+    arguments = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    app = _build_app(arguments)
+
+    from init import db
+    from models.card import Card
+    from models.ranking import Ranking
+    from schemas.card_schema import cards_schema
+    from schemas.ranking_schema import rankings_schema
+    from utils.fast_dump import fast_dump
+    from utils.json_provider import OrjsonJSONProvider, StdlibJSONProvider, orjson
+    from utils.query_shaping import eager_load
+
+    if orjson is None:
+        print("orjson is not installed, only the standard library encoder is available.")
+        return 1
+
+    providers = {}
+    for name, provider_class in (("stdlib", StdlibJSONProvider), ("orjson", OrjsonJSONProvider)):
+        provider = providers[name] = provider_class(app)
+        provider.sort_keys = False
+
+    mismatches = []
+    print(f"{'payload':10} {'rows':>6} {'bytes':>9} {'stdlib ms':>10} {'orjson ms':>10} {'speedup':>8}")
+    with app.test_request_context():
+        for label, model, schema in (("cards", Card, cards_schema), ("rankings", Ranking, rankings_schema)):
+            statement = eager_load(db.select(model).limit(arguments.rows), model, schema)
+            payload = fast_dump(schema, db.session.scalars(statement).unique().all())
+
+            timings = {}
+            bodies = {}
+            for name, provider in providers.items():
+                response, timings[name] = _best_time(lambda: provider.response(payload), arguments.repeat)
+                bodies[name] = response.get_data()
+
+            if json.loads(bodies["stdlib"]) != json.loads(bodies["orjson"]):
+                mismatches.append(label)
+            print(
+                f"{label:10} {len(payload):>6} {len(bodies['orjson']):>9} {timings['stdlib']:>10.2f} "
+                f"{timings['orjson']:>10.2f} {timings['stdlib'] / timings['orjson']:>7.1f}x"
+            )
+
+    if mismatches:
+        print(f"The encoders disagree on: {', '.join(mismatches)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+This file benchmarks signing up for a popular event the moment
+registrations open. It creates an event with a player cap, then has
+hundreds of players send 'POST /registrations/' for it at once from a
+pool of threads, and reports the throughput and latency along with how
+many were admitted and how many were put on the waitlist.
+
+It exits with an error when more players were admitted than the cap
+allows or the event's registration count does not match its
+registrations, so it can be run as a check after changing the
+admission code. Point it at PostgreSQL with --database-uri to measure
+the row locking the production database does.
+
+Usage (from the project root):
+    python -m benchmarks.registration_benchmark --registrants 500 --cap 128
+"""
+
+# Built-in imports
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _build_app(arguments):
+    """
+    Create the app against the benchmark database, recreating it with
+    enough players for every registrant.
+    """
+    os.environ["DATABASE_URI"] = arguments.database_uri
+    os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+
+    # Imported here so the environment above is in place first
+    from main import create_app
+    from init import db
+    from utils.synthetic_data import generate
+
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        generate(
+            {
+                "cards": 1,
+                "decks": 1,
+                "players": arguments.registrants,
+                "organisers": 1,
+                "venues": 1,
+                "events": 1,
+            },
+            seed = arguments.seed,
+            report = lambda line: print(line, file = sys.stderr)
+        )
+    return app
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark registrations to a capped event under load.")
+    parser.add_argument("--database-uri", default = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'digiscan_registration.sqlite')}")
+    parser.add_argument("--registrants", type = int, default = 500)
+    parser.add_argument("--cap", type = int, default = 128)
+    parser.add_argument("--threads", type = int, default = 50)
+    parser.add_argument("--seed", type = int, default = 0)
+    arguments = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    app = _build_app(arguments)
+
+    from init import db
+    from models.event import Event
+    from models.player import Player
+    from models.registration import Registration
+
+    client = app.test_client()
+    event = client.post("/events/", json = {
+        "organiser_id": 1,
+        "venue_id": 1,
+        "event_name": "Digimon Sydney Regionals",
+        "player_cap": arguments.cap,
+        "event_status": "Planned"
+    }).get_json()
+    with app.app_context():
+        player_ids = list(db.session.scalars(
+            db.select(Player.player_id).order_by(Player.player_id).limit(arguments.registrants)
+        ))
+
+    def register(player_id):
+        start = time.perf_counter()
+        response = app.test_client().post("/registrations/", json = {
+            "event_id": event["event_id"],
+            "player_id": player_id
+        })
+        return response.status_code, (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers = arguments.threads) as executor:
+        results = list(executor.map(register, player_ids))
+    wall_time = time.perf_counter() - start
+
+    statuses = Counter(status for status, _ in results)
+    timings = sorted(timing for _, timing in results)
+    with app.app_context():
+        registered = db.session.scalar(
+            db.select(db.func.count())
+            .select_from(Registration)
+            .where(Registration.event_id == event["event_id"])
+        )
+        counted = db.session.get(Event, event["event_id"]).registration_count
+
+    print(
+        f"{len(results)} registrants, {arguments.threads} threads, cap {arguments.cap}: "
+        f"{len(results) / wall_time:.0f} requests/s, "
+        f"median {statistics.median(timings):.1f} ms, "
+        f"p95 {timings[int(len(timings) * 0.95) - 1]:.1f} ms"
+    )
+    print(f"Responses: {dict(sorted(statuses.items()))}")
+    print(f"Registered: {registered}, registration count: {counted}")
+
+    if registered > arguments.cap or registered != counted or statuses[201] != registered:
+        print("The player cap was not enforced correctly.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
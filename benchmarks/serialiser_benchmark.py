@@ -0,0 +1,109 @@
+"""
+This file benchmarks the compiled serialisers against marshmallow's
+schema dump. It seeds a database with synthetic data, reads a page of
+records for each list route the way the route does, and times
+displaying them both ways.
+
+It exits with an error when the two ever produce different JSON, so
+it can be run as a check after changing a schema or the compiler.
+
+Usage (from the project root):
+    python -m benchmarks.serialiser_benchmark --rows 2000 --repeat 5
+"""
+
+# Built-in imports
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+
+def _build_app(arguments):
+    """
+    Create the app against the benchmark database, recreating and
+    seeding it with enough rows for every list to fill a page.
+    """
+    os.environ["DATABASE_URI"] = arguments.database_uri
+
+    # Imported here so the environment above is in place first
+    from main import create_app
+    from init import db
+    from utils.synthetic_data import generate
+
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        generate(
+            {
+                "cards": arguments.rows,
+                "decks": arguments.rows // 4,
+                "players": arguments.rows,
+                "organisers": 20,
+                "venues": 40,
+                "events": arguments.rows // 10,
+            },
+            seed = arguments.seed,
+            report = lambda line: print(line, file = sys.stderr)
+        )
+    return app
+
+
+def _best_time(function, repeat):
+    """
+    Run the function a number of times, returning its result and the
+    fastest run in milliseconds.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark the compiled serialisers.")
+    parser.add_argument("--database-uri", default = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'digiscan_serialiser.sqlite')}")
+    parser.add_argument("--rows", type = int, default = 2000, help = "Records displayed per list.")
+    parser.add_argument("--repeat", type = int, default = 5)
+    parser.add_argument("--seed", type = int, default = 0)
+    arguments = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    app = _build_app(arguments)
+
+    from init import db
+    from controllers.blueprints_register import READ_ROUTES
+    from utils.fast_dump import fast_dump
+    from utils.query_shaping import eager_load
+
+    mismatches = []
+    print(f"{'schema':20} {'rows':>6} {'dump ms':>10} {'compiled ms':>12} {'speedup':>8}")
+    with app.app_context():
+        for _, model, schema, _, _ in READ_ROUTES:
+            if not schema.many:
+                continue
+            statement = eager_load(db.select(model).limit(arguments.rows), model, schema)
+            records = db.session.scalars(statement).unique().all()
+
+            expected, dump_ms = _best_time(lambda: schema.dump(records), arguments.repeat)
+            actual, compiled_ms = _best_time(lambda: fast_dump(schema, records), arguments.repeat)
+
+            if app.json.dumps(expected) != app.json.dumps(actual):
+                mismatches.append(type(schema).__name__)
+            print(
+                f"{type(schema).__name__:20} {len(records):>6} {dump_ms:>10.2f} "
+                f"{compiled_ms:>12.2f} {dump_ms / compiled_ms if compiled_ms else 0:>7.1f}x"
+            )
+
+    if mismatches:
+        print(f"Compiled output differs from the schema dump for: {', '.join(mismatches)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
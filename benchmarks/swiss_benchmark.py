@@ -0,0 +1,95 @@
+"""
+This file benchmarks the Swiss pairing engine on its own, without a
+database. It pairs every round of a simulated event, reporting a
+random result for each match, and records how long each round took
+to pair and how many rematches and repeat byes it had to make.
+
+It exits with an error when any round took longer than the budget,
+so it can be run as a check after changing the pairing code.
+
+Usage (from the project root):
+    python -m benchmarks.swiss_benchmark --players 1024 --rounds 10
+"""
+
+# Built-in imports
+import argparse
+import random
+import statistics
+import sys
+import time
+
+# Local imports - The routes are loaded first so every model the 
+# pairing engine's imports refer to is defined
+import controllers.blueprints_register
+from utils.swiss import TIE_POINTS, WIN_POINTS, pair_round
+
+
+def simulate(players, rounds, seed):
+    """
+    Pair and play every round of an event, returning the time each
+    round took to pair in milliseconds and the rematches and repeat
+    byes made along the way.
+    """
+    rng = random.Random(seed)
+    ids = list(range(1, players + 1))
+    ratings = {player: rng.gauss(1500, 200) for player in ids}
+    points = {player: 0 for player in ids}
+    opponents = {player: set() for player in ids}
+    had_bye = set()
+    timings = []
+    rematches = 0
+    repeat_byes = 0
+
+    for _ in range(rounds):
+        standings = sorted(ids, key = lambda player: (-points[player], -ratings[player]))
+
+        start = time.perf_counter()
+        pairs, bye = pair_round(standings, points, opponents, had_bye)
+        timings.append((time.perf_counter() - start) * 1000)
+
+        # Play the round
+        if bye is not None:
+            repeat_byes += bye in had_bye
+            had_bye.add(bye)
+            points[bye] += WIN_POINTS
+        for first, second in pairs:
+            rematches += second in opponents[first]
+            opponents[first].add(second)
+            opponents[second].add(first)
+            outcome = rng.random()
+            if outcome < 0.45:
+                points[first] += WIN_POINTS
+            elif outcome < 0.9:
+                points[second] += WIN_POINTS
+            else:
+                points[first] += TIE_POINTS
+                points[second] += TIE_POINTS
+
+    return timings, rematches, repeat_byes
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark the Swiss pairing engine.")
+    parser.add_argument("--players", type = int, default = 1024)
+    parser.add_argument("--rounds", type = int, default = 10)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--budget-ms", type = float, default = 250.0, help = "Slowest a single round may take to pair.")
+    args = parser.parse_args(argv)
+
+    timings, rematches, repeat_byes = simulate(args.players, args.rounds, args.seed)
+    for number, timing in enumerate(timings, 1):
+        print(f"Round {number:>3}: {timing:8.2f} ms")
+    print(
+        f"{args.players} players, {args.rounds} rounds: "
+        f"mean {statistics.mean(timings):.2f} ms, slowest {max(timings):.2f} ms, "
+        f"{rematches} rematches, {repeat_byes} repeat byes"
+    )
+
+    if max(timings) > args.budget_ms:
+        print(f"Slowest round took longer than the {args.budget_ms:.0f} ms budget.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,93 @@ from controllers.collection_controller import collectionsBp
 from controllers.event_controller import eventsBp
 from controllers.registration_controller import registrationsBp
 from controllers.ranking_controller import rankingsBp
+from controllers.pairing_controller import pairingsBp
+from controllers.meta_controller import metaBp
+from controllers.metrics_controller import metricsBp
+
+# Local imports - Models and schemas the cached responses are built from
+from models.card import Card
+from models.deck import Deck
+from models.player import Player
+from models.organiser import Organiser
+from models.venue import Venue
+from models.decklist import Decklist
+from models.collection import Collection
+from models.event import Event
+from models.registration import Registration
+from models.ranking import Ranking
+from schemas.card_schema import cards_schema
+from schemas.deck_schema import decks_schema
+from schemas.player_schema import players_schema
+from schemas.organiser_schema import organisers_schema
+from schemas.venue_schema import venues_schema
+from schemas.decklist_schema import decklists_schema
+from schemas.collection_schema import collections_schema
+from schemas.event_schema import events_schema
+from schemas.registration_schema import registrations_schema
+from schemas.ranking_schema import rankings_schema
+from schemas.metagame_schema import metagame_schema
+
+# Local imports - Conditional requests and response caching
+from utils.conditional import conditional_blueprint
+from utils.response_cache import cache_blueprint
+
+
+# The read routes of each blueprint, the model and schema their 
+# responses are built from, the key columns their list route can be 
+# filtered on through the query string, and any other tables their 
+# routes read from
+READ_ROUTES = (
+    (cardsBp, Card, cards_schema, (), ()),
+    (decksBp, Deck, decks_schema, (), ()),
+    (playersBp, Player, players_schema, (), ("ratings",)),
+    (organisersBp, Organiser, organisers_schema, (), ()),
+    (venuesBp, Venue, venues_schema, (), ()),
+    (decklistsBp, Decklist, decklists_schema, ("deck_id", "card_id"), ()),
+    (
+        collectionsBp, 
+        Collection, 
+        collections_schema, 
+        ("collection_id", "player_id", "deck_id"), 
+        ()
+    ),
+    (
+        eventsBp, 
+        Event, 
+        events_schema, 
+        ("event_id", "organiser_id", "venue_id"), 
+        ("standings", "players")
+    ),
+    (
+        registrationsBp, 
+        Registration, 
+        registrations_schema, 
+        ("event_id", "player_id"), 
+        ("waitlist",)
+    ),
+    (rankingsBp, Ranking, rankings_schema, ("player_id", "event_id"), ()),
+    (
+        metaBp, 
+        Decklist, 
+        metagame_schema, 
+        (), 
+        (
+            "cards", 
+            "collections", 
+            "events", 
+            "rankings", 
+            "registrations", 
+            "standings"
+        )
+    ),
+)
+
+# Answer unchanged conditional requests first, then serve cached copies 
+# of everything else against the tables the responses are built from
+for blueprint, model, schema, filters, extra_tables in READ_ROUTES:
+    conditional_blueprint(blueprint, model, schema, filters, extra_tables)
+    cache_blueprint(blueprint, model, schema, filters, extra_tables)
+
 
 def attach_blueprints(app):
     """
@@ -30,4 +117,7 @@ def attach_blueprints(app):
     app.register_blueprint(collectionsBp)
     app.register_blueprint(eventsBp)
     app.register_blueprint(registrationsBp)
-    app.register_blueprint(rankingsBp)
\ No newline at end of file
+    app.register_blueprint(rankingsBp)
+    app.register_blueprint(pairingsBp)
+    app.register_blueprint(metaBp)
+    app.register_blueprint(metricsBp)
\ No newline at end of file
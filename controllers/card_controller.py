@@ -4,11 +4,19 @@ through REST API design using Flask Blueprint.
 """
 
 # Installed import packages
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 
 # Local imports
 from init import db
-from models.card import Card
+from models.card import Card, CardRarity, CardType
+from utils.pagination import paginate, page_response, page_size
+from utils.streaming import stream_response, wants_stream
+from utils.query_shaping import eager_load
+from utils.sparse_fields import projected_schema
+from utils.fast_dump import fast_dump
+from utils.batch_lookup import batch_response, get_by_ids, requested_ids
+from utils.card_import import import_cards, parse_card_file
+from utils.card_search import search_filter
 from schemas.card_schema import card_schema, cards_schema
 
 # Create the Template Web Application Interface for card routes to be applied 
@@ -29,6 +37,15 @@ def error_card_does_not_exist(card_id):
 def card_successfully_removed(card_number, card_name):
     return {"message": f"Card {card_number} {card_name} deleted successfully."}, 200 
 
+def error_invalid_import(reason):
+    return {"message": f"Card import could not be read: {reason}"}, 400
+
+def error_missing_search_query():
+    return {"message": "Enter some text to search for with '?q='."}, 400
+
+def error_no_matching_cards(query):
+    return {"message": f"No cards found matching '{query}'."}
+
 """
 API Routes
 """
@@ -61,6 +78,32 @@ def createCard():
     return jsonify(acknowledgement), 201
 
 
+@cardsBp.route("/bulk", methods = ["POST"])
+def importCards():
+    """
+    Add or update a whole batch of cards in one transaction. The body 
+    is either a JSON list of cards or, with a 'text/csv' content type, 
+    a CSV file with a header row. Cards are matched on their card 
+    number, and rows that fail validation are reported back by their 
+    position without stopping the rest of the batch.
+    """
+    # Read the batch of cards from the request body in either format
+    try:
+        if request.mimetype == "text/csv":
+            records = parse_card_file(request.get_data(as_text = True), "csv")
+        else:
+            records = parse_card_file(request.get_data(as_text = True), "json")
+    except ValueError as err:
+        return error_invalid_import(err)
+
+    # Validate and write the valid cards, then report on the whole batch
+    report = import_cards(records, current_app.config["IMPORT_BATCH_SIZE"])
+    if report["added"] or report["updated"]:
+        return jsonify(report), 201
+    else:
+        return jsonify(report), 400
+
+
 @cardsBp.route("/")
 def getCards():
     """
@@ -69,19 +112,74 @@ def getCards():
     """
     # Selects all the cards from the database
     statement = db.select(Card)
-    cardsList = db.session.scalars(statement)
+
+    # Only read and display the fields the client asked for
+    schema = projected_schema(cards_schema)
+    statement = eager_load(statement, Card, schema)
+
+    # Fetch only the cards asked for by ID, in the order they were 
+    # asked for
+    ids = requested_ids()
+    if ids is not None:
+        cardsList, missing = get_by_ids(statement, Card, ids)
+        return batch_response(fast_dump(schema, cardsList), missing)
+
+    # Stream every matching row instead of a single page when the 
+    # client asks for a full export
+    if wants_stream():
+        return stream_response(statement, Card, schema)
+
+    # Fetch a single page of results
+    cardsList, nextCursor = paginate(statement, Card)
 
     # Serialise it as the scalar result is unserialised
-    queryData = cards_schema.dump(cardsList)
+    queryData = fast_dump(schema, cardsList)
     
     # Return the search results if there are cards in the card database, 
     # otherwise inform the user that the database is empty.
     if queryData:
         # Return the list of cards in JSON format
-        return jsonify(queryData)
+        return page_response(queryData, nextCursor)
     else:
         # Return an error message: Card table is empty
         return error_empty_table()
+
+
+@cardsBp.route("/search")
+def searchCards():
+    """
+    Search the cards by part of their name or number ('?q=agu', 
+    '?q=BT1-'), allowing for typos in the name. The results can be 
+    limited to a '?card_type=' and '?card_rarity=', and are listed best 
+    match first up to the '?limit=' page size.
+    """
+    # Fetch the search text and filters from the query string
+    query = request.args.get("q", "").strip()
+    if not query:
+        return error_missing_search_query()
+    card_type = search_filter("card_type", CardType)
+    card_rarity = search_filter("card_rarity", CardRarity)
+
+    # Look the matching card IDs up in the search index, best first
+    index = current_app.extensions["card_search"]
+    card_ids = index.search(query, card_type, card_rarity, page_size())
+
+    # Only read and display the fields the client asked for
+    schema = projected_schema(cards_schema)
+    statement = eager_load(db.select(Card), Card, schema)
+
+    # Selects the matching cards from the database, keeping the order 
+    # of the search results
+    cardsList = []
+    if card_ids:
+        cardsList, _ = get_by_ids(statement, Card, card_ids)
+
+    # Return the matching cards in JSON format, otherwise inform the 
+    # user that no cards matched
+    if cardsList:
+        return jsonify(fast_dump(schema, cardsList))
+    else:
+        return error_no_matching_cards(query)
     
 
 @cardsBp.route("/<int:card_id>")
@@ -93,10 +191,15 @@ def getCard(card_id):
     # Selects all the cards from the database and filter the card with
     # matching ID
     statement = db.select(Card).where(Card.card_id == card_id)
+
+    # Only read and display the fields the client asked for
+    schema = projected_schema(card_schema)
+    statement = eager_load(statement, Card, schema)
+
     card = db.session.scalar(statement)
 
     # Serialise it as the scalar result is unserialised
-    queryData = card_schema.dump(card)
+    queryData = fast_dump(schema, card)
 
     # Return the search results if this card is in the card database, 
     # otherwise inform the user that the card does not exist.
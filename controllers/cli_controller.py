@@ -5,8 +5,12 @@ Blueprint. This file creates the commands to automate the creation
 and seeding of the Digiscan database.
 """
 
+# Built-in imports
+import json
+
 # Installed import packages
-from flask import Blueprint
+import click
+from flask import Blueprint, current_app
 
 # Local imports - The Flask App instance (db) and the table 
 # templates (models) to populate the database
@@ -21,6 +25,17 @@ from models.collection import Collection
 from models.event import Event, EventStatus
 from models.registration import Registration
 from models.ranking import Ranking
+from models.standing import Standing
+from models.rating import Rating
+from models.rating_history import RatingHistory
+from models.pairing import Pairing
+from models.waitlist import WaitlistEntry
+from utils.card_import import import_cards, parse_card_file
+from utils.synthetic_data import REFERENCE_DATE, generate
+from utils.standings import rebuild_standings
+from utils.ratings import rebuild_ratings
+from utils.admission import recount_registrations, renumber_waitlists
+from utils.migrations import MigrationError, upgrade_database
 
 # Create the Template Application Interface for in-line command 
 # routes to be applied to the Flask application
@@ -49,6 +64,93 @@ def dropTables():
     db.drop_all()
     print("Tables dropped.")
 
+@dbCommands.cli.command("upgrade")
+def upgradeTables():
+    """
+    Bring an existing database up to date with the models by adding 
+    the tables, columns and indexes it is missing, without touching 
+    the data already in it. Safe to run on every deploy.
+    """
+    try:
+        added = upgrade_database()
+    except MigrationError as err:
+        raise click.ClickException(str(err))
+
+    # Work out the registration counts of existing events
+    if "events.registration_count" in added:
+        recount_registrations()
+        db.session.commit()
+        print("Registration counts updated.")
+
+    # Number the queues of existing waitlists
+    if "waitlist.position" in added:
+        renumber_waitlists()
+        db.session.commit()
+        print("Waitlist positions updated.")
+
+    # Write down the rating history of existing ratings, which later 
+    # replays start from
+    if "rating_history" in added:
+        rated = rebuild_ratings()
+        print(f"Ratings rebuilt for {rated} players.")
+
+
+@dbCommands.cli.command("rebuild-standings")
+def rebuildStandings():
+    """
+    Work out the leaderboard of every event with rankings from scratch, 
+    for example after loading rankings straight into the database.
+    """
+    statement = db.select(Ranking.event_id).distinct()
+    event_ids = list(db.session.scalars(statement))
+    for event_id in event_ids:
+        rebuild_standings(event_id)
+        db.session.commit()
+    print(f"Standings rebuilt for {len(event_ids)} events.")
+
+
+@dbCommands.cli.command("rebuild-ratings")
+def rebuildRatings():
+    """
+    Work out every player's global rating from scratch by replaying the 
+    results of every completed event in date order.
+    """
+    rated = rebuild_ratings()
+    print(f"Ratings rebuilt for {rated} players.")
+
+
+@dbCommands.cli.command("recount-registrations")
+def recountRegistrations():
+    """
+    Set the registration count each event's player cap is checked 
+    against from its registrations, for example after adding the 
+    column to an existing database or loading registrations straight 
+    into it.
+    """
+    recount_registrations()
+    db.session.commit()
+    print("Registration counts updated.")
+
+
+@dbCommands.cli.command("import-cards")
+@click.argument("file", type = click.Path(exists = True, dir_okay = False))
+def importCards(file):
+    """
+    Add or update every card listed in a CSV or JSON file in a single 
+    transaction, matching existing cards on their card number. Rows 
+    that fail validation are listed and skipped.
+    """
+    # Work out the format of the file from its extension
+    file_format = "csv" if file.lower().endswith(".csv") else "json"
+    with open(file, encoding = "utf-8") as card_file:
+        records = parse_card_file(card_file.read(), file_format)
+
+    report = import_cards(records, current_app.config["IMPORT_BATCH_SIZE"])
+    print(f"Cards added: {report['added']}, updated: {report['updated']}.")
+    for row, messages in report["errors"].items():
+        print(f"Row {row} skipped: {json.dumps(messages)}")
+
+
 @dbCommands.cli.command("seed")
 def seed_tables():
     """
@@ -311,6 +413,10 @@ def seed_tables():
     # Add the registrations information to this session
     db.session.add_all(registrations)
 
+    # Count the places taken at each event
+    db.session.flush()
+    recount_registrations()
+
     # Commit to the session and permanently add the 
     # registrations to the database.
     db.session.commit()
@@ -340,4 +446,44 @@ def seed_tables():
     # Commit to the session and permanently add the 
     # rankings to the database.
     db.session.commit()
-    print("Ranking seeded.")
\ No newline at end of file
+    print("Ranking seeded.")
+
+
+@dbCommands.cli.command("seed-scale")
+@click.option("--cards", default = 10000, type = click.IntRange(min = 1), help = "Number of cards.")
+@click.option("--decks", default = 5000, type = click.IntRange(min = 1), help = "Number of decks.")
+@click.option("--players", default = 5000, type = click.IntRange(min = 1), help = "Number of players.")
+@click.option("--organisers", default = 50, type = click.IntRange(min = 1), help = "Number of organisers.")
+@click.option("--venues", default = 100, type = click.IntRange(min = 1), help = "Number of venues.")
+@click.option("--events", default = 500, type = click.IntRange(min = 1), help = "Number of events.")
+@click.option("--seed", default = 0, type = int, help = "Random seed, the same seed gives the same data.")
+@click.option("--batch-size", default = 5000, type = click.IntRange(min = 1), help = "Rows per INSERT batch.")
+@click.option(
+    "--reference-date", 
+    default = REFERENCE_DATE.isoformat(), 
+    type = click.DateTime(formats = ["%Y-%m-%d"]), 
+    help = "Day the event dates are spread around."
+)
+def seed_scale(cards, decks, players, organisers, venues, events, seed, batch_size, reference_date):
+    """
+    Populate the tables with large amounts of synthetic data for load 
+    testing. Decks are filled with 50 cards, players own a handful of 
+    decks, events are filled close to their player cap and completed 
+    events have W/L/T results for every registered player. Run 'create' 
+    first, this adds to whatever is already in the database.
+    """
+    counts = {
+        "cards": cards,
+        "decks": decks,
+        "players": players,
+        "organisers": organisers,
+        "venues": venues,
+        "events": events,
+    }
+    generate(
+        counts, 
+        seed = seed, 
+        batch_size = batch_size, 
+        reference_date = reference_date.date()
+    )
+    print("Synthetic data seeded.")
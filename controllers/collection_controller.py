@@ -10,6 +10,11 @@ from flask import Blueprint, jsonify, request
 # Local imports
 from init import db
 from models.collection import Collection
+from utils.pagination import paginate, page_response
+from utils.streaming import stream_response, wants_stream
+from utils.query_shaping import eager_load
+from utils.sparse_fields import projected_schema
+from utils.fast_dump import fast_dump
 from schemas.collection_schema import collection_schema, collections_schema
 
 # Create the Template Web Application Interface for card routes 
@@ -96,16 +101,28 @@ def get_collections():
     if deck_id:
         statement = statement.where(Collection.deck_id == deck_id)
 
+    # Only read and display the fields the client asked for
+    schema = projected_schema(collections_schema)
+
+    # Fetch the nested records the schema displays in the same round 
+    # trip instead of lazy loading them row by row
+    statement = eager_load(statement, Collection, schema)
+
+    # Stream every matching row instead of a single page when the 
+    # client asks for a full export
+    if wants_stream():
+        return stream_response(statement, Collection, schema)
+
     # Serialise it as the scalar result is unserialised
-    collections_list = db.session.scalars(statement)
-    queryData = collections_schema.dump(collections_list)
+    collections_list, nextCursor = paginate(statement, Collection)
+    queryData = fast_dump(schema, collections_list)
 
     # Return the search results if there are collections in the 
     # collection database, otherwise inform the user that the 
     # database is empty.
     if queryData:
         # Return the list of collections in JSON format
-        return jsonify(queryData)
+        return page_response(queryData, nextCursor)
     else:
         # Return an error message: Collections table is empty
         return error_empty_table()
@@ -124,7 +141,7 @@ def delete_deck_from_collection(collection_id):
     
     # Serialise it as the scalar result is unserialised
     collection = db.session.scalar(statement)
-    queryData = collection_schema.dump(collection)
+    queryData = fast_dump(collection_schema, collection)
 
     # Delete the collection from the collections database if they exist
     if queryData:
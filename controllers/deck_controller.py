@@ -9,6 +9,12 @@ from flask import Blueprint, jsonify, request
 # Local imports
 from init import db
 from models.deck import Deck
+from utils.pagination import paginate, page_response
+from utils.streaming import stream_response, wants_stream
+from utils.query_shaping import eager_load
+from utils.sparse_fields import projected_schema
+from utils.fast_dump import fast_dump
+from utils.batch_lookup import batch_response, get_by_ids, requested_ids
 from schemas.deck_schema import deck_schema, decks_schema
 
 # Create the Template Web Application Interface for deck routes to be applied 
@@ -70,16 +76,34 @@ def getDecks():
     """
     # Selects all the decks from the database
     statement = db.select(Deck)
-    listOfDecks = db.session.scalars(statement)
+
+    # Only read and display the fields the client asked for
+    schema = projected_schema(decks_schema)
+    statement = eager_load(statement, Deck, schema)
+
+    # Fetch only the decks asked for by ID, in the order they were 
+    # asked for
+    ids = requested_ids()
+    if ids is not None:
+        listOfDecks, missing = get_by_ids(statement, Deck, ids)
+        return batch_response(fast_dump(schema, listOfDecks), missing)
+
+    # Stream every matching row instead of a single page when the 
+    # client asks for a full export
+    if wants_stream():
+        return stream_response(statement, Deck, schema)
+
+    # Fetch a single page of results
+    listOfDecks, nextCursor = paginate(statement, Deck)
 
     # Serialise it as the scalar result is unserialised
-    queryData = decks_schema.dump(listOfDecks)
+    queryData = fast_dump(schema, listOfDecks)
     
     # Return the search results if there are decks in the deck database, 
     # otherwise inform the user that the database is empty.
     if queryData:
         # Return the list of decks in JSON format
-        return jsonify(queryData)
+        return page_response(queryData, nextCursor)
     else:
         # Return an error message: Deck table is empty
         return error_empty_table()
@@ -94,10 +118,15 @@ def getDeck(deck_id):
     # Selects all the decks from the database and filter the deck with
     # matching ID
     statement = db.select(Deck).where(Deck.deck_id == deck_id)
+
+    # Only read and display the fields the client asked for
+    schema = projected_schema(deck_schema)
+    statement = eager_load(statement, Deck, schema)
+
     deck = db.session.scalar(statement)
 
     # Serialise it as the scalar result is unserialised
-    queryData = deck_schema.dump(deck)
+    queryData = fast_dump(schema, deck)
 
     # Return the search results if this deck is in the deck database, 
     # otherwise inform the user that the deck does not exist.
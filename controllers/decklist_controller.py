@@ -9,6 +9,11 @@ from flask import Blueprint, jsonify, request
 # Local imports
 from init import db
 from models.decklist import Decklist
+from utils.pagination import paginate, page_response
+from utils.streaming import stream_response, wants_stream
+from utils.query_shaping import eager_load
+from utils.sparse_fields import projected_schema
+from utils.fast_dump import fast_dump
 from schemas.decklist_schema import decklist_schema, decklists_schema
 
 # Create the Template Web Application Interface for card routes to be applied 
@@ -81,15 +86,27 @@ def get_decklists():
     if card_id:
         statement = statement.where(Decklist.card_id == card_id)
 
+    # Only read and display the fields the client asked for
+    schema = projected_schema(decklists_schema)
+
+    # Fetch the nested records the schema displays in the same round 
+    # trip instead of lazy loading them row by row
+    statement = eager_load(statement, Decklist, schema)
+
+    # Stream every matching row instead of a single page when the 
+    # client asks for a full export
+    if wants_stream():
+        return stream_response(statement, Decklist, schema)
+
     # Serialise it as the scalar result is unserialised
-    decklists_list = db.session.scalars(statement)
-    queryData = decklists_schema.dump(decklists_list)
+    decklists_list, nextCursor = paginate(statement, Decklist)
+    queryData = fast_dump(schema, decklists_list)
 
     # Return the search results if there are decklists in the decklist database, 
     # otherwise inform the user that the database is empty.
     if queryData:
         # Return the list of decklists in JSON format
-        return jsonify(queryData)
+        return page_response(queryData, nextCursor)
     else:
         # Return an error message: Decklists table is empty
         return error_empty_table()
@@ -109,7 +126,7 @@ def delete_card_from_decklist(deck_id, card_id):
     
     # Serialise it as the scalar result is unserialised
     decklist = db.session.scalar(statement)
-    queryData = decklist_schema.dump(decklist)
+    queryData = fast_dump(decklist_schema, decklist)
 
     # Delete the decklist from the decklists database if they exist
     if queryData:
@@ -9,8 +9,18 @@ from flask import Blueprint, jsonify, request
 
 # Local imports
 from init import db
-from models.event import Event
+from models.event import Event, EventStatus
+from utils.pagination import paginate, page_response
+from utils.streaming import stream_response, wants_stream
+from utils.batch_lookup import batch_response, get_by_ids, requested_ids
+from utils.query_shaping import eager_load
+from utils.sparse_fields import projected_schema
+from utils.fast_dump import fast_dump
 from schemas.event_schema import event_schema, events_schema
+from schemas.standing_schema import standings_schema
+from utils.standings import event_standings
+from utils.ratings import apply_event_ratings
+from utils.admission import promote_waitlisted
 
 # Create the Template Web Application Interface for card routes 
 # to be applied to the Flask application
@@ -33,6 +43,12 @@ def error_event_does_not_exist(event_id):
         f"Event ID {event_id} does not exist in this table."
     }, 404
 
+def error_no_standings(event_id):
+    return {
+        "message": 
+        f"Event ID {event_id} has no standings yet."
+    }, 404
+
 def event_sucessfully_deleted(event_id):
     return {
         "message": 
@@ -95,21 +111,103 @@ def get_events():
     if venue_id:
         statement = statement.where(Event.venue_id == venue_id)
 
+    # Only read and display the fields the client asked for
+    schema = projected_schema(events_schema)
+
+    # Fetch the nested records the schema displays in the same round 
+    # trip instead of lazy loading them row by row
+    statement = eager_load(statement, Event, schema)
+
+    # Fetch only the events asked for by ID, in the order they were 
+    # asked for
+    ids = requested_ids()
+    if ids is not None:
+        events_list, missing = get_by_ids(statement, Event, ids)
+        return batch_response(fast_dump(schema, events_list), missing)
+
+    # Stream every matching row instead of a single page when the 
+    # client asks for a full export
+    if wants_stream():
+        return stream_response(statement, Event, schema)
+
     # Serialise it as the scalar result is unserialised
-    events_list = db.session.scalars(statement)
-    queryData = events_schema.dump(events_list)
+    events_list, nextCursor = paginate(statement, Event)
+    queryData = fast_dump(schema, events_list)
 
     # Return the search results if there are events in the 
     # event database, otherwise inform the user that the 
     # database is empty.
     if queryData:
         # Return the list of events in JSON format
-        return jsonify(queryData)
+        return page_response(queryData, nextCursor)
     else:
         # Return an error message: Events table is empty
         return error_empty_table()
     
 
+@eventsBp.route("/<int:event_id>", methods = ["PUT", "PATCH"])
+def update_event(event_id):
+    """
+    Retrieve the body data and update the details of the event with 
+    the matching ID in the event database, this is the equivalent of 
+    PUT/PATCH in postgresql. Marking an event as completed counts its 
+    results towards the player ratings.
+    """
+    # Selects all the events from the database and filter for the 
+    # event with matching ID
+    statement = db.select(Event).where(Event.event_id == event_id)
+    event = db.session.scalar(statement)
+
+    # Update the event information in the events database if it exists
+    if event:
+        # Fetch the event information from the request body and 
+        # validate the changes with the event schema
+        bodyData = request.get_json()
+        event = event_schema.load(
+            bodyData,
+            instance = event,
+            session = db.session,
+            partial = True
+        )
+
+        # Rate the players once the event has been completed
+        if event.event_status == EventStatus.Completed:
+            apply_event_ratings(event)
+
+        # Register waitlisted players into any places opened up by a 
+        # raised cap or the event being back on
+        if event.event_status != EventStatus.Cancelled:
+            promote_waitlisted(event.event_id)
+        
+        # Commit and permanently update the event data in the 
+        # postgresql database
+        db.session.commit()
+
+        # Return the updated event info in JSON format
+        return jsonify(event_schema.dump(event))
+    else:
+        # Return an error message: Event with this ID does not exist
+        return error_event_does_not_exist(event_id)
+
+
+@eventsBp.route("/<int:event_id>/standings")
+def get_event_standings(event_id):
+    """
+    Retrieve the leaderboard of an event in placement order, along with 
+    each player's record and tie-breakers. The order is precomputed 
+    whenever a ranking is written, so this is a straight read.
+    """
+    # Read the precomputed leaderboard of this event
+    standings = event_standings(event_id)
+
+    # Return the leaderboard if the event has results, otherwise 
+    # inform the user that there are no standings yet.
+    if standings:
+        return jsonify(fast_dump(standings_schema, standings))
+    else:
+        return error_no_standings(event_id)
+    
+
 @eventsBp.route("/<int:event_id>", methods = ["DELETE"])
 def delete_event(event_id):
     """
@@ -123,7 +221,7 @@ def delete_event(event_id):
     
     # Serialise it as the scalar result is unserialised
     event = db.session.scalar(statement)
-    queryData = event_schema.dump(event)
+    queryData = fast_dump(event_schema, event)
 
     # Delete the event from the events database if they exist
     if queryData:
@@ -0,0 +1,67 @@
+"""
+This file creates the Read operations for the card usage and metagame
+reports, which add up how often cards are played at completed events
+and how the decks playing them did, through REST API design using
+Flask Blueprint.
+"""
+
+# Installed import packages
+from flask import Blueprint, jsonify
+
+# Local imports
+from init import db
+from models.card import Card
+from utils.metagame import card_usage_report, metagame_report, report_since
+from utils.pagination import page_size
+from schemas.metagame_schema import metagame_schema
+
+# Create the Template Web Application Interface for metagame routes
+# to be applied to the Flask application. The routes sit under both
+# '/meta' and '/cards', so the blueprint has no prefix of its own.
+metaBp = Blueprint("meta", __name__)
+
+
+"""
+Metagame Controller Messages
+"""
+
+def error_card_does_not_exist(card_id):
+    return {"message": f"Card with id {card_id} does not exist"}, 404
+
+
+"""
+API Routes
+"""
+
+@metaBp.route("/meta/")
+def get_metagame():
+    """
+    Retrieve the most played cards at the completed events held since
+    '?since=' (YYYY-MM-DD, by default the configured number of days
+    ago), along with how well the decks playing them did. '?limit='
+    sets how many cards are listed.
+    """
+    # Add up the totals of the events in the window
+    queryData = metagame_report(report_since(), page_size())
+
+    # Return the report in JSON format
+    return jsonify(metagame_schema.dump(queryData))
+
+
+@metaBp.route("/cards/<int:card_id>/usage")
+def get_card_usage(card_id):
+    """
+    Retrieve how often a card has been built into decks, and how often
+    and how well it was played at the completed events held since
+    '?since=' (YYYY-MM-DD, by default the configured number of days ago).
+    """
+    # Selects the card from the database with the matching ID
+    card = db.session.get(Card, card_id)
+
+    # Return the card's usage if it is in the card database, otherwise
+    # inform the user that the card does not exist.
+    if card:
+        queryData = card_usage_report(card, report_since())
+        return jsonify(metagame_schema.dump(queryData))
+    else:
+        return error_card_does_not_exist(card_id)
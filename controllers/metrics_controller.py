@@ -0,0 +1,24 @@
+"""
+This file creates the read only routes for the request metrics, 
+through REST API design using Flask Blueprint.
+"""
+
+# Installed import packages
+from flask import Blueprint, current_app, jsonify
+
+# Create the Template Web Application Interface for metrics routes to 
+# be applied to the Flask application
+metricsBp = Blueprint("metrics", __name__, url_prefix = "/metrics")
+
+
+"""
+API Routes
+"""
+
+@metricsBp.route("/queries")
+def get_query_metrics():
+    """
+    Retrieve the rolling histogram of request durations, SQL statement 
+    counts and rows fetched for every endpoint requested so far.
+    """
+    return jsonify(current_app.extensions["query_metrics"].summary())
@@ -9,6 +9,12 @@ from flask import Blueprint, jsonify, request
 # Local imports
 from init import db
 from models.organiser import Organiser
+from utils.pagination import paginate, page_response
+from utils.streaming import stream_response, wants_stream
+from utils.query_shaping import eager_load
+from utils.sparse_fields import projected_schema
+from utils.fast_dump import fast_dump
+from utils.batch_lookup import batch_response, get_by_ids, requested_ids
 from schemas.organiser_schema import organiser_schema, organisers_schema
 
 # Create the Template Web Application Interface for organiser routes to 
@@ -80,17 +86,35 @@ def getOrganisers():
     """
     # Selects all the organisers from the database
     statement = db.select(Organiser)
-    organisersList = db.session.scalars(statement)
+
+    # Only read and display the fields the client asked for
+    schema = projected_schema(organisers_schema)
+    statement = eager_load(statement, Organiser, schema)
+
+    # Fetch only the organisers asked for by ID, in the order they were 
+    # asked for
+    ids = requested_ids()
+    if ids is not None:
+        organisersList, missing = get_by_ids(statement, Organiser, ids)
+        return batch_response(fast_dump(schema, organisersList), missing)
+
+    # Stream every matching row instead of a single page when the 
+    # client asks for a full export
+    if wants_stream():
+        return stream_response(statement, Organiser, schema)
+
+    # Fetch a single page of results
+    organisersList, nextCursor = paginate(statement, Organiser)
 
     # Serialise it as the scalar result is unserialised
-    queryData = organisers_schema.dump(organisersList)
+    queryData = fast_dump(schema, organisersList)
     
     # Return the search results if there are organisers in the 
     # organiser database, otherwise inform the user that the 
     # database is empty.
     if queryData:
         # Return the list of organisers in JSON format
-        return jsonify(queryData)
+        return page_response(queryData, nextCursor)
     else:
         # Return an error message: Organiser table is empty
         return error_empty_table()
@@ -105,10 +129,15 @@ def getOrganiser(organiser_id):
     # Selects all the organisers from the database and filter the 
     # organiser with matching ID
     statement = db.select(Organiser).where(Organiser.organiser_id == organiser_id)
+
+    # Only read and display the fields the client asked for
+    schema = projected_schema(organiser_schema)
+    statement = eager_load(statement, Organiser, schema)
+
     organiser = db.session.scalar(statement)
 
     # Serialise it as the scalar result is unserialised
-    queryData = organiser_schema.dump(organiser)
+    queryData = fast_dump(schema, organiser)
 
     # Return the search results if this organiser is in the organiser 
     # database, otherwise inform the user that the organiser does not 
@@ -0,0 +1,154 @@
+"""
+This file creates the Create and Read operations to the Swiss round
+pairings of an event, and the reporting of their results, through
+REST API design using Flask Blueprint.
+"""
+
+# Installed import packages
+from flask import Blueprint, jsonify, request
+
+# Local imports
+from init import db
+from models.event import Event
+from models.pairing import Pairing
+from utils.query_shaping import eager_load
+from utils.fast_dump import fast_dump
+from utils.swiss import pair_next_round, record_results
+from schemas.pairing_schema import pairings_schema, match_results_schema
+
+# Create the Template Web Application Interface for pairing routes
+# to be applied to the Flask application
+pairingsBp = Blueprint(
+    "pairings",
+    __name__,
+    url_prefix = "/events/<int:event_id>/rounds"
+)
+
+
+"""
+Pairing Controller Messages
+"""
+
+def error_event_does_not_exist(event_id):
+    return {
+        "message":
+        f"Event ID {event_id} does not exist in this table."
+    }, 404
+
+def error_round_does_not_exist(event_id, round_number):
+    return {
+        "message":
+        f"Round {round_number} of Event ID {event_id} has not been paired."
+    }, 404
+
+def error_cannot_pair(reason):
+    return {
+        "message":
+        f"Round could not be paired: {reason}"
+    }, 409
+
+def error_cannot_record(reason):
+    return {
+        "message":
+        f"Results could not be recorded: {reason}"
+    }, 409
+
+
+def round_pairings(event_id, round_number):
+    """
+    Select the matches of a round in table order, along with the 
+    names of the players seated at them.
+    """
+    statement = (
+        db.select(Pairing)
+        .where(
+            Pairing.event_id == event_id,
+            Pairing.round_number == round_number
+        )
+        .order_by(Pairing.table_number)
+    )
+    statement = eager_load(statement, Pairing, pairings_schema)
+    return db.session.scalars(statement).all()
+
+
+"""
+API Routes
+"""
+
+@pairingsBp.route("/", methods = ["POST"])
+def create_round(event_id):
+    """
+    Pair the next Swiss round of a running event from its registered
+    players and the results so far, and save every match of the round
+    in one go. A player given the bye is awarded the win straight away.
+    """
+    # Selects the event from the database with the matching ID
+    event = db.session.get(Event, event_id)
+    if event is None:
+        return error_event_does_not_exist(event_id)
+
+    # Pair the round, or explain why the event cannot be paired yet
+    try:
+        round_number = pair_next_round(event)
+    except ValueError as err:
+        return error_cannot_pair(err)
+
+    # Commit and write the round from this session into the
+    # postgresql database
+    db.session.commit()
+
+    # Read the new round back with the players' names in one go
+    queryData = fast_dump(
+        pairings_schema, round_pairings(event_id, round_number)
+    )
+    return jsonify(queryData), 201
+
+
+@pairingsBp.route("/<int:round_number>")
+def get_round(event_id, round_number):
+    """
+    Retrieve and read every match of a round of an event in table
+    order, along with the results reported so far.
+    """
+    # Select the matches of the round in table order
+    queryData = fast_dump(pairings_schema, round_pairings(event_id, round_number))
+
+    # Return the round if it has been paired, otherwise inform the user
+    # that it does not exist yet.
+    if queryData:
+        return jsonify(queryData)
+    else:
+        return error_round_does_not_exist(event_id, round_number)
+
+
+@pairingsBp.route("/<int:round_number>/results", methods = ["POST"])
+def report_results(event_id, round_number):
+    """
+    Record a batch of match results for a round. The body is a JSON
+    list of results, each with the table number and one of Draw,
+    PlayerOne or PlayerTwo. The players' rankings and the event
+    standings are updated in the same transaction, and results that
+    could not be recorded are reported back by their position.
+    """
+    # Selects the event from the database with the matching ID
+    event = db.session.get(Event, event_id)
+    if event is None:
+        return error_event_does_not_exist(event_id)
+
+    # Validate the whole batch of results from the request body
+    results = match_results_schema.load(request.get_json())
+
+    # Record the results, or explain why the round cannot take them
+    try:
+        recorded, errors = record_results(event, round_number, results)
+    except ValueError as err:
+        return error_cannot_record(err)
+
+    # Commit and write the results from this session into the
+    # postgresql database
+    db.session.commit()
+    report = {"recorded": recorded, "errors": errors}
+    if recorded:
+        return jsonify(report)
+    else:
+        return jsonify(report), 400
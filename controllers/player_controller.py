@@ -9,7 +9,23 @@ from flask import Blueprint, jsonify, request
 # Local imports
 from init import db
 from models.player import Player
+from models.rating import Rating
+from models.registration import Registration
+from models.waitlist import WaitlistEntry
 from schemas.player_schema import player_schema, players_schema
+from schemas.rating_schema import rating_schema, ratings_schema
+from utils.pagination import paginate, page_response
+from utils.query_shaping import eager_load
+from utils.sparse_fields import projected_schema
+from utils.fast_dump import fast_dump
+from utils.streaming import stream_response, wants_stream
+from utils.batch_lookup import batch_response, get_by_ids, requested_ids
+from utils.admission import (
+    lock_events, 
+    promote_waitlisted, 
+    release_seat, 
+    remove_from_waitlist
+)
 
 # Create the Template Web Application Interface for player routes to 
 # be applied to the Flask application
@@ -32,6 +48,18 @@ def error_player_does_not_exist(player_id):
         f"Player ID {player_id} does not exist"
     }, 404
 
+def error_player_not_rated(player_id):
+    return {
+        "message": 
+        f"Player ID {player_id} has not played a completed event yet."
+    }, 404
+
+def error_no_ratings():
+    return {
+        "message": 
+        "No player ratings yet. Complete an event to get started."
+    }, 404
+
 def player_successfully_removed(player_name):
     return {
         "message": 
@@ -80,16 +108,34 @@ def getPlayers():
     """
     # Selects all the players from the database
     statement = db.select(Player)
-    playersList = db.session.scalars(statement)
+
+    # Only read and display the fields the client asked for
+    schema = projected_schema(players_schema)
+    statement = eager_load(statement, Player, schema)
+
+    # Fetch only the players asked for by ID, in the order they were 
+    # asked for
+    ids = requested_ids()
+    if ids is not None:
+        playersList, missing = get_by_ids(statement, Player, ids)
+        return batch_response(fast_dump(schema, playersList), missing)
+
+    # Stream every matching row instead of a single page when the 
+    # client asks for a full export
+    if wants_stream():
+        return stream_response(statement, Player, schema)
+
+    # Fetch a single page of results
+    playersList, nextCursor = paginate(statement, Player)
 
     # Serialise it as the scalar result is unserialised
-    queryData = players_schema.dump(playersList)
+    queryData = fast_dump(schema, playersList)
     
     # Return the search results if there are players in the player 
     # database, otherwise inform the user that the database is empty.
     if queryData:
         # Return the list of players in JSON format
-        return jsonify(queryData)
+        return page_response(queryData, nextCursor)
     else:
         # Return an error message: Player table is empty
         return error_empty_table()
@@ -104,10 +150,15 @@ def getPlayer(player_id):
     # Selects all the players from the database and filter the 
     # player with matching ID
     statement = db.select(Player).where(Player.player_id == player_id)
+
+    # Only read and display the fields the client asked for
+    schema = projected_schema(player_schema)
+    statement = eager_load(statement, Player, schema)
+
     player = db.session.scalar(statement)
 
     # Serialise it as the scalar result is unserialised
-    queryData = player_schema.dump(player)
+    queryData = fast_dump(schema, player)
 
     # Return the search results if this player is in the player 
     # database, otherwise inform the user that the player does 
@@ -120,6 +171,51 @@ def getPlayer(player_id):
         return error_player_does_not_exist(player_id)
     
 
+@playersBp.route("/<int:player_id>/rating")
+def getPlayerRating(player_id):
+    """
+    Retrieve a specific player's global rating, worked out from their 
+    results at every completed event.
+    """
+    # Select the player's rating from the ratings table
+    statement = db.select(Rating).where(Rating.player_id == player_id)
+    statement = eager_load(statement, Rating, rating_schema)
+    rating = db.session.scalar(statement)
+
+    # Return the rating if the player has one, otherwise inform the 
+    # user that the player has not been rated.
+    if rating:
+        return jsonify(fast_dump(rating_schema, rating))
+    else:
+        return error_player_not_rated(player_id)
+
+
+@playersBp.route("/ratings")
+def getRatings():
+    """
+    Retrieve the global leaderboard of player ratings, highest rating 
+    first, one page at a time.
+    """
+    # Read a page of the leaderboard along the rating index
+    statement = eager_load(db.select(Rating), Rating, ratings_schema)
+    ratingsList, nextCursor = paginate(
+        statement, 
+        Rating, 
+        key_columns = (Rating.rating, Rating.player_id), 
+        descending = True
+    )
+
+    # Serialise it as the scalar result is unserialised
+    queryData = fast_dump(ratings_schema, ratingsList)
+
+    # Return the leaderboard if players have been rated, otherwise 
+    # inform the user that there are no ratings yet.
+    if queryData:
+        return page_response(queryData, nextCursor)
+    else:
+        return error_no_ratings()
+
+
 @playersBp.route("/<int:player_id>", methods = ["PUT", "PATCH"])
 def updatePlayer(player_id):
     """
@@ -166,8 +262,34 @@ def deletePlayer(player_id):
 
     # Delete the player from the players database if they exist
     if player:
+        # Remember the events the player is registered to, their places 
+        # are handed on once the registrations are deleted with them
+        statement = (
+            db.select(Registration.event_id)
+            .where(Registration.player_id == player_id)
+            .order_by(Registration.event_id)
+        )
+        event_ids = list(db.session.scalars(statement))
+        statement = db.select(WaitlistEntry.event_id).where(
+            WaitlistEntry.player_id == player_id
+        )
+        waitlisted_event_ids = list(db.session.scalars(statement))
+        lock_events(sorted(set(event_ids) | set(waitlisted_event_ids)))
+
+        # Take the player out of every queue they are waiting in, moving 
+        # the players behind them up a place
+        for event_id in waitlisted_event_ids:
+            remove_from_waitlist(event_id, player_id)
+
         # Remove the player from the session
         db.session.delete(player)
+        db.session.flush()
+
+        # Give each event's place back and register the next player 
+        # waiting for it in the same transaction
+        for event_id in event_ids:
+            release_seat(event_id)
+            promote_waitlisted(event_id)
         
         # Commit and permanently remove the player data from the 
         # postgresql database
@@ -4,12 +4,24 @@ to the ranking data, through REST API design using Flask Blueprint.
 """
 
 # Installed import packages
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import update
 
 # Local imports
 from init import db
+from models.event import Event
 from models.ranking import Ranking
+from utils.pagination import paginate, page_response
+from utils.streaming import stream_response, wants_stream
+from utils.query_shaping import eager_load
+from utils.sparse_fields import projected_schema
+from utils.fast_dump import fast_dump
 from schemas.ranking_schema import ranking_schema, rankings_schema
+from utils.standings import refresh_standings, update_standings
+from utils.ratings import refresh_ratings
+from utils.increments import increment_values
+from utils.table_versions import mark_rows_written
+from utils.bulk_results import submit_rankings
 
 # Create the Template Web Application Interface for card routes 
 # to be applied to the Flask application
@@ -36,11 +48,26 @@ def error_ranking_does_not_exist(event_id, player_id):
         f"Player ID {player_id} does not have a ranking at Event ID {event_id}."
     }, 404
 
+def error_ranking_below_zero(event_id, player_id):
+    return {
+        "message": 
+        f"Player ID {player_id}'s result at Event ID {event_id} cannot go below zero."
+    }, 409
+
+def error_event_does_not_exist(event_id):
+    return {"message": f"Event with id {event_id} does not exist."}, 404
+
+def error_invalid_bulk(reason):
+    return {"message": f"Bulk rankings could not be read: {reason}"}, 400
+
 
 """
 API Routes
 """
 
+# The columns of a ranking that can be set or added to once it exists
+RESULT_COLUMNS = ("placement", "points", "wins", "losses", "ties")
+
 @rankingsBp.route("/", methods = ["POST"])
 def create_ranking():
     """
@@ -62,6 +89,12 @@ def create_ranking():
    
     # Add the ranking data into the session
     db.session.add(newRanking)
+
+    # Move the player to their place on the event's leaderboard
+    update_standings(newRanking.event_id, [newRanking.player_id])
+
+    # Rate the event again if it was rated without this result
+    refresh_ratings(newRanking.event_id)
     
     # Commit and write the ranking data from this session into 
     # the postgresql database
@@ -69,6 +102,38 @@ def create_ranking():
     return jsonify(ranking_schema.dump(newRanking)), 201
 
 
+@rankingsBp.route("/bulk", methods = ["POST"])
+def create_rankings():
+    """
+    Add or update the rankings of a whole event in one transaction, 
+    for submitting the results of every table at the end of a round. 
+    The body holds the event ID and a list of rankings, which are 
+    matched on the player and event. Rows that fail validation are 
+    reported back by their position without stopping the rest.
+    """
+    # Fetch the event and its rankings from the request body
+    bodyData = request.get_json()
+    event_id = bodyData.get("event_id") if isinstance(bodyData, dict) else None
+    records = bodyData.get("rankings") if isinstance(bodyData, dict) else None
+    if not isinstance(event_id, int) or not isinstance(records, list):
+        return error_invalid_bulk("send an 'event_id' and a list of 'rankings'.")
+
+    # Rankings cannot exist without an event to be played at
+    if db.session.get(Event, event_id) is None:
+        return error_event_does_not_exist(event_id)
+
+    # Validate and write the valid rankings, then report on the batch
+    report = submit_rankings(
+        event_id, 
+        records, 
+        current_app.config["IMPORT_BATCH_SIZE"]
+    )
+    if report["added"] or report["updated"]:
+        return jsonify(report), 201
+    else:
+        return jsonify(report), 400
+
+
 @rankingsBp.route("/")
 def get_rankings():
     """
@@ -89,16 +154,91 @@ def get_rankings():
     if event_id:
         statement = statement.where(Ranking.event_id == event_id)
 
+    # Only read and display the fields the client asked for
+    schema = projected_schema(rankings_schema)
+
+    # Fetch the nested records the schema displays in the same round 
+    # trip instead of lazy loading them row by row
+    statement = eager_load(statement, Ranking, schema)
+
+    # Stream every matching row instead of a single page when the 
+    # client asks for a full export
+    if wants_stream():
+        return stream_response(statement, Ranking, schema)
+
     # Serialise it as the scalar result is unserialised
-    rankings_list = db.session.scalars(statement)
-    queryData = rankings_schema.dump(rankings_list)
+    rankings_list, nextCursor = paginate(statement, Ranking)
+    queryData = fast_dump(schema, rankings_list)
 
     # Return the search results if there are rankings in the 
     # ranking database, otherwise inform the user that the 
     # database is empty.
     if queryData:
         # Return the list of rankings in JSON format
-        return jsonify(queryData)
+        return page_response(queryData, nextCursor)
     else:
         # Return an error message: Rankings table is empty
-        return error_empty_table()
\ No newline at end of file
+        return error_empty_table()
+
+
+@rankingsBp.route("/<int:event_id>/<int:player_id>", methods = ["PUT", "PATCH"])
+def update_ranking(event_id, player_id):
+    """
+    Update a player's result at an event, this is the equivalent of 
+    PUT/PATCH in postgresql. Fields can be set to a number, or moved on 
+    from their current value with a signed number such as 
+    {"wins": "+1", "points": "+3"} to record a single match.
+
+    The change is made by one UPDATE ... RETURNING statement rather 
+    than loading the ranking and saving it again, so results reported 
+    from several tables at once are all counted. It is committed before 
+    the leaderboard is updated, so the ranking is only locked for the 
+    length of that one statement.
+    """
+    # Build the changes from the request body, rejecting any field 
+    # that is not a result
+    values, conditions = increment_values(Ranking, request.get_json(), RESULT_COLUMNS)
+
+    # Update the ranking in place and read back the new values, unless 
+    # a count would go below zero
+    statement = (
+        update(Ranking)
+        .where(
+            Ranking.event_id == event_id, 
+            Ranking.player_id == player_id,
+            *conditions
+        )
+        .values(**values)
+        .returning(Ranking)
+        .execution_options(populate_existing = True)
+    )
+    ranking = db.session.scalars(statement).first()
+
+    # Tell the user whether the ranking does not exist or the change 
+    # was refused
+    if ranking is None:
+        db.session.rollback()
+        if db.session.get(Ranking, (player_id, event_id)) is None:
+            return error_ranking_does_not_exist(event_id, player_id)
+        return error_ranking_below_zero(event_id, player_id)
+
+    # Commit the updated ranking to the database, moving on the 
+    # versions of this event's and this player's rankings only
+    mark_rows_written(
+        db.session, 
+        Ranking.__tablename__, 
+        event_id = [event_id], 
+        player_id = [player_id]
+    )
+    db.session.commit()
+
+    # Move the player to their new place on the leaderboard in a 
+    # transaction of its own
+    refresh_standings(event_id, [player_id])
+
+    # Rate the event again if it was rated with the old result
+    refresh_ratings(event_id)
+    db.session.commit()
+
+    # Return the updated ranking
+    return jsonify(ranking_schema.dump(ranking))
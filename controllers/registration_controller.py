@@ -4,12 +4,29 @@ the registration data, through REST API design using Flask Blueprint.
 """
 
 # Installed import packages
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import inspect
 
 # Local imports
 from init import db
+from models.event import Event
 from models.registration import Registration
+from models.waitlist import WaitlistEntry
+from utils.admission import (
+    add_to_waitlist, 
+    claim_seat, 
+    promote_waitlisted, 
+    release_seat, 
+    remove_from_waitlist
+)
+from utils.bulk_results import submit_registrations
+from utils.pagination import paginate, page_response
+from utils.streaming import stream_response, wants_stream
+from utils.query_shaping import eager_load
+from utils.sparse_fields import projected_schema
+from utils.fast_dump import fast_dump
 from schemas.registration_schema import registration_schema, registrations_schema
+from schemas.waitlist_schema import waitlist_entry_schema, waitlist_schema
 
 # Create the Template Web Application Interface for card routes to 
 # be applied to the Flask application
@@ -36,6 +53,46 @@ def error_registration_does_not_exist(event_id, player_id):
         f"Player ID {player_id}'s registration to Event ID {event_id} does not exist."
     }, 404
 
+def error_event_does_not_exist(event_id):
+    return {"message": f"Event with id {event_id} does not exist."}, 404
+
+def error_already_waitlisted(event_id, player_id):
+    return {
+        "message": 
+        f"Player ID {player_id} is already on the waitlist of Event ID {event_id}."
+    }, 409
+
+def error_not_waitlisted(event_id, player_id):
+    return {
+        "message": 
+        f"Player ID {player_id} is not on the waitlist of Event ID {event_id}."
+    }, 404
+
+def error_empty_waitlist(event_id):
+    return {"message": f"Nobody is on the waitlist of Event ID {event_id}."}
+
+def error_invalid_bulk(reason):
+    return {"message": f"Bulk registrations could not be read: {reason}"}, 400
+
+def registration_successfully_removed(event_id, player_id, promoted):
+    return {
+        "message": 
+        f"Player ID {player_id}'s registration to Event ID {event_id} deleted successfully.",
+        "promoted": promoted
+    }, 200
+
+def waitlist_successfully_left(event_id, player_id):
+    return {
+        "message": 
+        f"Player ID {player_id} has left the waitlist of Event ID {event_id}."
+    }, 200
+
+def error_already_registered(event_id, player_id):
+    return {
+        "message": 
+        f"Player ID {player_id} is already registered to Event ID {event_id}."
+    }, 409
+
 
 """
 API Routes
@@ -58,6 +115,23 @@ def create_registration():
         bodyData,
         session = db.session
     )
+
+    # The schema loads the existing registration when the player has 
+    # already signed up, which would otherwise take a second place
+    if inspect(newRegistration).persistent:
+        return error_already_registered(
+            newRegistration.event_id, 
+            newRegistration.player_id
+        )
+
+    # Take one of the event's places, or put the player on the waitlist 
+    # if the event is full. The place is given back if the commit fails.
+    if not claim_seat(newRegistration.event_id):
+        db.session.rollback()
+        event = db.session.get(Event, newRegistration.event_id)
+        if event is None:
+            return error_event_does_not_exist(newRegistration.event_id)
+        return join_waitlist(newRegistration)
    
     # Add the registration data into the session
     db.session.add(newRegistration)
@@ -68,6 +142,64 @@ def create_registration():
     return jsonify(registration_schema.dump(newRegistration)), 201
 
 
+@registrationsBp.route("/bulk", methods = ["POST"])
+def create_registrations():
+    """
+    Sign up a whole list of players to an event in one transaction. 
+    The body holds the event ID and a list of registrations. Players 
+    are given the event's free places in the order listed and join its 
+    waitlist once it is full, players already registered have their 
+    deck updated. Rows that fail validation are reported back by their 
+    position without stopping the rest.
+    """
+    # Fetch the event and its registrations from the request body
+    bodyData = request.get_json()
+    event_id = bodyData.get("event_id") if isinstance(bodyData, dict) else None
+    records = bodyData.get("registrations") if isinstance(bodyData, dict) else None
+    if not isinstance(event_id, int) or not isinstance(records, list):
+        return error_invalid_bulk("send an 'event_id' and a list of 'registrations'.")
+
+    # Validate and write the valid registrations, then report on the batch
+    report = submit_registrations(
+        event_id, 
+        records, 
+        current_app.config["IMPORT_BATCH_SIZE"]
+    )
+    if report is None:
+        return error_event_does_not_exist(event_id)
+    if report["registered"] or report["updated"] or report["waitlisted"] or report["promoted"]:
+        return jsonify(report), 201
+    else:
+        return jsonify(report), 400
+
+
+def join_waitlist(registration):
+    """
+    Add a player who signed up to a full event to the end of its 
+    waitlist, keeping the deck they registered with.
+    """
+    # Check the player is not already waiting for a place
+    statement = db.select(WaitlistEntry).where(
+        WaitlistEntry.event_id == registration.event_id,
+        WaitlistEntry.player_id == registration.player_id
+    )
+    if db.session.scalar(statement):
+        return error_already_waitlisted(registration.event_id, registration.player_id)
+
+    # Add the player to the end of the waitlist and commit it to the 
+    # database
+    add_to_waitlist(
+        registration.event_id, 
+        [(registration.player_id, registration.registered_deck)]
+    )
+    db.session.commit()
+
+    # Return the waitlist entry along with the player's place in the 
+    # queue, accepted as they will be registered once a place opens up
+    entry = db.session.scalar(statement)
+    return jsonify(waitlist_entry_schema.dump(entry)), 202
+
+
 @registrationsBp.route("/")
 def get_registrations():
     """
@@ -88,16 +220,122 @@ def get_registrations():
     if player_id:
         statement = statement.where(Registration.player_id == player_id)
 
+    # Only read and display the fields the client asked for
+    schema = projected_schema(registrations_schema)
+
+    # Fetch the nested records the schema displays in the same round 
+    # trip instead of lazy loading them row by row
+    statement = eager_load(statement, Registration, schema)
+
+    # Stream every matching row instead of a single page when the 
+    # client asks for a full export
+    if wants_stream():
+        return stream_response(statement, Registration, schema)
+
     # Serialise it as the scalar result is unserialised
-    registrations_list = db.session.scalars(statement)
-    queryData = registrations_schema.dump(registrations_list)
+    registrations_list, nextCursor = paginate(statement, Registration)
+    queryData = fast_dump(schema, registrations_list)
 
     # Return the search results if there are registrations in the 
     # registration database, otherwise inform the user that the 
     # database is empty.
     if queryData:
         # Return the list of registrations in JSON format
-        return jsonify(queryData)
+        return page_response(queryData, nextCursor)
     else:
         # Return an error message: Registrations table is empty
-        return error_empty_table()
\ No newline at end of file
+        return error_empty_table()
+
+
+@registrationsBp.route("/<int:event_id>/<int:player_id>", methods = ["DELETE"])
+def delete_registration(event_id, player_id):
+    """
+    Find the player's registration to the event and remove it from the 
+    registrations database, this is the equivalent of DELETE in 
+    postgresql. The player at the front of the event's waitlist is 
+    registered in their place in the same transaction.
+    """
+    # Selects the registration with the matching IDs
+    registration = db.session.get(Registration, (event_id, player_id))
+
+    # Delete the registration and hand its place on if it exists
+    if registration:
+        # Remove the registration from the session and give its place 
+        # to the next player waiting
+        db.session.delete(registration)
+        db.session.flush()
+        release_seat(event_id)
+        promoted = promote_waitlisted(event_id)
+
+        # Commit and permanently remove the registration data from 
+        # the postgresql database
+        db.session.commit()
+
+        # Return an acknowledgement listing the players promoted
+        return registration_successfully_removed(event_id, player_id, promoted)
+    else:
+        # Return an error message: Registration does not exist
+        return error_registration_does_not_exist(event_id, player_id)
+
+
+"""
+Waitlist Routes
+"""
+
+@registrationsBp.route("/waitlist/<int:event_id>")
+def get_waitlist(event_id):
+    """
+    Retrieve and read the players waiting for a place at the event, in 
+    the order they will be given one, along with each player's place 
+    in the queue.
+    """
+    # Select the event's waitlist in queue order
+    statement = db.select(WaitlistEntry).where(WaitlistEntry.event_id == event_id)
+    statement = eager_load(statement, WaitlistEntry, waitlist_schema)
+
+    # Fetch a single page of the queue
+    waitlist, nextCursor = paginate(statement, WaitlistEntry)
+    queryData = fast_dump(waitlist_schema, waitlist)
+
+    # Return the waitlist if anyone is waiting, otherwise inform the 
+    # user that the waitlist is empty
+    if queryData:
+        return page_response(queryData, nextCursor)
+    else:
+        return error_empty_waitlist(event_id)
+
+
+@registrationsBp.route("/waitlist/<int:event_id>/<int:player_id>")
+def get_waitlist_entry(event_id, player_id):
+    """
+    Retrieve a player's entry on the event's waitlist and their place 
+    in the queue.
+    """
+    # Selects the waitlist entry with the matching IDs
+    statement = db.select(WaitlistEntry).where(
+        WaitlistEntry.event_id == event_id,
+        WaitlistEntry.player_id == player_id
+    )
+    entry = db.session.scalar(statement)
+
+    # Return the entry if the player is waiting, otherwise inform the 
+    # user that they are not on the waitlist
+    if entry:
+        return jsonify(fast_dump(waitlist_entry_schema, entry))
+    else:
+        return error_not_waitlisted(event_id, player_id)
+
+
+@registrationsBp.route("/waitlist/<int:event_id>/<int:player_id>", methods = ["DELETE"])
+def leave_waitlist(event_id, player_id):
+    """
+    Take a player off the event's waitlist, this is the equivalent of 
+    DELETE in postgresql. Everyone behind them moves up a place.
+    """
+    # Remove the player from the waitlist if they are on it
+    if remove_from_waitlist(event_id, player_id):
+        db.session.commit()
+        return waitlist_successfully_left(event_id, player_id)
+    else:
+        db.session.rollback()
+        return error_not_waitlisted(event_id, player_id)
@@ -9,6 +9,12 @@ from flask import Blueprint, jsonify, request
 # Local imports
 from init import db
 from models.venue import Venue
+from utils.pagination import paginate, page_response
+from utils.streaming import stream_response, wants_stream
+from utils.query_shaping import eager_load
+from utils.sparse_fields import projected_schema
+from utils.fast_dump import fast_dump
+from utils.batch_lookup import batch_response, get_by_ids, requested_ids
 from schemas.venue_schema import venue_schema, venues_schema
 
 # Create the Template Web Application Interface for venue routes to 
@@ -80,17 +86,35 @@ def getVenues():
     """
     # Selects all the venues from the database
     statement = db.select(Venue)
-    venuesList = db.session.scalars(statement)
+
+    # Only read and display the fields the client asked for
+    schema = projected_schema(venues_schema)
+    statement = eager_load(statement, Venue, schema)
+
+    # Fetch only the venues asked for by ID, in the order they were 
+    # asked for
+    ids = requested_ids()
+    if ids is not None:
+        venuesList, missing = get_by_ids(statement, Venue, ids)
+        return batch_response(fast_dump(schema, venuesList), missing)
+
+    # Stream every matching row instead of a single page when the 
+    # client asks for a full export
+    if wants_stream():
+        return stream_response(statement, Venue, schema)
+
+    # Fetch a single page of results
+    venuesList, nextCursor = paginate(statement, Venue)
 
     # Serialise it as the scalar result is unserialised
-    queryData = venues_schema.dump(venuesList)
+    queryData = fast_dump(schema, venuesList)
     
     # Return the search results if there are venues in the venue 
     # database, otherwise inform the user that the database is 
     # empty.
     if queryData:
         # Return the list of venues in JSON format
-        return jsonify(queryData)
+        return page_response(queryData, nextCursor)
     else:
         # Return an error message: Venue table is empty
         return error_empty_table()
@@ -105,10 +129,15 @@ def getVenue(venue_id):
     # Selects all the venues from the database and filter the venue 
     # with matching ID
     statement = db.select(Venue).where(Venue.venue_id == venue_id)
+
+    # Only read and display the fields the client asked for
+    schema = projected_schema(venue_schema)
+    statement = eager_load(statement, Venue, schema)
+
     venue = db.session.scalar(statement)
 
     # Serialise it as the scalar result is unserialised
-    queryData = venue_schema.dump(venue)
+    queryData = fast_dump(schema, venue)
 
     # Return the search results if this venue is in the venue 
     # database, otherwise inform the user that the venue does not 
@@ -11,6 +11,14 @@ from dotenv import load_dotenv
 
 # Local imports
 from init import db
+from utils.table_versions import track_table_writes
+from utils.response_cache import init_response_cache
+from utils.metagame import init_metagame_cache
+from utils.compression import init_compression
+from utils.card_search import init_card_search
+from utils.query_metrics import register_query_metrics
+from utils.engine_config import engine_options, env_flag, register_pool_logging
+from utils.json_provider import init_json_provider
 from controllers.blueprints_register import attach_blueprints
 from utils.error_handler import register_error_handlers
 
@@ -29,10 +37,79 @@ def create_app():
     # Load the database address from the .env file. This function requires 
     # load_dotenv()
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv("DATABASE_URI")
+
+    # Size and tune the connection pool from the environment
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(
+        app.config['SQLALCHEMY_DATABASE_URI']
+    )
+
+    # Checkouts that wait longer than this for a database connection 
+    # are logged
+    app.config['DB_POOL_WAIT_LOG_MS'] = float(os.getenv("DB_POOL_WAIT_LOG_MS", 100))
+
+    # Number of records returned per page on the list routes, clients 
+    # can ask for smaller or larger pages up to the maximum
+    app.config['PAGE_SIZE_DEFAULT'] = int(os.getenv("PAGE_SIZE_DEFAULT", 50))
+    app.config['PAGE_SIZE_MAX'] = int(os.getenv("PAGE_SIZE_MAX", 500))
+
+    # Most records that can be fetched at once by '?ids=' on a list route
+    app.config['BATCH_IDS_MAX'] = int(os.getenv("BATCH_IDS_MAX", 100))
+
+    # Display the read routes' results with compiled serialisers rather 
+    # than marshmallow's dump, the output is the same either way
+    app.config['FAST_SERIALISERS'] = env_flag("FAST_SERIALISERS", True)
+
+    # Number of rows fetched from the database at a time when a list 
+    # route streams its results
+    app.config['STREAM_BATCH_SIZE'] = int(os.getenv("STREAM_BATCH_SIZE", 1000))
+
+    # Number of rows written per statement by the bulk imports
+    app.config['IMPORT_BATCH_SIZE'] = int(os.getenv("IMPORT_BATCH_SIZE", 1000))
     
-    # Keep the order of keys in JSON response
-    app.json.sort_keys = False
+    # Cache read responses in memory until a commit changes the tables 
+    # they were built from. Set the backend to 'none' to switch it off.
+    app.config['RESPONSE_CACHE_BACKEND'] = os.getenv("RESPONSE_CACHE_BACKEND", "lru")
+    app.config['RESPONSE_CACHE_MAX_ENTRIES'] = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+    app.config['RESPONSE_CACHE_TTL'] = int(os.getenv("RESPONSE_CACHE_TTL", 60))
+
+    # Number of days the metagame reports cover by default, and how many 
+    # events' card totals are kept in memory and for how many seconds
+    app.config['METAGAME_WINDOW_DAYS'] = int(os.getenv("METAGAME_WINDOW_DAYS", 90))
+    app.config['METAGAME_CACHE_EVENTS'] = int(os.getenv("METAGAME_CACHE_EVENTS", 4096))
+    app.config['METAGAME_CACHE_TTL'] = int(os.getenv("METAGAME_CACHE_TTL", 600))
+
+    # Compress responses of at least the minimum size in bytes, with 
+    # gzip at the given level (1-9) or Brotli at the given quality (0-11)
+    app.config['COMPRESSION_ENABLED'] = env_flag("COMPRESSION_ENABLED", True)
+    app.config['COMPRESSION_MIN_SIZE'] = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+    app.config['COMPRESSION_LEVEL'] = int(os.getenv("COMPRESSION_LEVEL", 6))
+    app.config['COMPRESSION_BROTLI_QUALITY'] = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+
+    # Number of recent requests kept per endpoint for the query metrics, 
+    # and the statement count and database time past which a request 
+    # is logged as slow
+    app.config['QUERY_METRICS_WINDOW'] = int(os.getenv("QUERY_METRICS_WINDOW", 1000))
+    app.config['SLOW_REQUEST_QUERY_THRESHOLD'] = int(os.getenv("SLOW_REQUEST_QUERY_THRESHOLD", 20))
+    app.config['SLOW_REQUEST_DB_MS_THRESHOLD'] = float(os.getenv("SLOW_REQUEST_DB_MS_THRESHOLD", 250))
+
+    # Encode JSON responses with orjson when it is installed ('auto'), 
+    # or always with orjson or the standard library encoder
+    app.config['JSON_BACKEND'] = os.getenv("JSON_BACKEND", "auto").strip().lower()
+    init_json_provider(app)
     db.init_app(app)
+
+    # Keep track of which tables each commit writes to, so cached 
+    # responses built from those tables are no longer served
+    track_table_writes()
+    init_response_cache(app)
+    init_metagame_cache(app)
+    init_compression(app)
+    init_card_search(app)
+
+    # Count and time the SQL statements run by each request, and warn 
+    # when the connection pool runs out
+    register_query_metrics(app)
+    register_pool_logging(app)
     
     # Apply the imported routes created in the controllers folder to this 
     # instance of Flask app
@@ -37,13 +37,15 @@ class Collection(db.Model):
     this behaviour.
     """
     # Create a unique constraint that prevents duplicate decks in a player's 
-    # collection
+    # collection, which also finds a player's decks. The index finds 
+    # the players owning a deck.
     __table_args__ = (
         db.UniqueConstraint(
             "player_id", 
             "deck_id", 
             name = "unique_decks_in_player_collection"
         ),
+        db.Index("collection_deck", "deck_id", "collection_id"),
     )
 
     # Define the relationships between players, decks, and collections
@@ -40,12 +40,15 @@ class Decklist(db.Model):
     with a deck.
     """
     # Define the primary key as a union of both the deck_id and card_id
+    # The primary key finds a deck's cards, the index finds the decks 
+    # playing a card.
     __table_args__ = (
         db.PrimaryKeyConstraint(
             "deck_id", 
             "card_id", 
             name = "deck_build"
         ),
+        db.Index("decklist_card", "card_id", "deck_id"),
         db.CheckConstraint('card_quantity > 0') # at least 1 copy
     )
 
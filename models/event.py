@@ -65,6 +65,28 @@ class Event(db.Model):
         db.Enum(EventStatus), 
         default = EventStatus.Planned
     )
+    # Number of players registered, kept alongside the registrations so 
+    # the player cap can be checked and claimed in a single statement
+    registration_count = db.Column(
+        db.Integer, 
+        default = 0, 
+        server_default = "0", 
+        nullable = False
+    )
+    # Whether this event's results have been counted in the player ratings
+    ratings_applied = db.Column(
+        db.Boolean, 
+        default = False, 
+        nullable = False
+    )
+
+    # Index the events of each organiser and venue in event order, and 
+    # the calendar the metagame reports and ratings read events by
+    __table_args__ = (
+        db.Index("event_organiser", "organiser_id", "event_id"),
+        db.Index("event_venue", "venue_id", "event_id"),
+        db.Index("event_calendar", "event_date"),
+    )
 
     """
     Relationships:
@@ -85,4 +107,28 @@ class Event(db.Model):
         "Ranking",
         back_populates = "event",
         cascade = "all, delete"
+    )
+    # Delete the standings if the event is deleted
+    standings = db.relationship(
+        "Standing",
+        back_populates = "event",
+        cascade = "all, delete"
+    )
+    # Delete the rating history if the event is deleted
+    rating_history = db.relationship(
+        "RatingHistory",
+        back_populates = "event",
+        cascade = "all, delete"
+    )
+    # Delete the pairings if the event is deleted
+    pairings = db.relationship(
+        "Pairing",
+        back_populates = "event",
+        cascade = "all, delete"
+    )
+    # Delete the waitlist if the event is deleted
+    waitlist = db.relationship(
+        "WaitlistEntry",
+        back_populates = "event",
+        cascade = "all, delete"
     )
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+This file defines the model for the 'pairings' table and it's
+relationships with the 'events' and 'players' models.
+"""
+# Built-in imports
+from enum import StrEnum, auto
+
+# Local imports
+from init import db
+
+
+"""
+Enumerated values for attributes of a pairing that have a value from a
+pre-defined set
+"""
+
+class MatchResult(StrEnum):
+    """
+    This defines the outcome of a match between two players.
+    """
+    # Auto uses the enum name as the string value
+    Bye = auto()
+    Draw = auto()
+    PlayerOne = auto()
+    PlayerTwo = auto()
+
+
+class Pairing(db.Model):
+    """
+    The pairing table template contains a single match of a Swiss round
+    at an event. Pairing attributes are:
+        - Pairing ID: Unique identifier of the match
+        - Event ID: Event the match is played at
+        - Round Number: Swiss round the match belongs to, starting at 1
+        - Table Number: Where the match is played, table 1 seats the
+                        leaders of the round
+        - Player One ID: First player seated at the table
+        - Player Two ID: Their opponent, empty when player one has
+                         been given the round's bye
+        - Result: Outcome of the match, empty until it is reported
+    """
+
+    # Name of the table and what is referenced by Flask-SQLAlchemy methods
+    __tablename__ = "pairings"
+
+    # Table columns
+    pairing_id = db.Column(db.Integer, primary_key = True)
+    event_id = db.Column(
+        db.Integer,
+        db.ForeignKey("events.event_id"),
+        nullable = False
+    )
+    round_number = db.Column(db.Integer, nullable = False)
+    table_number = db.Column(db.Integer, nullable = False)
+    player_one_id = db.Column(
+        db.Integer,
+        db.ForeignKey("players.player_id"),
+        nullable = False
+    )
+    player_two_id = db.Column(
+        db.Integer,
+        db.ForeignKey("players.player_id")
+    )
+    result = db.Column(db.Enum(MatchResult))
+
+    # Each table is only used once a round, and a round's matches are
+    # read in table order
+    __table_args__ = (
+        db.UniqueConstraint(
+            "event_id",
+            "round_number",
+            "table_number",
+            name = "round_table"
+        ),
+    )
+
+    # Define the relationships between events, players, and pairings
+    event = db.relationship("Event", back_populates = "pairings")
+    player_one = db.relationship(
+        "Player",
+        foreign_keys = [player_one_id],
+        back_populates = "pairings_as_player_one"
+    )
+    player_two = db.relationship(
+        "Player",
+        foreign_keys = [player_two_id],
+        back_populates = "pairings_as_player_two"
+    )
@@ -43,4 +43,42 @@ class Player(db.Model):
         "Ranking",
         back_populates = "player",
         cascade = "all, delete"
+    )
+    # Delete the standings if the player is deleted
+    standings = db.relationship(
+        "Standing",
+        back_populates = "player",
+        cascade = "all, delete"
+    )
+    # Delete the rating if the player is deleted
+    rating = db.relationship(
+        "Rating",
+        back_populates = "player",
+        uselist = False,
+        cascade = "all, delete"
+    )
+    # Delete the rating history if the player is deleted
+    rating_history = db.relationship(
+        "RatingHistory",
+        back_populates = "player",
+        cascade = "all, delete"
+    )
+    # Delete the pairings if the player is deleted
+    pairings_as_player_one = db.relationship(
+        "Pairing",
+        foreign_keys = "Pairing.player_one_id",
+        back_populates = "player_one",
+        cascade = "all, delete"
+    )
+    pairings_as_player_two = db.relationship(
+        "Pairing",
+        foreign_keys = "Pairing.player_two_id",
+        back_populates = "player_two",
+        cascade = "all, delete"
+    )
+    # Delete the player's waitlist places if the player is deleted
+    waitlist_entries = db.relationship(
+        "WaitlistEntry",
+        back_populates = "player",
+        cascade = "all, delete"
     )
\ No newline at end of file
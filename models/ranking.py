@@ -34,13 +34,15 @@ class Ranking(db.Model):
 
     # Define the primary key as a union of both the event_id and player_id
     # Primary key means player & event combination uniqueness and cannot 
-    # be nulled.
+    # be nulled. The primary key finds a player's rankings, the index 
+    # finds an event's rankings in player order.
     __table_args__ = (
         db.PrimaryKeyConstraint(
             "player_id", 
             "event_id", 
             name = "player_ranking"
         ),
+        db.Index("ranking_event", "event_id", "player_id"),
     )
 
     # Define the relationships between events, players, and rankings
@@ -0,0 +1,37 @@
+"""
+This file defines the model for the 'ratings' table and it's 
+relationship with the 'players' model. 
+"""
+# Local imports
+from init import db
+
+class Rating(db.Model):
+    """
+    The rating table template holds each player's global skill rating, 
+    worked out from their results across every completed event in the 
+    order the events were held.
+        - Rating: Elo style rating, new players start at 1500
+        - Events Played: Number of completed events rated
+        - Last Event Date: Date of the latest event rated
+    """
+
+    # Name of the table and what is referenced by Flask-SQLAlchemy methods
+    __tablename__ = "ratings"
+
+    # Table columns
+    player_id = db.Column(
+        db.Integer, 
+        db.ForeignKey("players.player_id"), 
+        primary_key = True
+    )
+    rating = db.Column(db.Float, nullable = False)
+    events_played = db.Column(db.Integer, default = 0, nullable = False)
+    last_event_date = db.Column(db.Date)
+
+    # Index the global leaderboard order, highest rating first
+    __table_args__ = (
+        db.Index("rating_leaderboard", "rating", "player_id"),
+    )
+
+    # Define the relationship between players and their rating
+    player = db.relationship("Player", back_populates = "rating")
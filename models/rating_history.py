@@ -0,0 +1,48 @@
+"""
+This file defines the model for the 'rating_history' table and it's 
+relationships with 'events' and the 'players' models. 
+"""
+# Local imports
+from init import db
+
+class RatingHistory(db.Model):
+    """
+    The rating history table template holds each player's rating just 
+    after every completed event they were rated at. The ratings can 
+    then be replayed from any event onwards, starting from each 
+    player's rating before it, rather than from every event ever held.
+        - Rating: Rating after the event
+        - Events Played: Completed events rated, including this one
+    """
+
+    # Name of the table and what is referenced by Flask-SQLAlchemy methods
+    __tablename__ = "rating_history"
+
+    # Table columns
+    event_id = db.Column(
+        db.Integer, 
+        db.ForeignKey("events.event_id"), 
+        nullable = False
+    )
+    player_id = db.Column(
+        db.Integer, 
+        db.ForeignKey("players.player_id"), 
+        nullable = False
+    )
+    rating = db.Column(db.Float, nullable = False)
+    events_played = db.Column(db.Integer, nullable = False)
+
+    # Define the primary key as a union of both the event_id and player_id
+    # and index each player's history
+    __table_args__ = (
+        db.PrimaryKeyConstraint(
+            "event_id", 
+            "player_id", 
+            name = "player_rating_history"
+        ),
+        db.Index("rating_history_player", "player_id", "event_id"),
+    )
+
+    # Define the relationships between events, players, and their history
+    player = db.relationship("Player", back_populates = "rating_history")
+    event = db.relationship("Event", back_populates = "rating_history")
@@ -20,12 +20,15 @@ class Registration(db.Model):
     __tablename__ = "registrations"
     
     # Define the primary key as a union of both the event_id and player_id
+    # The primary key finds an event's registrations, the index finds 
+    # a player's registrations in event order.
     __table_args__ = (
         db.PrimaryKeyConstraint(
             "event_id", 
             "player_id", 
             name = "player_registration"
         ),
+        db.Index("registration_player", "player_id", "event_id"),
     )
 
     # Table columns
@@ -0,0 +1,58 @@
+"""
+This file defines the model for the 'standings' table and it's 
+relationships with 'events' and the 'players' models. 
+"""
+# Local imports
+from init import db
+
+class Standing(db.Model):
+    """
+    The standing table template holds the precomputed leaderboard of an 
+    event. Each row is a player's place in the event worked out from 
+    their ranking record, so reading the leaderboard is a straight read 
+    of the rows in position order rather than a sort of every ranking.
+        - Position: Place on the leaderboard, 1 being the leader
+        - Points, Wins, Losses, Ties: Copied from the player's ranking
+        - Match Win Percentage: Share of available match points won
+        - Opponent Win Percentage: Average match win percentage of 
+                                   the player's opponents, the first 
+                                   tie-breaker
+    """
+    
+    # Name of the table and what is referenced by Flask-SQLAlchemy methods
+    __tablename__ = "standings"
+    
+    # Table columns
+    event_id = db.Column(
+        db.Integer, 
+        db.ForeignKey("events.event_id"), 
+        nullable = False
+    )
+    player_id = db.Column(
+        db.Integer, 
+        db.ForeignKey("players.player_id"), 
+        nullable = False
+    )
+    position = db.Column(db.Integer, nullable = False)
+    points = db.Column(db.Integer, default = 0, nullable = False)
+    wins = db.Column(db.Integer, default = 0, nullable = False)
+    losses = db.Column(db.Integer, default = 0, nullable = False)
+    ties = db.Column(db.Integer, default = 0, nullable = False)
+    match_win_pct = db.Column(db.Float, default = 0, nullable = False)
+    # Empty until the event has recorded who played who
+    opponent_win_pct = db.Column(db.Float)
+
+    # Define the primary key as a union of both the event_id and player_id
+    # and index the leaderboard order of each event
+    __table_args__ = (
+        db.PrimaryKeyConstraint(
+            "event_id", 
+            "player_id", 
+            name = "player_standing"
+        ),
+        db.Index("event_leaderboard", "event_id", "position"),
+    )
+
+    # Define the relationships between events, players, and standings
+    player = db.relationship("Player", back_populates = "standings")
+    event = db.relationship("Event", back_populates = "standings")
@@ -0,0 +1,25 @@
+"""
+This file defines the model for the 'table_versions' table, which holds
+the version numbers the cached responses and ETags are built from.
+"""
+# Local imports
+from init import db
+
+class TableVersion(db.Model):
+    """
+    The table versions template holds the version of each table and
+    filter key that has been written to (see utils/table_versions.py).
+    Keys that have never been written to have no row and are at
+    version 0.
+        - Version Key: The table ('rankings'), the table written without
+          saying which rows ('rankings.*') or a key value of a row
+          ('rankings.event_id=3')
+        - Version: Moved on by one in every transaction writing to the key
+    """
+
+    # Name of the table and what is referenced by Flask-SQLAlchemy methods
+    __tablename__ = "table_versions"
+
+    # Table columns
+    version_key = db.Column(db.String(), primary_key = True)
+    version = db.Column(db.BigInteger, default = 0, nullable = False)
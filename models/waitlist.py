@@ -0,0 +1,68 @@
+"""
+This file defines the model for the 'waitlist' table and it's
+relationships with the 'events' and 'players' models.
+"""
+# Built-in imports
+from datetime import date
+
+# Local imports
+from init import db
+
+
+class WaitlistEntry(db.Model):
+    """
+    The waitlist table template contains the players waiting for a
+    place at an event that has reached its player cap. Players are
+    given places in the order they joined the waitlist. Waitlist
+    attributes are:
+        - Waitlist ID: Unique identifier of the entry, handed out in
+                       the order players join
+        - Position: The player's place in the queue, 1 being the next
+                    player given a place
+        - Event ID: Event the player is waiting for a place at
+        - Player ID: Player waiting for a place
+        - Registered Deck: Deck the player will use once registered
+        - Joined Date: When the player joined the waitlist
+    """
+
+    # Name of the table and what is referenced by Flask-SQLAlchemy methods
+    __tablename__ = "waitlist"
+
+    # Table columns
+    waitlist_id = db.Column(db.Integer, primary_key = True)
+    event_id = db.Column(
+        db.Integer,
+        db.ForeignKey("events.event_id"),
+        nullable = False
+    )
+    player_id = db.Column(
+        db.Integer,
+        db.ForeignKey("players.player_id"),
+        nullable = False
+    )
+    # nullable as players can join the waitlist before they add their deck
+    registered_deck = db.Column(
+        db.Integer,
+        db.ForeignKey("collections.collection_id")
+    )
+    joined_date = db.Column(db.Date, default = date.today)
+    # Kept numbered from 1 without gaps as players leave the queue, so 
+    # a player's place is read straight from their entry. Entries made 
+    # before the column existed are numbered by 'flask db upgrade'
+    position = db.Column(db.Integer, nullable = False, default = 0)
+
+    # A player waits for an event once. The queue of an event is read
+    # in waitlist ID order, which the index walks directly, so finding
+    # the next players and the end of the queue are index reads.
+    __table_args__ = (
+        db.UniqueConstraint(
+            "event_id",
+            "player_id",
+            name = "waitlist_player"
+        ),
+        db.Index("waitlist_queue", "event_id", "waitlist_id"),
+    )
+
+    # Define the relationships between events, players, and the waitlist
+    event = db.relationship("Event", back_populates = "waitlist")
+    player = db.relationship("Player", back_populates = "waitlist_entries")
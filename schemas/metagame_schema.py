@@ -0,0 +1,57 @@
+"""
+This file creates the structure on how the card usage and metagame
+reports should be organised. These are aggregates worked out from the
+decklists, registrations and rankings rather than rows of a single
+table, so the schemas are plain marshmallow schemas.
+"""
+
+# Installed import packages
+from marshmallow import Schema, fields
+
+
+class CardUsageSchema(Schema):
+    """
+    The card usage schema template. This organises how often a card
+    was played in the decks registered to completed events, and how
+    well those decks did.
+    """
+    # Card Info
+    card_id = fields.Integer()
+    card_number = fields.String()
+    card_name = fields.String()
+
+    # Decks built with the card, whether or not they were played
+    decklists = fields.Integer()
+    decklist_copies = fields.Integer()
+
+    # Decks registered to completed events that played the card
+    entries = fields.Integer()
+    share = fields.Float()
+    copies = fields.Integer()
+    average_copies = fields.Float()
+    weighted_copies = fields.Float()
+
+    # How the players of those decks did
+    wins = fields.Integer()
+    losses = fields.Integer()
+    ties = fields.Integer()
+    win_rate = fields.Float(allow_none = True)
+    top_finishes = fields.Integer()
+
+
+class MetagameSchema(Schema):
+    """
+    The metagame schema template. This organises a report over the
+    completed events held since a date, either of every card played
+    or of a single card.
+    """
+    since = fields.Date()
+    events = fields.Integer()
+    decks = fields.Integer()
+    card = fields.Nested(CardUsageSchema)
+    cards = fields.List(fields.Nested(CardUsageSchema))
+
+
+# Create an instance of the schema for the controllers to call when
+# displaying the reports
+metagame_schema = MetagameSchema()
@@ -0,0 +1,86 @@
+"""
+This file creates the structure on how pairing data should be
+organised within our relational database, their constraints,
+and the relationships between each of these tables.
+"""
+
+# Installed import packages
+from marshmallow_sqlalchemy import SQLAlchemyAutoSchema, auto_field
+from marshmallow.validate import OneOf
+from marshmallow import Schema, fields
+
+# Local imports - Tables
+from models.pairing import Pairing, MatchResult
+
+
+class PairingSchema(SQLAlchemyAutoSchema):
+    """
+    The pairing schema template. This organises the JSON response
+    when fetching the matches of a Swiss round, such as the table,
+    the players seated at it and the result.
+    """
+    class Meta:
+        model = Pairing
+        load_instance = True
+        include_fk = True
+
+        # Define the exact order of how the JSON query is displayed
+        # Round Info, Players, Result
+        fields = (
+            "pairing_id",
+            "event_id",
+            "round_number",
+            "table_number",
+            "player_one_id",
+            "player_one",
+            "player_two_id",
+            "player_two",
+            "result"
+        )
+
+    # Only show the names of the players when showing player
+    # information in the pairings
+    player_one = fields.Nested(
+        "PlayerSchema",
+        dump_only = True,
+        only = [
+            "player_name",
+        ]
+    )
+    player_two = fields.Nested(
+        "PlayerSchema",
+        dump_only = True,
+        only = [
+            "player_name",
+        ]
+    )
+
+
+class MatchResultSchema(Schema):
+    """
+    The match result schema template. This validates each result in a
+    batch of results reported for a round, matched to its pairing by
+    the table number.
+    """
+    table_number = fields.Integer(required = True)
+
+    # Only acceptable values are Draw, PlayerOne or PlayerTwo
+    result = fields.Enum(
+        MatchResult,
+        required = True,
+        validate = OneOf(
+            [
+                MatchResult.Draw,
+                MatchResult.PlayerOne,
+                MatchResult.PlayerTwo
+            ],
+            error = "Only valid results are allowed. Draw, PlayerOne, or PlayerTwo."
+        )
+    )
+
+
+# Create instances of the schema for the controllers to call when
+# applying validation, error handling and restrictions
+pairing_schema = PairingSchema()
+pairings_schema = PairingSchema(many = True)
+match_results_schema = MatchResultSchema(many = True)
@@ -0,0 +1,48 @@
+"""
+This file creates the structure on how rating data should be 
+organised within our relational database, their constraints, 
+and the relationships between each of these tables.
+"""
+
+# Installed import packages
+from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
+from marshmallow import fields
+
+# Local imports - Tables
+from models.rating import Rating
+
+
+class RatingSchema(SQLAlchemyAutoSchema):
+    """
+    The rating schema template. This organises the JSON response 
+    when fetching a player's global rating and the leaderboard.
+    """
+    class Meta:
+        model = Rating
+        load_instance = True
+        include_fk = True
+
+        # Define the exact order of how the JSON query is displayed
+        # Player Info, Rating Info
+        fields = (
+            "player_id",
+            "player",
+            "rating",
+            "events_played",
+            "last_event_date"
+        )
+
+    # Only show the name of the player when showing player 
+    # information with the rating
+    player = fields.Nested(
+        "PlayerSchema", 
+        dump_only = True,
+        only = [
+            "player_name",
+        ]
+    )
+
+# Create instances of the schema for the controllers to call when 
+# applying validation, error handling and restrictions
+rating_schema = RatingSchema()
+ratings_schema = RatingSchema(many = True)
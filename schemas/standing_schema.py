@@ -0,0 +1,53 @@
+"""
+This file creates the structure on how standing data should be 
+organised within our relational database, their constraints, 
+and the relationships between each of these tables.
+"""
+
+# Installed import packages
+from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
+from marshmallow import fields
+
+# Local imports - Tables
+from models.standing import Standing
+
+
+class StandingSchema(SQLAlchemyAutoSchema):
+    """
+    The standing schema template. This organises the JSON response 
+    when fetching an event's leaderboard, such as each player's 
+    position, record and tie-breakers.
+    """
+    class Meta:
+        model = Standing
+        load_instance = True
+        include_fk = True
+
+        # Define the exact order of how the JSON query is displayed
+        # Position, Player Info, Record, Tie-breakers
+        fields = (
+            "position",
+            "player_id",
+            "player",
+            "points",
+            "wins",
+            "losses",
+            "ties",
+            "match_win_pct",
+            "opponent_win_pct"
+        )
+
+    # Only show the name of the player when showing player 
+    # information in the standings
+    player = fields.Nested(
+        "PlayerSchema", 
+        dump_only = True,
+        only = [
+            "player_name",
+        ]
+    )
+
+# Create instances of the schema for the controllers to call when 
+# applying validation, error handling and restrictions
+standing_schema = StandingSchema()
+standings_schema = StandingSchema(many = True)
@@ -0,0 +1,59 @@
+"""
+This file creates the structure on how waitlist data should be 
+organised within our relational database, their constraints, and the 
+relationships between each of these tables.
+"""
+
+# Installed import packages
+from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
+from marshmallow import fields
+
+# Local imports - Waitlist table template
+from models.waitlist import WaitlistEntry
+
+
+class WaitlistSchema(SQLAlchemyAutoSchema):
+    """
+    The waitlist schema template. This organises the JSON response when 
+    fetching the players waiting for a place at an event, in the same 
+    shape as a registration so a promoted player's details carry over
+    """
+    class Meta:
+        model = WaitlistEntry
+        load_instance = True
+        include_fk = True
+
+        # Define the exact order of how the JSON query is displayed
+        # Event Info, Player Info, Deck Info, Waitlist Info
+        fields = (
+            "event_id",
+            "event",
+            "player_id",
+            "player", 
+            "registered_deck",
+            "joined_date",
+            "position"
+        )
+
+    # Only show the name of the event when showing event information 
+    # in the waitlist query
+    event = fields.Nested(
+        "EventSchema", 
+        only = [
+            "event_name",
+        ]
+    )
+
+    # Only show the name of the player when showing player 
+    # information in the waitlist query
+    player = fields.Nested(
+        "PlayerSchema", 
+        only = [
+            "player_name",
+        ]
+    )
+
+# Create instances of the schema for the controllers to call when 
+# applying validation, error handling and restrictions
+waitlist_entry_schema = WaitlistSchema()
+waitlist_schema = WaitlistSchema(many = True)
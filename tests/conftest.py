@@ -0,0 +1,143 @@
+"""
+This file holds the fixtures shared by the tests. Every test gets its
+own app against a fresh SQLite database in a temporary folder, filled
+with a small, known set of records:
+    - Cards 1-8: Yokomon, Agumon, Greymon, MetalGreymon, Gabumon,
+      Garurumon, Tai Kamiya and Gaia Force
+    - Players 1-8, organisers 1-2 and venues 1-2
+    - Decks 1-2, with decklists, owned by players 1 and 2 as
+      collections 1 and 2
+    - Event 1 (Completed), event 2 (Planned, a cap of 2 players) and
+      event 3 (Running, a cap of 32 players)
+
+Install the test requirements and run the tests from the project root:
+    pip install -r requirements-dev.txt
+    python -m pytest -q
+"""
+
+# Built-in imports
+import os
+import sys
+from datetime import date
+
+# Installed import packages
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Local imports
+from init import db
+from main import create_app
+from models.card import Card, CardRarity, CardType
+from models.collection import Collection
+from models.deck import Deck
+from models.decklist import Decklist
+from models.event import Event, EventStatus
+from models.organiser import Organiser
+from models.player import Player
+from models.venue import Venue
+
+
+CARDS = (
+    ("BT1-001", "Yokomon", CardType.Digiegg, CardRarity.Rare),
+    ("BT1-010", "Agumon", CardType.Digimon, CardRarity.Rare),
+    ("BT1-011", "Greymon", CardType.Digimon, CardRarity.Uncommon),
+    ("BT1-012", "MetalGreymon", CardType.Digimon, CardRarity.SuperRare),
+    ("BT1-020", "Gabumon", CardType.Digimon, CardRarity.Common),
+    ("BT1-021", "Garurumon", CardType.Digimon, CardRarity.Uncommon),
+    ("BT1-085", "Tai Kamiya", CardType.Tamer, CardRarity.Rare),
+    ("BT1-090", "Gaia Force", CardType.Option, CardRarity.Common),
+)
+
+
+def _seed():
+    """
+    Add the records every test starts with.
+    """
+    db.session.add_all(
+        Card(card_number = number, card_name = name, card_type = card_type, card_rarity = rarity)
+        for number, name, card_type, rarity in CARDS
+    )
+    db.session.add_all(Player(player_name = f"Player {number}") for number in range(1, 9))
+    db.session.add_all([
+        Organiser(organiser_name = "Bandai"),
+        Organiser(organiser_name = "Good Games"),
+        Venue(venue_name = "ICC Sydney"),
+        Venue(venue_name = "Good Games Town Hall"),
+        Deck(deck_name = "Red Hybrid"),
+        Deck(deck_name = "Blue Flare"),
+    ])
+    db.session.flush()
+
+    db.session.add_all([
+        Decklist(deck_id = 1, card_id = 2, card_quantity = 4),
+        Decklist(deck_id = 1, card_id = 3, card_quantity = 4),
+        Decklist(deck_id = 2, card_id = 5, card_quantity = 4),
+        Collection(player_id = 1, deck_id = 1),
+        Collection(player_id = 2, deck_id = 2),
+        Event(
+            organiser_id = 1,
+            venue_id = 1,
+            event_name = "BandaiFest 2025",
+            player_cap = 255,
+            event_date = date(2025, 10, 10),
+            event_status = EventStatus.Completed
+        ),
+        Event(
+            organiser_id = 1,
+            venue_id = 1,
+            event_name = "Digimon Sydney Regionals 2025",
+            player_cap = 2,
+            event_date = date(2025, 12, 10),
+            event_status = EventStatus.Planned
+        ),
+        Event(
+            organiser_id = 2,
+            venue_id = 2,
+            event_name = "Pax Games",
+            player_cap = 32,
+            event_date = date(2025, 10, 16),
+            event_status = EventStatus.Running
+        ),
+    ])
+    db.session.commit()
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """
+    An app against its own seeded SQLite database.
+    """
+    monkeypatch.setenv("DATABASE_URI", f"sqlite:///{tmp_path / 'digiscan.sqlite'}")
+    app = create_app()
+    app.config["TESTING"] = True
+
+    with app.app_context():
+        db.create_all()
+        _seed()
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def other_worker(app):
+    """
+    A second app against the same database, standing in for another
+    gunicorn worker with its own caches.
+    """
+    other = create_app()
+    other.config["TESTING"] = True
+    yield other.test_client()
+
+    with other.app_context():
+        db.session.remove()
+        db.engine.dispose()
@@ -0,0 +1,106 @@
+"""
+Tests for claiming and giving back the seats of an event without going
+over its player cap.
+"""
+
+# Local imports
+from init import db
+from models.event import Event
+from models.registration import Registration
+from utils.admission import claim_seat, release_seat
+
+
+def _register(client, player_id, event_id = 2):
+    return client.post("/registrations/", json = {"event_id": event_id, "player_id": player_id})
+
+
+def _registered(app, event_id = 2):
+    """
+    The players registered to the event and the event's count.
+    """
+    with app.app_context():
+        statement = (
+            db.select(Registration.player_id)
+            .where(Registration.event_id == event_id)
+            .order_by(Registration.player_id)
+        )
+        return list(db.session.scalars(statement)), db.session.get(Event, event_id).registration_count
+
+
+def test_players_are_registered_until_the_event_is_full(app, client):
+    # Event 2 has a cap of 2 players
+    assert _register(client, 1).status_code == 201
+    assert _register(client, 2).status_code == 201
+
+    response = _register(client, 3)
+
+    assert response.status_code == 202
+    assert _registered(app) == ([1, 2], 2)
+
+
+def test_registering_twice_does_not_take_a_second_seat(app, client):
+    _register(client, 1)
+
+    response = _register(client, 1)
+
+    assert response.status_code == 409
+    assert _registered(app) == ([1], 1)
+
+
+def test_unknown_events_have_no_seats(client):
+    assert _register(client, 1, event_id = 99).status_code == 404
+
+
+def test_deleting_a_registration_gives_the_seat_back(app, client):
+    _register(client, 1)
+    _register(client, 2)
+
+    response = client.delete("/registrations/2/1")
+
+    assert response.get_json()["promoted"] == []
+    assert _registered(app) == ([2], 1)
+    assert _register(client, 3).status_code == 201
+
+
+def test_deleting_a_player_gives_their_seats_to_the_waitlist(app, client):
+    for player_id in (1, 2, 3):
+        _register(client, player_id)
+        _register(client, player_id, event_id = 3)
+
+    response = client.delete("/players/1")
+
+    assert response.status_code == 200
+    assert _registered(app) == ([2, 3], 2)
+    assert _registered(app, event_id = 3) == ([2, 3], 2)
+    assert client.get("/registrations/waitlist/2/3").status_code == 404
+
+
+def test_seats_are_never_given_back_below_zero(app):
+    with app.app_context():
+        release_seat(2, seats = 5)
+
+        assert db.session.get(Event, 2).registration_count == 0
+
+
+def test_full_events_turn_claims_away(app):
+    with app.app_context():
+        assert claim_seat(2)
+        assert claim_seat(2)
+        assert not claim_seat(2)
+        assert not claim_seat(99)
+        db.session.rollback()
+
+        # The claims were part of the rolled back transaction
+        assert db.session.get(Event, 2).registration_count == 0
+
+
+def test_recount_sets_the_counts_from_the_registrations(app, client):
+    # Registrations loaded straight into the database skip the count
+    with app.app_context():
+        db.session.add_all(Registration(event_id = 3, player_id = player_id) for player_id in (1, 2))
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args = ["db", "recount-registrations"])
+
+    assert result.exit_code == 0
+    assert _registered(app, event_id = 3) == ([1, 2], 2)
@@ -0,0 +1,64 @@
+"""
+Tests for fetching a set of records by ID from the list routes with
+'?ids='.
+"""
+
+
+def test_records_come_back_in_the_order_asked_for(client):
+    response = client.get("/cards/?ids=5,2,8")
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [card["card_id"] for card in body["data"]] == [5, 2, 8]
+    assert body["missing"] == []
+
+
+def test_unknown_ids_are_listed_as_missing(client):
+    body = client.get("/cards/?ids=3,40,1,41").get_json()
+
+    assert [card["card_id"] for card in body["data"]] == [3, 1]
+    assert body["missing"] == [40, 41]
+
+
+def test_repeated_ids_are_only_returned_once(client):
+    body = client.get("/players/?ids=2,2,1,2").get_json()
+
+    assert [player["player_id"] for player in body["data"]] == [2, 1]
+
+
+def test_the_whole_set_is_read_in_one_query(client):
+    one = client.get("/cards/?ids=1")
+    many = client.get("/cards/?ids=1,2,3,4,5,6,7,8")
+
+    assert many.headers["X-Query-Count"] == one.headers["X-Query-Count"]
+
+
+def test_every_entity_route_takes_ids(client):
+    for resource, key in (
+        ("decks", "deck_id"),
+        ("events", "event_id"),
+        ("organisers", "organiser_id"),
+        ("venues", "venue_id")
+    ):
+        body = client.get(f"/{resource}/?ids=2,1").get_json()
+        assert [record[key] for record in body["data"]] == [2, 1], resource
+
+
+def test_lookups_by_different_ids_are_cached_apart(client):
+    client.get("/cards/?ids=1,2")
+
+    body = client.get("/cards/?ids=3").get_json()
+
+    assert [card["card_id"] for card in body["data"]] == [3]
+
+
+def test_ids_that_are_not_numbers_are_refused(client):
+    assert client.get("/cards/?ids=1,two").status_code == 400
+
+
+def test_too_many_ids_are_refused(app, client):
+    app.config["BATCH_IDS_MAX"] = 3
+
+    assert client.get("/cards/?ids=1,2,3").status_code == 200
+    assert client.get("/cards/?ids=1,2,3,4").status_code == 400
+    assert client.get("/cards/?ids=").status_code == 400
@@ -0,0 +1,164 @@
+"""
+Tests for submitting an event's rankings and registrations in bulk.
+"""
+
+# Local imports
+from init import db
+from models.event import Event
+from models.ranking import Ranking
+
+
+def _rankings(client, rankings, event_id = 3):
+    return client.post("/rankings/bulk", json = {"event_id": event_id, "rankings": rankings})
+
+
+def _registrations(client, registrations, event_id = 2):
+    return client.post("/registrations/bulk", json = {"event_id": event_id, "registrations": registrations})
+
+
+def test_rankings_are_added_and_updated_in_one_batch(client):
+    client.post("/rankings/", json = {"event_id": 3, "player_id": 1, "wins": 1})
+
+    response = _rankings(client, [
+        {"player_id": 1, "wins": 2},
+        {"player_id": 2, "wins": 1}
+    ])
+
+    assert response.status_code == 201
+    assert response.get_json() == {"added": 1, "updated": 1, "errors": {}}
+
+
+def test_fields_left_out_of_a_row_are_kept(app, client):
+    client.post("/rankings/", json = {"event_id": 3, "player_id": 1, "wins": 1, "points": 3})
+
+    _rankings(client, [{"player_id": 1, "losses": 1}])
+
+    with app.app_context():
+        ranking = db.session.get(Ranking, (1, 3))
+        assert (ranking.wins, ranking.losses, ranking.points) == (1, 1, 3)
+
+
+def test_invalid_rows_are_reported_by_position(client):
+    response = _rankings(client, [
+        {"player_id": 1, "wins": 1},
+        {"player_id": 2, "wins": "lots"},
+        {"player_id": 1, "wins": 3},
+        {"player_id": 3, "event_id": 1}
+    ])
+
+    report = response.get_json()
+    assert response.status_code == 201
+    assert report["added"] == 1
+    assert set(report["errors"]) == {"1", "2", "3"}
+    assert "wins" in report["errors"]["1"]
+    assert report["errors"]["2"] == {"player_id": ["Duplicate of row 0 in this batch."]}
+    assert report["errors"]["3"] == {"event_id": ["Must be 3, the event of this batch."]}
+
+
+def test_batch_with_no_valid_rows_is_refused(client):
+    response = _rankings(client, [{"player_id": 1, "wins": "lots"}])
+
+    assert response.status_code == 400
+    assert response.get_json()["added"] == 0
+
+
+def test_batches_need_an_event_and_a_list(client):
+    assert client.post("/rankings/bulk", json = [{"player_id": 1}]).status_code == 400
+    assert client.post("/registrations/bulk", json = {"event_id": 2}).status_code == 400
+
+
+def test_batches_for_unknown_events_are_not_found(client):
+    assert _rankings(client, [{"player_id": 1}], event_id = 99).status_code == 404
+    assert _registrations(client, [{"player_id": 1}], event_id = 99).status_code == 404
+
+
+def test_registrations_past_the_cap_join_the_waitlist_in_order(client):
+    # Event 2 has a cap of 2 players
+    response = _registrations(client, [{"player_id": player_id} for player_id in (4, 1, 3, 2)])
+
+    report = response.get_json()
+    assert response.status_code == 201
+    assert (report["registered"], report["waitlisted"], report["promoted"]) == (2, 2, [])
+    waitlist = client.get("/registrations/waitlist/2").get_json()
+    assert [(entry["position"], entry["player_id"]) for entry in waitlist] == [(1, 3), (2, 2)]
+
+
+def test_registered_players_have_their_deck_updated(client):
+    client.post("/registrations/", json = {"event_id": 2, "player_id": 1})
+
+    response = _registrations(client, [{"player_id": 1, "registered_deck": 1}])
+
+    assert response.get_json()["updated"] == 1
+    registration = client.get("/registrations/?event_id=2&player_id=1").get_json()[0]
+    assert registration["registered_deck"] == 1
+
+
+def test_the_waitlist_is_served_before_the_batch(app, client):
+    _registrations(client, [{"player_id": player_id} for player_id in (1, 2, 3)])
+
+    # A place opens up without going through a route that promotes
+    with app.app_context():
+        db.session.get(Event, 2).player_cap = 3
+        db.session.commit()
+
+    report = _registrations(client, [{"player_id": 4}]).get_json()
+
+    assert report["promoted"] == [3]
+    assert (report["registered"], report["waitlisted"]) == (0, 1)
+    waitlist = client.get("/registrations/waitlist/2").get_json()
+    assert [(entry["position"], entry["player_id"]) for entry in waitlist] == [(1, 4)]
+
+
+def test_invalid_registrations_are_reported_by_position(client):
+    response = _registrations(client, [
+        {"player_id": 1},
+        {"player_id": 1},
+        {"player_id": "first"}
+    ])
+
+    report = response.get_json()
+    assert report["registered"] == 1
+    assert set(report["errors"]) == {"1", "2"}
+
+
+def test_batches_keep_the_etags_of_other_events(client):
+    client.post("/rankings/", json = {"event_id": 1, "player_id": 1, "wins": 1})
+    client.post("/registrations/", json = {"event_id": 3, "player_id": 1})
+    rankings = client.get("/rankings/?event_id=1").headers["ETag"]
+    registrations = client.get("/registrations/?event_id=3").headers["ETag"]
+
+    _rankings(client, [{"player_id": 2, "wins": 1}])
+    _registrations(client, [{"player_id": 2}])
+
+    assert client.get("/rankings/?event_id=1", headers = {"If-None-Match": rankings}).status_code == 304
+    assert client.get("/registrations/?event_id=3", headers = {"If-None-Match": registrations}).status_code == 304
+    assert client.get("/rankings/?player_id=2").get_json()[0]["event_id"] == 3
+
+
+def test_rows_for_unknown_players_are_reported(client):
+    response = _rankings(client, [
+        {"player_id": 1, "wins": 1},
+        {"player_id": 99, "wins": 1}
+    ])
+
+    report = response.get_json()
+    assert response.status_code == 201
+    assert report["added"] == 1
+    assert report["errors"] == {"1": {"player_id": ["Player does not exist."]}}
+
+
+def test_registrations_for_unknown_players_and_decks_are_reported(client):
+    response = _registrations(client, [
+        {"player_id": 99},
+        {"player_id": 1, "registered_deck": 99},
+        {"player_id": 2, "registered_deck": 2}
+    ])
+
+    report = response.get_json()
+    assert report["registered"] == 1
+    assert report["errors"] == {
+        "0": {"player_id": ["Player does not exist."]},
+        "1": {"registered_deck": ["Collection does not exist."]}
+    }
+    registered = client.get("/registrations/?event_id=2").get_json()
+    assert [registration["player_id"] for registration in registered] == [2]
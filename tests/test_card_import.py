@@ -0,0 +1,75 @@
+"""
+Tests for the bulk card import endpoint and CLI command.
+"""
+
+# Built-in imports
+import json
+
+
+OMNIMON = {
+    "card_number": "BT1-099",
+    "card_name": "Omnimon",
+    "card_type": "Digimon",
+    "card_rarity": "SecretRare"
+}
+
+
+def test_json_batch_adds_and_updates_cards(client):
+    response = client.post("/cards/bulk", json = [
+        OMNIMON,
+        {**OMNIMON, "card_number": "BT1-010", "card_name": "Agumon Reprint"}
+    ])
+
+    assert response.status_code == 201
+    assert response.get_json() == {"added": 1, "updated": 1, "errors": {}}
+    assert client.get("/cards/2").get_json()["card_name"] == "Agumon Reprint"
+
+
+def test_csv_batch_is_imported(client):
+    body = (
+        "card_number,card_name,card_type,card_rarity\n"
+        "BT1-099,Omnimon,Digimon,SecretRare\n"
+        "BT1-098,WarGreymon,Digimon,SuperRare\n"
+    )
+
+    response = client.post("/cards/bulk", data = body, content_type = "text/csv")
+
+    assert response.status_code == 201
+    assert response.get_json()["added"] == 2
+
+
+def test_invalid_rows_are_reported_by_position(client):
+    response = client.post("/cards/bulk", json = [
+        OMNIMON,
+        {**OMNIMON, "card_number": "BT1-098", "card_rarity": "Mythic"},
+        {**OMNIMON, "card_name": "Omnimon Again"}
+    ])
+
+    report = response.get_json()
+    assert response.status_code == 201
+    assert report["added"] == 1
+    assert set(report["errors"]) == {"1", "2"}
+    assert "card_rarity" in report["errors"]["1"]
+
+
+def test_batch_with_no_valid_rows_is_refused(client):
+    response = client.post("/cards/bulk", json = [{"card_name": "No Number"}])
+
+    assert response.status_code == 400
+    assert response.get_json()["added"] == 0
+
+
+def test_unreadable_body_is_refused(client):
+    response = client.post("/cards/bulk", data = "{not json", content_type = "application/json")
+
+    assert response.status_code == 400
+
+
+def test_cli_imports_a_file(app, tmp_path):
+    card_file = tmp_path / "cards.json"
+    card_file.write_text(json.dumps([OMNIMON]), encoding = "utf-8")
+
+    result = app.test_cli_runner().invoke(args = ["db", "import-cards", str(card_file)])
+
+    assert result.exit_code == 0
+    assert "Cards added: 1, updated: 0." in result.output
@@ -0,0 +1,131 @@
+"""
+Tests for the card search at '/cards/search' and the in-memory index
+behind it.
+"""
+
+# Installed import packages
+import pytest
+
+# Local imports
+from init import db
+from models.card import Card, CardRarity, CardType
+
+
+def _search(client, query, **filters):
+    response = client.get("/cards/search", query_string = {"q": query, **filters})
+    results = response.get_json()
+
+    # No matches are answered with a message, as an empty table is
+    if isinstance(results, dict):
+        return []
+    return [card["card_name"] for card in results]
+
+
+@pytest.fixture
+def rebuilds(app, monkeypatch):
+    """
+    The number of times the index was read from the database in full.
+    """
+    index = app.extensions["card_search"]
+    calls = []
+    rebuild = index.rebuild
+
+    def spy():
+        calls.append(True)
+        rebuild()
+
+    monkeypatch.setattr(index, "rebuild", spy)
+    return calls
+
+
+def test_exact_names_come_before_names_containing_the_query(client):
+    assert _search(client, "greymon") == ["Greymon", "MetalGreymon"]
+
+
+def test_names_starting_with_the_query_are_found(client):
+    assert _search(client, "Gar") == ["Garurumon"]
+
+
+def test_card_numbers_are_found_by_their_start(client):
+    assert _search(client, "BT1-01") == ["Agumon", "Greymon", "MetalGreymon"]
+
+
+def test_misspelt_names_are_found(client):
+    assert _search(client, "Greymn")[0] == "Greymon"
+
+
+def test_results_can_be_limited_to_a_type_and_rarity(client):
+    assert _search(client, "mon", card_type = "Digimon", card_rarity = "Uncommon") == ["Greymon", "Garurumon"]
+
+
+def test_unknown_filters_are_refused(client):
+    response = client.get("/cards/search?q=mon&card_type=Pokemon")
+
+    assert response.status_code == 400
+
+
+def test_a_query_is_required(client):
+    assert client.get("/cards/search?q=").status_code == 400
+
+
+def test_no_matching_cards_is_answered_with_a_message(client):
+    response = client.get("/cards/search?q=zzzz")
+
+    assert response.get_json() == {"message": "No cards found matching 'zzzz'."}
+
+
+def test_cards_written_here_are_searchable_without_a_rebuild(client, rebuilds):
+    _search(client, "agumon")
+
+    client.post("/cards/", json = {
+        "card_number": "BT1-099",
+        "card_name": "WarGreymon",
+        "card_type": "Digimon",
+        "card_rarity": "SecretRare"
+    })
+    client.patch("/cards/2", json = {"card_name": "Koromon"})
+    client.delete("/cards/3")
+
+    assert _search(client, "wargrey") == ["WarGreymon"]
+    assert _search(client, "koromon") == ["Koromon"]
+    assert _search(client, "agumon") == []
+    assert _search(client, "greymon") == ["MetalGreymon", "WarGreymon"]
+    assert len(rebuilds) == 1
+
+
+def test_cards_written_by_another_worker_are_searchable(client, other_worker):
+    _search(client, "agumon")
+
+    other_worker.patch("/cards/2", json = {"card_name": "Koromon"})
+
+    assert _search(client, "koromon") == ["Koromon"]
+
+
+def test_imported_cards_are_searchable(client):
+    _search(client, "agumon")
+
+    client.post("/cards/bulk", json = [{
+        "card_number": "BT1-099",
+        "card_name": "Omnimon",
+        "card_type": "Digimon",
+        "card_rarity": "SecretRare"
+    }])
+
+    assert _search(client, "omni") == ["Omnimon"]
+
+
+def test_rolled_back_writes_leave_the_index_alone(app, client, rebuilds):
+    _search(client, "agumon")
+
+    with app.app_context():
+        db.session.add(Card(
+            card_number = "BT1-099",
+            card_name = "Ghostmon",
+            card_type = CardType.Digimon,
+            card_rarity = CardRarity.Common
+        ))
+        db.session.flush()
+        db.session.rollback()
+
+    assert _search(client, "ghostmon") == []
+    assert len(rebuilds) == 1
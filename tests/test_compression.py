@@ -0,0 +1,100 @@
+"""
+Tests for compressing the responses the client accepts a compressed
+copy of.
+"""
+
+# Built-in imports
+import gzip
+import json
+
+# Installed import packages
+import pytest
+
+# Local imports
+import utils.compression
+
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+@pytest.fixture
+def small_threshold(app):
+    """
+    Compress anything over 100 bytes, so a page of the seeded cards is
+    worth compressing.
+    """
+    app.config["COMPRESSION_MIN_SIZE"] = 100
+
+
+def test_responses_over_the_threshold_are_gzipped(client, small_threshold):
+    plain = client.get("/cards/?limit=100", headers = {"Accept-Encoding": "identity"})
+
+    response = client.get("/cards/?limit=100", headers = GZIP)
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert len(response.get_data()) < len(plain.get_data())
+    assert gzip.decompress(response.get_data()) == plain.get_data()
+
+
+def test_responses_under_the_threshold_are_sent_as_they_are(client):
+    response = client.get("/cards/2", headers = GZIP)
+
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.get_json()["card_name"] == "Agumon"
+
+
+def test_clients_that_do_not_accept_gzip_get_plain_responses(client, small_threshold):
+    response = client.get("/cards/?limit=100")
+
+    assert "Content-Encoding" not in response.headers
+
+
+def test_compression_can_be_switched_off(app, client, small_threshold):
+    app.config["COMPRESSION_ENABLED"] = False
+
+    response = client.get("/cards/?limit=100", headers = GZIP)
+
+    assert "Content-Encoding" not in response.headers
+
+
+def test_error_responses_are_not_compressed(client, small_threshold):
+    response = client.get("/cards/99", headers = GZIP)
+
+    assert response.status_code == 404
+    assert "Content-Encoding" not in response.headers
+
+
+def test_streams_are_compressed_as_they_are_sent(client):
+    response = client.get("/cards/", headers = {**GZIP, "Accept": "application/x-ndjson"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(response.get_data()).decode().splitlines()
+    assert [json.loads(line)["card_id"] for line in lines] == list(range(1, 9))
+
+
+def test_cache_hits_send_the_same_compressed_body(client, small_threshold):
+    first = client.get("/cards/?limit=100", headers = GZIP)
+
+    second = client.get("/cards/?limit=100", headers = GZIP)
+
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_data() == first.get_data()
+
+
+def test_brotli_is_preferred_when_installed(client, small_threshold):
+    brotli = pytest.importorskip("brotli")
+
+    response = client.get("/cards/?limit=100", headers = {"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert json.loads(brotli.decompress(response.get_data()))
+
+
+def test_gzip_is_used_without_brotli(client, small_threshold, monkeypatch):
+    monkeypatch.setattr(utils.compression, "brotli", None)
+
+    response = client.get("/cards/?limit=100", headers = {"Accept-Encoding": "br, gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
@@ -0,0 +1,66 @@
+"""
+Tests for the ETags and 'If-None-Match' handling of the read routes.
+"""
+
+# Built-in imports
+import time
+
+
+def test_matching_etag_is_answered_with_not_modified(client):
+    etag = client.get("/cards/2").headers["ETag"]
+
+    response = client.get("/cards/2", headers = {"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.get_data() == b""
+
+
+def test_a_write_changes_the_etag(client):
+    etag = client.get("/cards/2").headers["ETag"]
+
+    client.patch("/cards/2", json = {"card_name": "Koromon"})
+
+    response = client.get("/cards/2", headers = {"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_every_worker_hands_out_the_same_etag(client, other_worker):
+    etag = client.get("/cards/2").headers["ETag"]
+
+    assert other_worker.get("/cards/2").headers["ETag"] == etag
+    assert other_worker.get("/cards/2", headers = {"If-None-Match": etag}).status_code == 304
+
+
+def test_a_write_from_another_worker_changes_the_etag(client, other_worker):
+    etag = client.get("/cards/2").headers["ETag"]
+
+    other_worker.patch("/cards/2", json = {"card_name": "Koromon"})
+
+    assert client.get("/cards/2", headers = {"If-None-Match": etag}).status_code == 200
+
+
+def test_etag_outlives_the_cache_time_to_live(app, client, monkeypatch):
+    etag = client.get("/cards/2").headers["ETag"]
+
+    # A day later, long after the cached response has expired
+    started = time.time()
+    monkeypatch.setattr(time, "time", lambda: started + 86400)
+    app.extensions["response_cache"].clear()
+
+    assert client.get("/cards/2", headers = {"If-None-Match": etag}).status_code == 304
+
+
+def test_etag_depends_on_the_encoding(client):
+    plain = client.get("/cards/?limit=100", headers = {"Accept-Encoding": "identity"})
+    gzipped = client.get("/cards/?limit=100", headers = {"Accept-Encoding": "gzip"})
+
+    assert plain.headers["ETag"] != gzipped.headers["ETag"]
+
+
+def test_unrelated_writes_keep_the_etag(client):
+    etag = client.get("/cards/2").headers["ETag"]
+
+    client.patch("/cards/3", json = {"card_name": "Tyrannomon"})
+
+    assert client.get("/cards/2", headers = {"If-None-Match": etag}).status_code == 304
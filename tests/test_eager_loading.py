@@ -0,0 +1,41 @@
+"""
+Tests that the list routes load the nested records they display up
+front, rather than with a lazy SELECT for every row.
+"""
+
+
+def _query_count(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return int(response.headers["X-Query-Count"])
+
+
+def test_rankings_run_the_same_queries_for_any_number_of_rows(client):
+    for player_id in (1, 2):
+        client.post("/rankings/", json = {"event_id": 3, "player_id": player_id})
+    for player_id in range(1, 9):
+        client.post("/rankings/", json = {"event_id": 1, "player_id": player_id})
+
+    assert _query_count(client, "/rankings/?event_id=3") == _query_count(client, "/rankings/?event_id=1")
+
+
+def test_events_run_the_same_queries_for_any_number_of_rows(client):
+    one_page = _query_count(client, "/events/?limit=1")
+    for number in range(5):
+        client.post("/events/", json = {
+            "organiser_id": 2,
+            "venue_id": 2,
+            "event_name": f"Store Championship {number}",
+            "event_status": "Planned"
+        })
+
+    assert _query_count(client, "/events/?limit=8") == one_page
+
+
+def test_nested_records_are_still_displayed(client):
+    client.post("/rankings/", json = {"event_id": 3, "player_id": 1})
+
+    ranking = client.get("/rankings/?event_id=3").get_json()[0]
+
+    assert ranking["player"] == {"player_name": "Player 1"}
+    assert ranking["event"] == {"event_name": "Pax Games"}
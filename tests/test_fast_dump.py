@@ -0,0 +1,110 @@
+"""
+Tests for the compiled serialisers, which must display records exactly
+as marshmallow's schema.dump() does.
+"""
+
+# Installed import packages
+import pytest
+from marshmallow import Schema, fields, post_dump
+
+# Local imports
+from init import db
+from models.card import Card
+from models.event import Event
+from schemas.card_schema import card_schema, cards_schema
+from schemas.event_schema import events_schema
+from utils.fast_dump import compiled_serialiser, fast_dump
+
+
+ROUTES = (
+    "/cards/",
+    "/decks/",
+    "/decklists/",
+    "/collections/",
+    "/players/",
+    "/events/",
+    "/events/?include=venue",
+    "/organisers/",
+    "/venues/",
+    "/registrations/",
+    "/rankings/",
+    "/events/3/standings",
+    "/players/ratings",
+)
+
+
+@pytest.fixture
+def results(client):
+    """
+    Registrations, rankings and ratings for the routes to display.
+    """
+    for player_id in (1, 2):
+        client.post("/registrations/", json = {
+            "event_id": 3,
+            "player_id": player_id,
+            "registered_deck": player_id
+        })
+        client.post("/rankings/", json = {"event_id": 3, "player_id": player_id, "wins": player_id})
+    client.patch("/events/3", json = {"event_status": "Completed"})
+
+
+@pytest.mark.parametrize("route", ROUTES)
+def test_routes_display_the_same_with_and_without_compiling(app, client, results, route):
+    fast = client.get(route)
+    app.config["FAST_SERIALISERS"] = False
+    app.extensions["response_cache"].clear()
+
+    slow = client.get(route)
+
+    assert fast.status_code == 200
+    assert fast.get_json() == slow.get_json()
+
+
+def test_records_with_nested_records_match_dump(app):
+    with app.app_context():
+        events = db.session.scalars(db.select(Event)).all()
+
+        assert fast_dump(events_schema, events) == events_schema.dump(events)
+
+
+def test_expired_records_are_loaded_as_dump_would(app):
+    with app.app_context():
+        card = db.session.get(Card, 2)
+        db.session.commit()
+
+        assert "card_name" not in card.__dict__
+        displayed = fast_dump(card_schema, card)
+
+        assert displayed["card_name"] == "Agumon"
+        assert displayed == card_schema.dump(card)
+
+
+def test_empty_values_stay_empty(app):
+    with app.app_context():
+        assert fast_dump(cards_schema, []) == []
+        assert fast_dump(card_schema, None) == card_schema.dump(None)
+
+
+def test_schemas_with_hooks_are_left_to_marshmallow(app):
+    class ShoutingSchema(Schema):
+        card_name = fields.String()
+
+        @post_dump
+        def shout(self, data, **kwargs):
+            return {"card_name": data["card_name"].upper()}
+
+    schema = ShoutingSchema()
+
+    with app.app_context():
+        card = db.session.get(Card, 2)
+
+        assert compiled_serialiser(schema, Card) is None
+        assert fast_dump(schema, card) == {"card_name": "AGUMON"}
+
+
+def test_dictionaries_are_left_to_marshmallow(app):
+    with app.app_context():
+        record = {"card_id": 1, "card_name": "Yokomon"}
+
+        assert compiled_serialiser(card_schema, dict) is None
+        assert fast_dump(card_schema, record) == card_schema.dump(record)
@@ -0,0 +1,73 @@
+"""
+Tests for the end to end HTTP benchmark harness.
+"""
+
+# Built-in imports
+import json
+
+# Local imports
+from benchmarks.http_benchmark import _percentile, compare_reports, main
+
+
+def _report(p95_ms, throughput_rps = 100.0):
+    return {"routes": {"GET /cards/": {"p95_ms": p95_ms, "throughput_rps": throughput_rps}}}
+
+
+def test_percentile_uses_the_nearest_rank():
+    values = list(range(1, 101))
+
+    assert _percentile(values, 50) == 50
+    assert _percentile(values, 95) == 95
+    assert _percentile(values, 99) == 99
+    assert _percentile([], 50) is None
+
+
+def test_slowdowns_past_the_threshold_are_regressions():
+    assert compare_reports(_report(10.0), _report(12.0), threshold = 10.0) == ["GET /cards/"]
+
+
+def test_slowdowns_within_the_threshold_are_not_regressions():
+    assert compare_reports(_report(10.0), _report(10.5), threshold = 10.0) == []
+
+
+def test_routes_missing_from_the_baseline_are_skipped():
+    baseline = {"routes": {}}
+
+    assert compare_reports(baseline, _report(12.0), threshold = 10.0) == []
+
+
+def test_benchmark_runs_every_route_and_writes_a_report(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URI", "")
+    output = tmp_path / "report.json"
+
+    status = main([
+        "--database-uri", f"sqlite:///{tmp_path / 'benchmark.sqlite'}",
+        "--cards", "30", "--decks", "10", "--players", "30",
+        "--organisers", "2", "--venues", "2", "--events", "4",
+        "--requests", "4", "--threads", "1",
+        "--output", str(output)
+    ])
+
+    report = json.loads(output.read_text(encoding = "utf-8"))
+    assert status == 0
+    assert report["routes"]
+    for name, result in report["routes"].items():
+        assert result["errors"] == 0, name
+        assert result["p95_ms"] is not None
+
+
+def test_benchmark_fails_on_a_regression(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URI", "")
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"routes": {"GET /cards/": {"p95_ms": 0.0001, "throughput_rps": 1e9}}}))
+
+    status = main([
+        "--database-uri", f"sqlite:///{tmp_path / 'benchmark.sqlite'}",
+        "--cards", "30", "--decks", "10", "--players", "30",
+        "--organisers", "2", "--venues", "2", "--events", "4",
+        "--requests", "4", "--threads", "1", "--routes", "GET /cards/",
+        "--output", str(tmp_path / "report.json"),
+        "--compare", str(baseline)
+    ])
+
+    assert status == 1
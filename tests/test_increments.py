@@ -0,0 +1,117 @@
+"""
+Tests for moving a ranking's counts on with signed numbers, such as
+{"wins": "+1"}, without letting them go below zero.
+"""
+
+# Installed import packages
+import pytest
+from marshmallow import ValidationError
+
+# Local imports
+from models.ranking import Ranking
+from utils.increments import increment_values
+
+
+COLUMNS = ("points", "wins", "losses", "ties")
+
+
+@pytest.fixture
+def ranking(client):
+    """
+    Player 1 at event 3, one win from one match.
+    """
+    client.post("/rankings/", json = {"event_id": 3, "player_id": 1, "points": 3, "wins": 1, "losses": 0})
+    return "/rankings/3/1"
+
+
+def test_signed_numbers_move_the_counts_on(client, ranking):
+    response = client.patch(ranking, json = {"wins": "+1", "points": "+3", "losses": "+0"})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body["wins"], body["points"], body["losses"]) == (2, 6, 0)
+
+
+def test_plain_numbers_set_the_counts(client, ranking):
+    body = client.patch(ranking, json = {"wins": 5, "points": "-3"}).get_json()
+
+    assert (body["wins"], body["points"]) == (5, 0)
+
+
+def test_counts_that_were_never_set_start_from_zero(client, ranking):
+    assert client.patch(ranking, json = {"ties": "+1"}).get_json()["ties"] == 1
+
+
+def test_taking_a_count_below_zero_is_refused(client, ranking):
+    response = client.patch(ranking, json = {"wins": "+1", "losses": "-9"})
+
+    assert response.status_code == 409
+    body = client.get("/rankings/?event_id=3&player_id=1").get_json()[0]
+    assert (body["wins"], body["losses"]) == (1, 0)
+
+
+def test_negative_numbers_are_refused(client, ranking):
+    response = client.patch(ranking, json = {"wins": -1})
+
+    # The repo reports bodies that fail validation as a 404
+    assert response.status_code == 404
+    assert "wins" in response.get_json()
+
+
+def test_fields_that_are_not_results_are_refused(client, ranking):
+    response = client.patch(ranking, json = {"player_id": 2, "wins": "+1"})
+
+    assert "player_id" in response.get_json()
+    assert client.get("/rankings/?event_id=3&player_id=1").get_json()[0]["wins"] == 1
+
+
+def test_missing_rankings_are_not_found(client):
+    response = client.patch("/rankings/3/4", json = {"wins": "+1"})
+
+    assert response.status_code == 404
+    assert "does not have a ranking" in response.get_json()["message"]
+
+
+def test_the_standings_follow_the_new_counts(client, ranking):
+    client.post("/rankings/", json = {"event_id": 3, "player_id": 2, "points": 3, "wins": 1})
+
+    client.patch("/rankings/3/2", json = {"wins": "+1", "points": "+3"})
+
+    standings = client.get("/events/3/standings").get_json()
+    assert [(standing["player_id"], standing["points"]) for standing in standings] == [(2, 6), (1, 3)]
+
+
+@pytest.mark.parametrize("value", ("1", "+", "++1", "+1.5", True, 1.5, [1]))
+def test_values_that_are_not_whole_numbers_are_refused(value):
+    with pytest.raises(ValidationError) as error:
+        increment_values(Ranking, {"wins": value}, COLUMNS)
+
+    assert "wins" in error.value.messages
+
+
+def test_an_empty_body_is_refused():
+    with pytest.raises(ValidationError):
+        increment_values(Ranking, {}, COLUMNS)
+
+
+def test_only_taking_away_adds_a_condition():
+    values, conditions = increment_values(Ranking, {"wins": "+1", "losses": "-1", "ties": 0}, COLUMNS)
+
+    assert set(values) == {"wins", "losses", "ties"}
+    assert len(conditions) == 1
+
+
+def test_an_increment_keeps_the_etags_of_other_events(client, ranking):
+    client.post("/events/", json = {
+        "organiser_id": 1, "venue_id": 1, "event_name": "Pax Games 2026",
+        "player_cap": 32, "event_date": "2026-10-16", "event_status": "Running"
+    })
+    client.post("/rankings/", json = {"event_id": 4, "player_id": 2, "wins": 1})
+    etag = client.get("/rankings/?event_id=4").headers["ETag"]
+    own_etag = client.get("/rankings/?event_id=3").headers["ETag"]
+
+    client.patch(ranking, json = {"wins": "+1"})
+
+    assert client.get("/rankings/?event_id=3").headers["ETag"] != own_etag
+    response = client.get("/rankings/?event_id=4", headers = {"If-None-Match": etag})
+    assert response.status_code == 304
@@ -0,0 +1,92 @@
+"""
+Tests for the JSON providers chosen with JSON_BACKEND.
+"""
+
+# Built-in imports
+import json
+from datetime import date
+
+# Installed import packages
+import pytest
+from flask import Flask
+
+# Local imports
+import utils.json_provider
+from models.event import EventStatus
+from utils.json_provider import OrjsonJSONProvider, StdlibJSONProvider, init_json_provider
+
+
+PAYLOAD = {
+    "zeta": 1,
+    "event_date": date(2025, 10, 10),
+    "event_status": EventStatus.Completed,
+    "errors": {3: "Invalid row."},
+    "alpha": [1.5, None, "Agumon"]
+}
+
+
+def _app(backend):
+    app = Flask(__name__)
+    app.config["JSON_BACKEND"] = backend
+    init_json_provider(app)
+    return app
+
+
+@pytest.mark.parametrize("backend", ("stdlib", "orjson"))
+def test_dates_and_enums_are_written_the_same_way(backend):
+    app = _app(backend)
+
+    decoded = json.loads(app.json.dumps(PAYLOAD))
+
+    assert decoded["event_date"] == "2025-10-10"
+    assert decoded["event_status"] == EventStatus.Completed.value
+    assert decoded["errors"] == {"3": "Invalid row."}
+
+
+@pytest.mark.parametrize("backend", ("stdlib", "orjson"))
+def test_key_order_is_kept(backend):
+    app = _app(backend)
+
+    assert list(json.loads(app.json.dumps(PAYLOAD))) == list(PAYLOAD)
+
+
+def test_both_backends_send_the_same_response():
+    bodies = []
+    for backend in ("stdlib", "orjson"):
+        app = _app(backend)
+        with app.app_context():
+            bodies.append(json.loads(app.json.response(PAYLOAD).get_data()))
+
+    assert bodies[0] == bodies[1]
+
+
+def test_auto_picks_orjson_when_installed():
+    assert isinstance(_app("auto").json, OrjsonJSONProvider)
+
+
+def test_auto_falls_back_without_orjson(monkeypatch):
+    monkeypatch.setattr(utils.json_provider, "orjson", None)
+
+    assert isinstance(_app("auto").json, StdlibJSONProvider)
+
+
+def test_requiring_a_missing_orjson_fails_at_startup(monkeypatch):
+    monkeypatch.setattr(utils.json_provider, "orjson", None)
+
+    with pytest.raises(RuntimeError):
+        _app("orjson")
+
+
+def test_unknown_backend_fails_at_startup():
+    with pytest.raises(ValueError):
+        _app("ujson")
+
+
+def test_requests_are_read_and_answered_with_orjson(app, client):
+    assert app.config["JSON_BACKEND"] == "auto"
+
+    response = client.post("/players/", json = {"player_name": "Player 9"})
+
+    assert response.status_code == 201
+    assert response.get_json()["player_name"] == "Player 9"
+    assert client.get("/events/?event_id=1").get_json()[0]["event_date"] == "2025-10-10"
@@ -0,0 +1,120 @@
+"""
+Tests for the metagame report at '/meta/' and the card usage report at
+'/cards/<card_id>/usage'.
+"""
+
+# Installed import packages
+import pytest
+
+# Local imports
+import utils.metagame
+
+
+SINCE = "?since=2025-01-01"
+
+
+@pytest.fixture
+def played_event(client):
+    """
+    Event 1 (completed) played by player 1 on deck 1 (Agumon and
+    Greymon), who won both matches, and player 2 on deck 2 (Gabumon),
+    who lost both.
+    """
+    for player_id, wins, losses in ((1, 2, 0), (2, 0, 2)):
+        client.post("/registrations/", json = {
+            "event_id": 1,
+            "player_id": player_id,
+            "registered_deck": player_id
+        })
+        client.post("/rankings/", json = {
+            "event_id": 1,
+            "player_id": player_id,
+            "points": 3 * wins,
+            "wins": wins,
+            "losses": losses
+        })
+    return 1
+
+
+@pytest.fixture
+def read_events(monkeypatch):
+    """
+    The event IDs each report had to query, rather than take from the
+    per event cache.
+    """
+    calls = []
+    read = utils.metagame._read_event_totals
+
+    def spy(event_ids):
+        calls.append(sorted(event_ids))
+        return read(event_ids)
+
+    monkeypatch.setattr(utils.metagame, "_read_event_totals", spy)
+    return calls
+
+
+def test_report_lists_the_most_played_cards(client, played_event):
+    report = client.get(f"/meta/{SINCE}").get_json()
+
+    assert report["events"] == 1
+    assert report["decks"] == 2
+    cards = {card["card_id"]: card for card in report["cards"]}
+    assert [card["card_id"] for card in report["cards"]] == [2, 3, 5]
+    assert cards[2]["share"] == 0.5
+    assert cards[2]["average_copies"] == 4
+    assert cards[2]["win_rate"] == 1.0
+    assert cards[5]["win_rate"] == 0.0
+    assert cards[2]["weighted_copies"] == pytest.approx(4)
+    assert cards[5]["weighted_copies"] == 0
+
+
+def test_events_before_the_window_are_left_out(client, played_event):
+    report = client.get("/meta/?since=2025-11-01").get_json()
+
+    assert report["events"] == 0
+    assert report["cards"] == []
+
+
+def test_invalid_since_date_is_refused(client):
+    assert client.get("/meta/?since=last-week").status_code == 400
+
+
+def test_card_usage_counts_decklists_and_events(client, played_event):
+    usage = client.get(f"/cards/2/usage{SINCE}").get_json()["card"]
+
+    assert usage["decklists"] == 1
+    assert usage["decklist_copies"] == 4
+    assert usage["entries"] == 1
+    assert usage["wins"] == 2
+
+
+def test_unplayed_card_has_no_win_rate(client, played_event):
+    usage = client.get(f"/cards/8/usage{SINCE}").get_json()["card"]
+
+    assert usage["entries"] == 0
+    assert usage["win_rate"] is None
+
+
+def test_unknown_card_has_no_usage(client):
+    assert client.get("/cards/99/usage").status_code == 404
+
+
+def test_unchanged_events_are_taken_from_the_cache(client, played_event, read_events):
+    client.get(f"/meta/{SINCE}")
+    client.patch("/events/3", json = {"event_status": "Completed"})
+
+    report = client.get(f"/meta/{SINCE}").get_json()
+
+    assert read_events == [[1], [3]]
+    assert report["events"] == 2
+
+
+def test_changed_results_are_read_again(client, played_event, read_events):
+    client.get(f"/meta/{SINCE}")
+    client.patch("/rankings/1/2", json = {"wins": 2, "losses": 0})
+
+    report = client.get(f"/meta/{SINCE}").get_json()
+
+    assert read_events == [[1], [1]]
+    cards = {card["card_id"]: card for card in report["cards"]}
+    assert cards[5]["win_rate"] == 1.0
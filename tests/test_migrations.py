@@ -0,0 +1,113 @@
+"""
+Tests for 'flask db upgrade', which adds the tables, columns and
+indexes an existing database is missing.
+"""
+
+# Installed import packages
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, inspect, text
+from sqlalchemy.dialects import sqlite
+
+# Local imports
+from init import db
+from models.event import Event
+from models.rating_history import RatingHistory
+from models.registration import Registration
+from models.waitlist import WaitlistEntry
+from utils.migrations import MigrationError, _add_column_sql
+
+
+def _upgrade(app):
+    result = app.test_cli_runner().invoke(args = ["db", "upgrade"])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def _execute(app, *statements):
+    """
+    Run raw SQL against the database, standing in for a database made
+    by an older version of the app.
+    """
+    with app.app_context():
+        with db.engine.begin() as connection:
+            for statement in statements:
+                connection.execute(text(statement))
+
+
+def _inspect(app):
+    with app.app_context():
+        return inspect(db.engine)
+
+
+def test_up_to_date_database_is_left_alone(app):
+    assert _upgrade(app) == "Database is up to date.\n"
+    assert _upgrade(app) == "Database is up to date.\n"
+
+
+def test_missing_tables_are_created_once(app):
+    _execute(app, "DROP TABLE standings")
+
+    assert "Table created: standings" in _upgrade(app)
+    assert "standings" in _inspect(app).get_table_names()
+    assert _upgrade(app) == "Database is up to date.\n"
+
+
+def test_missing_indexes_are_created_once(app):
+    _execute(app, "DROP INDEX event_calendar")
+
+    assert "Index created: event_calendar on events" in _upgrade(app)
+    assert "event_calendar" in {index["name"] for index in _inspect(app).get_indexes("events")}
+    assert _upgrade(app) == "Database is up to date.\n"
+
+
+def test_missing_columns_are_added_and_filled_in(app):
+    with app.app_context():
+        db.session.add_all(Registration(event_id = 3, player_id = player_id) for player_id in (1, 2, 3))
+        db.session.commit()
+    _execute(app, "ALTER TABLE events DROP COLUMN registration_count")
+
+    output = _upgrade(app)
+
+    assert "Column added: events.registration_count" in output
+    assert "Registration counts updated." in output
+    with app.app_context():
+        assert db.session.get(Event, 3).registration_count == 3
+        assert db.session.get(Event, 2).registration_count == 0
+    assert _upgrade(app) == "Database is up to date.\n"
+
+
+def test_existing_waitlists_are_numbered_when_positions_are_added(app, client):
+    for player_id in range(1, 6):
+        client.post("/registrations/", json = {"event_id": 2, "player_id": player_id})
+    _execute(app, "ALTER TABLE waitlist DROP COLUMN position")
+
+    output = _upgrade(app)
+
+    assert "Waitlist positions updated." in output
+    with app.app_context():
+        statement = db.select(WaitlistEntry.player_id, WaitlistEntry.position).order_by(WaitlistEntry.position)
+        assert db.session.execute(statement).all() == [(3, 1), (4, 2), (5, 3)]
+    assert _upgrade(app) == "Database is up to date.\n"
+
+
+def test_columns_that_cannot_be_filled_in_are_refused():
+    table = Table("things", MetaData(), Column("thing_id", Integer, primary_key = True))
+    column = Column("name", String, nullable = False)
+    table.append_column(column)
+
+    with pytest.raises(MigrationError):
+        _add_column_sql(table, column, sqlite.dialect())
+
+
+def test_ratings_are_rebuilt_when_the_history_is_added(app, client):
+    for player_id, wins in ((1, 1), (2, 0)):
+        client.post("/rankings/", json = {"event_id": 3, "player_id": player_id, "wins": wins, "losses": 1 - wins})
+    client.patch("/events/3", json = {"event_status": "Completed"})
+    _execute(app, "DROP TABLE rating_history")
+
+    output = _upgrade(app)
+
+    assert "Table created: rating_history" in output
+    assert "Ratings rebuilt for 2 players." in output
+    with app.app_context():
+        assert db.session.scalar(db.select(db.func.count()).select_from(RatingHistory)) == 2
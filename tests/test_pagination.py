@@ -0,0 +1,81 @@
+"""
+Tests for the keyset pagination of the list routes.
+"""
+
+
+def _follow(client, url):
+    """
+    Request every page of a list route by following its cursors.
+    Returns the pages.
+    """
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        pages.append(response.get_json())
+        cursor = response.headers.get("X-Next-Cursor")
+        url = f"{url.split('&cursor=')[0]}&cursor={cursor}" if cursor else None
+    return pages
+
+
+def test_pages_cover_every_card_once_in_order(client):
+    pages = _follow(client, "/cards/?limit=3")
+
+    assert [len(page) for page in pages] == [3, 3, 2]
+    card_ids = [card["card_id"] for page in pages for card in page]
+    assert card_ids == list(range(1, 9))
+
+
+def test_last_page_has_no_cursor(client):
+    response = client.get("/cards/?limit=8")
+
+    assert len(response.get_json()) == 8
+    assert "X-Next-Cursor" not in response.headers
+    assert "Link" not in response.headers
+
+
+def test_link_header_points_at_the_next_page(client):
+    response = client.get("/cards/?limit=5")
+
+    cursor = response.headers["X-Next-Cursor"]
+    assert f"cursor={cursor}" in response.headers["Link"]
+    assert 'rel="next"' in response.headers["Link"]
+
+
+def test_rows_added_behind_the_cursor_are_not_repeated(client):
+    first = client.get("/cards/?limit=4")
+    client.post("/cards/", json = {
+        "card_number": "BT1-099",
+        "card_name": "Omnimon",
+        "card_type": "Digimon",
+        "card_rarity": "SecretRare"
+    })
+
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/cards/?limit=4&cursor={cursor}").get_json()
+    assert [card["card_id"] for card in second] == [5, 6, 7, 8]
+
+
+def test_composite_keys_page_through_rankings(client):
+    for player_id in range(1, 6):
+        client.post("/rankings/", json = {"event_id": 3, "player_id": player_id, "wins": player_id})
+
+    pages = _follow(client, "/rankings/?event_id=3&limit=2")
+
+    players = [ranking["player_id"] for page in pages for ranking in page]
+    assert players == [1, 2, 3, 4, 5]
+
+
+def test_tampered_cursor_is_rejected(client):
+    response = client.get("/cards/?cursor=not-a-cursor")
+
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Invalid pagination cursor."
+
+
+def test_page_size_is_capped(app, client):
+    app.config["PAGE_SIZE_MAX"] = 2
+
+    response = client.get("/cards/?limit=100")
+
+    assert len(response.get_json()) == 2
@@ -0,0 +1,85 @@
+"""
+Tests for the per request query counts, timing headers and the rolling
+histograms behind '/metrics/queries'.
+"""
+
+# Installed import packages
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+# Local imports
+from init import db
+
+
+def test_responses_carry_the_query_count_and_timing(client):
+    response = client.get("/cards/2")
+
+    assert int(response.headers["X-Query-Count"]) >= 1
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    queries, rows = response.headers["X-Query-Count"], response.headers["X-Query-Rows"]
+    assert f'desc="{queries} queries, {rows} rows"' in timing
+    assert "pool;dur=" in timing
+    assert "app;dur=" in timing
+
+
+def test_rows_fetched_are_counted(client):
+    one_card = int(client.get("/cards/2").headers["X-Query-Rows"])
+    every_card = int(client.get("/cards/").headers["X-Query-Rows"])
+
+    # The seeded database has 8 cards
+    assert one_card >= 1
+    assert every_card - one_card == 7
+
+
+def test_streamed_rows_are_not_read_up_front(client):
+    response = client.get("/cards/?stream=1")
+
+    assert int(response.headers["X-Query-Rows"]) < 8
+    assert len(response.get_json()) == 8
+
+
+def test_histograms_are_kept_per_endpoint(client):
+    for card_id in (1, 2, 3):
+        client.get(f"/cards/{card_id}")
+    client.get("/players/1")
+
+    summary = client.get("/metrics/queries").get_json()
+
+    assert summary["cards.getCard"]["requests"] == 3
+    assert summary["cards.getCard"]["duration_ms"]["p95"] is not None
+    assert sum(summary["cards.getCard"]["queries"]["buckets"].values()) == 3
+    assert summary["cards.getCard"]["rows"]["max"] >= 1
+    assert sum(summary["cards.getCard"]["rows"]["buckets"].values()) == 3
+    assert summary["players.getPlayer"]["requests"] == 1
+
+
+def test_failed_statements_do_not_skew_the_next_timing(app):
+    with app.app_context():
+        with db.engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+
+            assert conn.info.get("query_started") == []
+            conn.execute(text("SELECT 1"))
+            assert conn.info["query_started"] == []
+
+
+def test_requests_over_the_threshold_are_logged(app, client, caplog):
+    app.config["SLOW_REQUEST_QUERY_THRESHOLD"] = 0
+
+    with caplog.at_level("WARNING"):
+        client.get("/cards/2")
+
+    assert any(
+        "/cards/2" in record.getMessage() and "rows" in record.getMessage() 
+        for record in caplog.records
+    )
+
+
+def test_requests_under_the_threshold_are_not_logged(client, caplog):
+    with caplog.at_level("WARNING"):
+        client.get("/cards/2")
+
+    assert not any("queries taking" in record.getMessage() for record in caplog.records)
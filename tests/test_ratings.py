@@ -0,0 +1,163 @@
+"""
+Tests for the global player ratings worked out from completed events.
+"""
+
+# Installed import packages
+import pytest
+
+# Local imports
+from init import db
+from models.rating_history import RatingHistory
+from utils import ratings
+
+
+def _rank(client, event_id, player_id, wins, losses):
+    client.post("/rankings/", json = {
+        "event_id": event_id,
+        "player_id": player_id,
+        "points": 3 * wins,
+        "wins": wins,
+        "losses": losses
+    })
+
+
+def _complete(client, event_id):
+    return client.patch(f"/events/{event_id}", json = {"event_status": "Completed"})
+
+
+def _rating(client, player_id):
+    return client.get(f"/players/{player_id}/rating").get_json()
+
+
+@pytest.fixture
+def rated_event(client):
+    """
+    Event 3 completed with player 1 winning both matches against
+    player 2.
+    """
+    _rank(client, 3, 1, wins = 2, losses = 0)
+    _rank(client, 3, 2, wins = 0, losses = 2)
+    _complete(client, 3)
+    return 3
+
+
+def test_completing_an_event_rates_its_players(client, rated_event):
+    assert _rating(client, 1)["rating"] == pytest.approx(1540)
+    assert _rating(client, 2)["rating"] == pytest.approx(1460)
+    assert _rating(client, 1)["events_played"] == 1
+
+
+def test_an_event_is_only_rated_once(client, rated_event):
+    _complete(client, rated_event)
+
+    assert _rating(client, 1)["rating"] == pytest.approx(1540)
+    assert _rating(client, 1)["events_played"] == 1
+
+
+def test_unrated_players_are_not_found(client, rated_event):
+    assert client.get("/players/3/rating").status_code == 404
+
+
+def test_leaderboard_lists_the_highest_rating_first(client, rated_event):
+    ratings = client.get("/players/ratings").get_json()
+
+    assert [rating["player_id"] for rating in ratings] == [1, 2]
+
+
+def test_changing_a_rated_result_rebuilds_the_ratings(client, rated_event):
+    client.patch("/rankings/3/1", json = {"wins": 0, "losses": 2})
+    client.patch("/rankings/3/2", json = {"wins": 2, "losses": 0})
+
+    assert _rating(client, 1)["rating"] == pytest.approx(1460)
+    assert _rating(client, 2)["rating"] == pytest.approx(1540)
+    assert _rating(client, 1)["events_played"] == 1
+
+
+def test_bulk_results_on_a_rated_event_rebuild_the_ratings(client, rated_event):
+    client.post("/rankings/bulk", json = {"event_id": 3, "rankings": [
+        {"player_id": 1, "wins": 1, "losses": 1},
+        {"player_id": 2, "wins": 1, "losses": 1}
+    ]})
+
+    assert _rating(client, 1)["rating"] == pytest.approx(1500)
+    assert _rating(client, 2)["rating"] == pytest.approx(1500)
+
+
+def test_adding_a_result_to_a_rated_event_rebuilds_the_ratings(client, rated_event):
+    _rank(client, 3, 3, wins = 1, losses = 1)
+
+    assert _rating(client, 3)["events_played"] == 1
+
+
+def test_events_completed_out_of_order_are_replayed_in_date_order(app, client, rated_event):
+    # Event 1 was held before event 3 but is only rated after it
+    _rank(client, 1, 1, wins = 0, losses = 1)
+    _rank(client, 1, 2, wins = 1, losses = 0)
+    _complete(client, 1)
+    replayed = _rating(client, 1)
+
+    result = app.test_cli_runner().invoke(args = ["db", "rebuild-ratings"])
+
+    assert result.exit_code == 0
+    assert "Ratings rebuilt for 2 players." in result.output
+    assert replayed["events_played"] == 2
+    assert _rating(client, 1)["rating"] == pytest.approx(replayed["rating"])
+
+
+@pytest.fixture
+def rated_events(app, client, rated_event):
+    """
+    Event 1, held before event 3, rated as well with player 3 beating
+    player 4.
+    """
+    _rank(client, 1, 3, wins = 1, losses = 0)
+    _rank(client, 1, 4, wins = 0, losses = 1)
+    with app.app_context():
+        ratings.rebuild_ratings()
+
+
+@pytest.fixture
+def replayed(monkeypatch):
+    """
+    The players of each event rated from here on, in the order rated.
+    """
+    events = []
+    rate_event = ratings._rate_event
+
+    def spy(players, *args):
+        events.append(sorted(players))
+        return rate_event(players, *args)
+
+    monkeypatch.setattr(ratings, "_rate_event", spy)
+    return events
+
+
+def test_results_at_the_latest_event_only_replay_that_event(client, rated_events, replayed):
+    client.patch("/rankings/3/1", json = {"wins": "+1"})
+
+    assert replayed == [[1, 2]]
+    assert _rating(client, 3)["rating"] == pytest.approx(1520)
+
+
+def test_results_at_an_earlier_event_replay_the_events_since(app, client, rated_events, replayed):
+    client.patch("/rankings/1/3", json = {"wins": 0, "losses": 1})
+    results = {player_id: _rating(client, player_id) for player_id in (1, 2, 3, 4)}
+
+    assert replayed == [[3, 4], [1, 2]]
+    app.test_cli_runner().invoke(args = ["db", "rebuild-ratings"])
+    for player_id, rating in results.items():
+        assert _rating(client, player_id) == rating
+
+
+def test_each_rated_result_is_kept_in_the_history(app, client, rated_events):
+    client.patch("/rankings/3/1", json = {"wins": "+1"})
+
+    with app.app_context():
+        statement = db.select(
+            RatingHistory.event_id,
+            RatingHistory.player_id,
+            RatingHistory.events_played
+        ).order_by(RatingHistory.event_id, RatingHistory.player_id)
+        assert db.session.execute(statement).all() == [
+            (1, 3, 1), (1, 4, 1), (3, 1, 1), (3, 2, 1)
+        ]
@@ -0,0 +1,84 @@
+"""
+Tests for the response cache of the read routes and the table versions
+it is keyed on.
+"""
+
+# Local imports
+from init import db
+from models.player import Player
+from utils.table_versions import filter_key, table_versions
+
+
+def test_repeated_reads_are_served_from_the_cache(client):
+    assert client.get("/cards/").headers["X-Cache"] == "MISS"
+    assert client.get("/cards/").headers["X-Cache"] == "HIT"
+
+
+def test_a_write_invalidates_the_cached_response(client):
+    client.get("/cards/2")
+
+    client.patch("/cards/2", json = {"card_name": "Koromon"})
+
+    response = client.get("/cards/2")
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.get_json()["card_name"] == "Koromon"
+
+
+def test_a_write_from_another_worker_invalidates_the_cached_response(client, other_worker):
+    client.get("/cards/2")
+
+    other_worker.patch("/cards/2", json = {"card_name": "Koromon"})
+
+    response = client.get("/cards/2")
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.get_json()["card_name"] == "Koromon"
+
+
+def test_a_write_only_invalidates_the_filters_it_touches(client):
+    client.post("/rankings/", json = {"event_id": 3, "player_id": 1})
+    client.post("/rankings/", json = {"event_id": 1, "player_id": 1})
+    client.get("/rankings/?event_id=3")
+    client.get("/rankings/?event_id=1")
+
+    client.post("/rankings/", json = {"event_id": 1, "player_id": 2})
+
+    assert client.get("/rankings/?event_id=3").headers["X-Cache"] == "HIT"
+    assert client.get("/rankings/?event_id=1").headers["X-Cache"] == "MISS"
+
+
+def test_writes_that_bypass_the_orm_invalidate_the_cached_response(client):
+    client.get("/cards/?limit=100")
+
+    client.post("/cards/bulk", json = [{
+        "card_number": "BT1-099",
+        "card_name": "Omnimon",
+        "card_type": "Digimon",
+        "card_rarity": "SecretRare"
+    }])
+
+    response = client.get("/cards/?limit=100")
+    assert response.headers["X-Cache"] == "MISS"
+    assert len(response.get_json()) == 9
+
+
+def test_versions_are_only_bumped_by_committed_writes(app):
+    key = filter_key("players", "player_id", 1)
+    with app.app_context():
+        before, = table_versions.current((key,))
+
+        db.session.get(Player, 1).player_name = "Rolled Back"
+        db.session.flush()
+        db.session.rollback()
+        assert table_versions.current((key,)) == (before,)
+
+        db.session.get(Player, 1).player_name = "Committed"
+        db.session.commit()
+        assert table_versions.current((key,)) == (before + 1,)
+
+
+def test_no_cache_skips_the_stored_response(client):
+    client.get("/cards/")
+
+    response = client.get("/cards/", headers = {"Cache-Control": "no-cache"})
+
+    assert response.headers["X-Cache"] == "MISS"
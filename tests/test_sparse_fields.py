@@ -0,0 +1,86 @@
+"""
+Tests for limiting the read routes to the fields a client asks for with
+'?fields=' and '?include='.
+"""
+
+# Installed import packages
+import pytest
+from sqlalchemy import event
+
+# Local imports
+from init import db
+
+
+@pytest.fixture
+def statements(app):
+    """
+    The SQL of every statement run while the test makes its requests.
+    """
+    with app.app_context():
+        engine = db.engine
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_fields_limit_the_keys_displayed(client):
+    events = client.get("/events/?fields=event_id,event_name").get_json()
+
+    assert events[0] == {"event_id": 1, "event_name": events[0]["event_name"]}
+
+
+def test_include_adds_only_the_nested_records_asked_for(client):
+    event = client.get("/events/?event_id=1&include=organiser").get_json()[0]
+
+    assert event["organiser"] == {"organiser_name": "Bandai"}
+    assert "venue" not in event
+    assert "event_details" in event
+
+
+def test_fields_and_include_combine(client):
+    event = client.get("/events/?event_id=1&fields=event_name&include=venue").get_json()[0]
+
+    assert set(event) == {"event_name", "venue"}
+
+
+def test_no_parameters_display_everything(client):
+    event = client.get("/events/?event_id=1").get_json()[0]
+
+    assert {"organiser", "venue", "event_details"} <= set(event)
+
+
+def test_only_the_requested_columns_are_read(client, statements):
+    client.get("/events/?fields=event_id,event_name")
+
+    selects = [sql for sql in statements if "FROM events" in sql]
+    assert selects
+    assert all("event_details" not in sql for sql in selects)
+    assert all("organisers" not in sql for sql in selects)
+
+
+def test_different_projections_are_cached_apart(client):
+    client.get("/cards/?fields=card_id")
+
+    cards = client.get("/cards/?fields=card_name").get_json()
+
+    assert set(cards[0]) == {"card_name"}
+
+
+def test_unknown_fields_are_refused(client):
+    response = client.get("/cards/?fields=card_id,power")
+
+    assert response.status_code == 400
+    assert "power" in response.get_data(as_text = True)
+
+
+def test_unknown_nested_records_are_refused(client):
+    assert client.get("/events/?include=card").status_code == 400
+
+
+def test_empty_field_list_is_refused(client):
+    assert client.get("/cards/?fields=").status_code == 400
@@ -0,0 +1,101 @@
+"""
+Tests for the stored event leaderboards behind
+'/events/<event_id>/standings'.
+"""
+
+# Local imports
+from init import db
+from models.ranking import Ranking
+from models.standing import Standing
+from utils.standings import match_win_pct
+
+
+def _order(client, event_id = 3):
+    standings = client.get(f"/events/{event_id}/standings").get_json()
+    return [(standing["position"], standing["player_id"]) for standing in standings]
+
+
+def _rank(client, player_id, points, wins = 0, losses = 0, ties = 0, event_id = 3):
+    return client.post("/rankings/", json = {
+        "event_id": event_id,
+        "player_id": player_id,
+        "points": points,
+        "wins": wins,
+        "losses": losses,
+        "ties": ties
+    })
+
+
+def test_new_rankings_take_their_place_on_the_leaderboard(client):
+    _rank(client, 1, 3, wins = 1)
+    _rank(client, 2, 6, wins = 2)
+    _rank(client, 3, 0, losses = 1)
+
+    assert _order(client) == [(1, 2), (2, 1), (3, 3)]
+
+
+def test_ties_on_points_are_broken_by_match_win_percentage_then_player(client):
+    _rank(client, 4, 3, wins = 1, losses = 1)
+    _rank(client, 1, 3, wins = 1, losses = 1)
+    _rank(client, 2, 3, wins = 1)
+
+    assert _order(client) == [(1, 2), (2, 1), (3, 4)]
+
+
+def test_changing_a_result_moves_only_that_player(client):
+    for player_id in (1, 2, 3):
+        _rank(client, player_id, 3 * (4 - player_id))
+
+    client.patch("/rankings/3/3", json = {"points": "+9", "wins": "+3"})
+
+    assert _order(client) == [(1, 3), (2, 1), (3, 2)]
+
+
+def test_bulk_results_update_the_leaderboard(client):
+    _rank(client, 1, 3)
+
+    client.post("/rankings/bulk", json = {"event_id": 3, "rankings": [
+        {"player_id": 1, "points": 0},
+        {"player_id": 2, "points": 6},
+        {"player_id": 3, "points": 3}
+    ]})
+
+    assert _order(client) == [(1, 2), (2, 3), (3, 1)]
+
+
+def test_event_without_rankings_has_no_standings(client):
+    response = client.get("/events/2/standings")
+
+    assert response.status_code == 404
+
+
+def test_leaderboard_is_built_from_rankings_loaded_directly(app, client):
+    with app.app_context():
+        db.session.add_all([
+            Ranking(event_id = 1, player_id = 1, points = 3),
+            Ranking(event_id = 1, player_id = 2, points = 9)
+        ])
+        db.session.commit()
+
+    assert _order(client, event_id = 1) == [(1, 2), (2, 1)]
+
+
+def test_rebuild_standings_command_reorders_every_event(app, client):
+    _rank(client, 1, 9)
+    _rank(client, 2, 3)
+    with app.app_context():
+        db.session.get(Ranking, (2, 3)).points = 12
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args = ["db", "rebuild-standings"])
+
+    assert result.exit_code == 0
+    assert _order(client) == [(1, 2), (2, 1)]
+    with app.app_context():
+        assert db.session.get(Standing, (3, 2)).points == 12
+
+
+def test_match_win_percentage_has_a_floor():
+    assert match_win_pct(0, 0, 3, 0) == 1 / 3
+    assert match_win_pct(6, 2, 1, 0) == 6 / 9
+    assert match_win_pct(0, 0, 0, 0) == 0.0
@@ -0,0 +1,54 @@
+"""
+Tests for streaming the list routes as NDJSON or a chunked JSON list.
+"""
+
+# Built-in imports
+import json
+
+
+def test_ndjson_streams_every_row_one_per_line(app, client):
+    app.config["STREAM_BATCH_SIZE"] = 3
+
+    response = client.get("/cards/?limit=2", headers = {"Accept": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text = True).splitlines()
+    assert [json.loads(line)["card_id"] for line in lines] == list(range(1, 9))
+
+
+def test_stream_parameter_sends_a_json_list(app, client):
+    app.config["STREAM_BATCH_SIZE"] = 3
+
+    response = client.get("/cards/?stream=1")
+
+    assert response.is_streamed
+    assert response.mimetype == "application/json"
+    cards = json.loads(response.get_data(as_text = True))
+    assert [card["card_id"] for card in cards] == list(range(1, 9))
+
+
+def test_streamed_rows_match_the_paged_rows(client):
+    paged = client.get("/cards/?limit=100").get_json()
+
+    streamed = json.loads(client.get("/cards/?stream=1").get_data(as_text = True))
+
+    assert streamed == paged
+
+
+def test_streams_keep_the_route_filters(client):
+    for player_id in (1, 2):
+        client.post("/rankings/", json = {"event_id": 3, "player_id": player_id})
+    client.post("/rankings/", json = {"event_id": 1, "player_id": 1})
+
+    response = client.get("/rankings/?event_id=3&stream=1")
+
+    rankings = json.loads(response.get_data(as_text = True))
+    assert [(ranking["event_id"], ranking["player_id"]) for ranking in rankings] == [(3, 1), (3, 2)]
+
+
+def test_empty_stream_is_an_empty_list(client):
+    response = client.get("/rankings/?event_id=2&stream=1")
+
+    assert json.loads(response.get_data(as_text = True)) == []
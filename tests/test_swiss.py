@@ -0,0 +1,149 @@
+"""
+Tests for Swiss pairing and the round routes under
+'/events/<event_id>/rounds'.
+"""
+
+# Built-in imports
+import itertools
+import random
+
+# Installed import packages
+import pytest
+
+# Local imports
+from utils.swiss import pair_round
+
+
+def _no_history(players):
+    return {player: set() for player in players}
+
+
+def test_each_points_group_pairs_its_top_half_against_its_bottom_half():
+    players = list(range(1, 9))
+
+    pairs, bye = pair_round(players, {player: 0 for player in players}, _no_history(players), set())
+
+    assert pairs == [(1, 5), (2, 6), (3, 7), (4, 8)]
+    assert bye is None
+
+
+def test_a_stuck_player_swaps_into_an_earlier_match():
+    players = [1, 2, 3, 4]
+    opponents = _no_history(players)
+    for one, two in ((1, 4), (2, 3), (2, 4)):
+        opponents[one].add(two)
+        opponents[two].add(one)
+
+    pairs, _ = pair_round(players, {player: 0 for player in players}, opponents, set())
+
+    assert pairs == [(1, 2), (3, 4)]
+
+
+def test_the_lowest_player_without_a_bye_sits_out():
+    players = [1, 2, 3, 4, 5]
+    points = {player: 0 for player in players}
+
+    _, first_bye = pair_round(players, points, _no_history(players), set())
+    _, second_bye = pair_round(players, points, _no_history(players), {5})
+
+    assert first_bye == 5
+    assert second_bye == 4
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_simulated_events_never_pair_a_rematch(seed):
+    shuffle = random.Random(seed)
+    players = list(range(1, 34))
+    points = {player: 0 for player in players}
+    opponents = _no_history(players)
+    had_bye = set()
+
+    # Six rounds, enough to find a winner among 33 players
+    for _ in range(6):
+        standings = sorted(players, key = lambda player: (-points[player], player))
+        pairs, bye = pair_round(standings, points, opponents, had_bye)
+
+        assert bye not in had_bye
+        seated = list(itertools.chain.from_iterable(pairs)) + [bye]
+        assert sorted(seated) == players
+        for one, two in pairs:
+            assert two not in opponents[one]
+            opponents[one].add(two)
+            opponents[two].add(one)
+            points[shuffle.choice((one, two))] += 3
+        points[bye] += 3
+        had_bye.add(bye)
+
+
+def _register(client, event_id, player_ids):
+    for player_id in player_ids:
+        client.post("/registrations/", json = {"event_id": event_id, "player_id": player_id})
+
+
+def test_pairing_a_round_seats_every_registered_player(client):
+    _register(client, 3, [1, 2, 3, 4, 5])
+
+    response = client.post("/events/3/rounds/")
+
+    matches = response.get_json()
+    assert response.status_code == 201
+    assert [match["table_number"] for match in matches] == [1, 2, 3]
+    assert matches[-1]["player_two_id"] is None
+    assert matches[-1]["result"] == "Bye"
+    assert client.get("/events/3/rounds/1").get_json() == matches
+
+
+def test_results_move_the_players_up_the_standings(client):
+    _register(client, 3, [1, 2, 3, 4])
+    client.post("/events/3/rounds/")
+
+    response = client.post("/events/3/rounds/1/results", json = [
+        {"table_number": 1, "result": "PlayerTwo"},
+        {"table_number": 2, "result": "PlayerOne"}
+    ])
+
+    assert response.get_json() == {"recorded": 2, "errors": {}}
+    standings = client.get("/events/3/standings").get_json()
+    assert [standing["player_id"] for standing in standings[:2]] == [2, 3]
+    assert standings[0]["opponent_win_pct"] == pytest.approx(1 / 3)
+
+
+def test_second_round_avoids_the_first_rounds_opponents(client):
+    _register(client, 3, [1, 2, 3, 4, 5, 6])
+    first = client.post("/events/3/rounds/").get_json()
+    client.post("/events/3/rounds/1/results", json = [
+        {"table_number": match["table_number"], "result": "PlayerOne"} for match in first
+    ])
+
+    second = client.post("/events/3/rounds/").get_json()
+
+    played = {frozenset((match["player_one_id"], match["player_two_id"])) for match in first}
+    assert not played & {frozenset((match["player_one_id"], match["player_two_id"])) for match in second}
+
+
+def test_next_round_waits_for_every_result(client):
+    _register(client, 3, [1, 2, 3, 4])
+    client.post("/events/3/rounds/")
+
+    response = client.post("/events/3/rounds/")
+
+    assert response.status_code == 409
+
+
+def test_only_running_events_are_paired(client):
+    _register(client, 2, [1, 2])
+
+    assert client.post("/events/2/rounds/").status_code == 409
+
+
+def test_results_for_byes_and_unknown_tables_are_reported(client):
+    _register(client, 3, [1, 2, 3])
+    client.post("/events/3/rounds/")
+
+    response = client.post("/events/3/rounds/1/results", json = [
+        {"table_number": 2, "result": "Draw"},
+        {"table_number": 9, "result": "Draw"}
+    ])
+
+    assert response.status_code == 400
+    assert set(response.get_json()["errors"]) == {"0", "1"}
@@ -0,0 +1,163 @@
+"""
+Tests for the synthetic data behind 'flask db seed-scale'.
+"""
+
+# Built-in imports
+from datetime import date
+
+# Installed import packages
+from sqlalchemy import func, select
+
+# Local imports
+from init import db
+from models.card import Card
+from models.collection import Collection
+from models.event import Event, EventStatus
+from models.player import Player
+from models.ranking import Ranking
+from models.registration import Registration
+from utils import synthetic_data
+from utils.synthetic_data import generate
+
+
+COUNTS = {
+    "cards": 200,
+    "decks": 40,
+    "players": 120,
+    "organisers": 3,
+    "venues": 4,
+    "events": 12,
+}
+
+
+def _generate(app, seed = 0, **options):
+    """
+    Replace the seeded records with a synthetic data set.
+    """
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        generate(COUNTS, seed = seed, batch_size = 50, report = lambda line: None, **options)
+
+
+def _events(app):
+    with app.app_context():
+        statement = select(Event.event_date, Event.event_status).order_by(Event.event_id)
+        return db.session.execute(statement).all()
+
+
+def _count(model):
+    return db.session.scalar(select(func.count()).select_from(model))
+
+
+def test_seed_scale_creates_the_requested_counts(app):
+    _generate(app)
+
+    with app.app_context():
+        assert _count(Card) == 200
+        assert _count(Player) == 120
+        assert _count(Event) == 12
+
+
+def test_registrations_use_a_deck_from_the_players_collection(app):
+    _generate(app)
+
+    with app.app_context():
+        statement = (
+            select(func.count())
+            .select_from(Registration)
+            .outerjoin(Collection, Collection.collection_id == Registration.registered_deck)
+            .where(Registration.registered_deck.is_not(None))
+            .where(
+                Collection.player_id.is_(None)
+                | (Collection.player_id != Registration.player_id)
+            )
+        )
+        assert db.session.scalar(statement) == 0
+
+
+def test_rankings_belong_to_registered_players_at_started_events(app):
+    _generate(app)
+
+    with app.app_context():
+        statement = (
+            select(Ranking.event_id, Ranking.player_id, Event.event_status, Registration.player_id)
+            .join(Event, Event.event_id == Ranking.event_id)
+            .outerjoin(
+                Registration,
+                (Registration.event_id == Ranking.event_id)
+                & (Registration.player_id == Ranking.player_id)
+            )
+        )
+        rows = db.session.execute(statement).all()
+        assert rows
+        for _, _, status, registered in rows:
+            assert registered is not None
+            assert status in (EventStatus.Completed, EventStatus.Running)
+
+
+def test_registration_counts_match_and_respect_the_cap(app):
+    _generate(app)
+
+    with app.app_context():
+        for event in db.session.scalars(select(Event)):
+            registered = db.session.scalar(
+                select(func.count()).where(Registration.event_id == event.event_id)
+            )
+            assert event.registration_count == registered
+            assert event.player_cap is None or registered <= event.player_cap
+
+
+def test_the_same_seed_gives_the_same_data(app):
+    def snapshot():
+        with app.app_context():
+            cards = select(Card.card_number, Card.card_name).order_by(Card.card_id)
+            rankings = (
+                select(Ranking.event_id, Ranking.player_id, Ranking.wins)
+                .order_by(Ranking.event_id, Ranking.player_id)
+            )
+            return db.session.execute(cards).all(), db.session.execute(rankings).all()
+
+    _generate(app, seed = 7)
+    first = snapshot()
+    _generate(app, seed = 7)
+
+    assert snapshot() == first
+
+
+def test_the_data_does_not_depend_on_the_day_it_is_made(app, monkeypatch):
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date(2031, 2, 3)
+
+    _generate(app, seed = 7)
+    first = _events(app)
+    monkeypatch.setattr(synthetic_data, "date", Tomorrow)
+    _generate(app, seed = 7)
+
+    assert _events(app) == first
+
+
+def test_event_dates_are_spread_around_the_reference_date(app):
+    reference_date = date(2030, 6, 1)
+
+    _generate(app, reference_date = reference_date)
+
+    for event_date, status in _events(app):
+        if status == EventStatus.Completed:
+            assert event_date < reference_date
+        elif status == EventStatus.Planned:
+            assert event_date > reference_date
+
+
+def test_cli_command_adds_to_the_database(app):
+    result = app.test_cli_runner().invoke(args = [
+        "db", "seed-scale", "--cards", "20", "--decks", "5", "--players", "10",
+        "--organisers", "1", "--venues", "1", "--events", "2",
+        "--reference-date", "2030-06-01"
+    ])
+
+    assert result.exit_code == 0
+    with app.app_context():
+        assert _count(Card) == 8 + 20
@@ -0,0 +1,146 @@
+"""
+Tests for the event waitlists, each player's place in the queue, and
+promoting players into places as they open up.
+"""
+
+# Local imports
+from init import db
+from models.waitlist import WaitlistEntry
+from utils.admission import renumber_waitlists
+
+
+def _register(client, player_id, event_id = 2):
+    return client.post("/registrations/", json = {"event_id": event_id, "player_id": player_id})
+
+
+def _queue(client, event_id = 2):
+    """
+    The players waiting for the event by their place in the queue.
+    """
+    waitlist = client.get(f"/registrations/waitlist/{event_id}").get_json()
+    if isinstance(waitlist, dict):
+        return {}
+    return {entry["position"]: entry["player_id"] for entry in waitlist}
+
+
+def _fill(client):
+    """
+    Fill event 2's two places with players 1 and 2, and queue players
+    3, 4 and 5 behind them.
+    """
+    for player_id in range(1, 6):
+        _register(client, player_id)
+
+
+def test_players_queue_in_the_order_they_signed_up(client):
+    _fill(client)
+
+    response = client.get("/registrations/waitlist/2/4")
+
+    assert _queue(client) == {1: 3, 2: 4, 3: 5}
+    assert response.get_json()["position"] == 2
+
+
+def test_signing_up_to_a_full_event_returns_the_place_in_the_queue(client):
+    _register(client, 1)
+    _register(client, 2)
+
+    response = _register(client, 3)
+
+    assert response.status_code == 202
+    assert response.get_json()["position"] == 1
+
+
+def test_joining_the_queue_twice_is_refused(client):
+    _fill(client)
+
+    response = _register(client, 4)
+
+    assert response.status_code == 409
+    assert _queue(client) == {1: 3, 2: 4, 3: 5}
+
+
+def test_leaving_moves_everyone_behind_up_a_place(client):
+    _fill(client)
+
+    response = client.delete("/registrations/waitlist/2/4")
+
+    assert response.status_code == 200
+    assert _queue(client) == {1: 3, 2: 5}
+
+
+def test_leaving_a_queue_the_player_is_not_in_is_not_found(client):
+    _fill(client)
+
+    assert client.delete("/registrations/waitlist/2/1").status_code == 404
+
+
+def test_a_freed_place_goes_to_the_front_of_the_queue(client):
+    _fill(client)
+
+    response = client.delete("/registrations/2/1")
+
+    assert response.get_json()["promoted"] == [3]
+    assert _queue(client) == {1: 4, 2: 5}
+    assert client.get("/registrations/?event_id=2&player_id=3").status_code == 200
+
+
+def test_raising_the_cap_promotes_players_in_order(client):
+    _fill(client)
+
+    client.patch("/events/2", json = {"player_cap": 4})
+
+    assert _queue(client) == {1: 5}
+    registered = client.get("/registrations/?event_id=2").get_json()
+    assert sorted(registration["player_id"] for registration in registered) == [1, 2, 3, 4]
+
+
+def test_deleting_a_waiting_player_moves_the_queue_up(client):
+    _fill(client)
+
+    client.delete("/players/3")
+
+    assert _queue(client) == {1: 4, 2: 5}
+
+
+def test_deleting_a_registered_player_promotes_the_front_of_the_queue(client):
+    _fill(client)
+
+    client.delete("/players/2")
+
+    assert _queue(client) == {1: 4, 2: 5}
+    registered = client.get("/registrations/?event_id=2").get_json()
+    assert sorted(registration["player_id"] for registration in registered) == [1, 3]
+
+
+def test_deleting_a_player_queued_at_several_events(client):
+    _fill(client)
+    client.patch("/events/3", json = {"player_cap": 0})
+    for player_id in (4, 6, 3):
+        _register(client, player_id, event_id = 3)
+
+    client.delete("/players/3")
+
+    assert _queue(client) == {1: 4, 2: 5}
+    assert _queue(client, event_id = 3) == {1: 4, 2: 6}
+
+
+def test_renumbering_numbers_each_queue_in_joining_order(app, client):
+    _fill(client)
+    client.patch("/events/3", json = {"player_cap": 0})
+    _register(client, 6, event_id = 3)
+    with app.app_context():
+        db.session.execute(db.update(WaitlistEntry).values(position = 0))
+        db.session.commit()
+
+        renumber_waitlists()
+        db.session.commit()
+
+    assert _queue(client) == {1: 3, 2: 4, 3: 5}
+    assert _queue(client, event_id = 3) == {1: 6}
+
+
+def test_empty_waitlist_is_answered_with_a_message(client):
+    response = client.get("/registrations/waitlist/3")
+
+    assert response.get_json() == {"message": "Nobody is on the waitlist of Event ID 3."}
@@ -0,0 +1,379 @@
+"""
+This file admits players to events without going over the event's
+player cap. When registrations for a popular event open, hundreds of
+players sign up within seconds, and counting the registrations before
+adding a new one lets two requests both see the last free seat and
+both take it.
+
+Instead every event keeps a count of its registrations, and a seat is
+claimed with a single conditional UPDATE:
+
+    UPDATE events SET registration_count = registration_count + 1
+    WHERE event_id = :event_id
+    AND (player_cap IS NULL OR registration_count < player_cap)
+
+The database checks the cap and moves the count on in one step, and
+only locks that event's row until the registration is committed, so
+sign ups to different events never wait on each other. Once an event
+is full, sign ups are turned away by a plain read of the count before
+they ever queue for the lock. The seat is given back if the
+registration's transaction is rolled back, as the count is changed in
+the same transaction.
+
+Players who sign up once an event is full join its waitlist instead.
+Whenever places open up, because a registration was deleted or the
+event's cap was raised, the players at the front of the waitlist are
+registered in their place within the same transaction. However many
+players that is, it takes the same handful of statements: one to read
+the front of the queue, one to register them all, one to remove them
+from the waitlist, one to move everyone left up the queue and one to
+move the count on.
+
+Each waitlist entry stores the player's place in the queue, numbered
+from 1 without gaps, so looking up a player's place is a read of their
+own entry rather than a count of everyone ahead of them. The numbers
+are moved on with a single UPDATE whenever players leave the front or
+the middle of the queue.
+"""
+
+# Built-in imports
+from datetime import date
+
+# Installed import packages
+from sqlalchemy import case, delete, func, insert, or_, select, update
+from sqlalchemy.orm import aliased
+
+# Local imports
+from init import db
+from models.event import Event
+from models.registration import Registration
+from models.waitlist import WaitlistEntry
+from utils.table_versions import mark_rows_written, mark_written
+
+
+def claim_seat(event_id):
+    """
+    Take one of the event's free seats for a new registration in the
+    current transaction. Returns False when the event does not exist or
+    is already full.
+    """
+    # Turn sign ups away without waiting on the event's row lock once
+    # it is full
+    seats = db.session.execute(
+        select(Event.registration_count, Event.player_cap)
+        .where(Event.event_id == event_id)
+    ).first()
+    if seats is None:
+        return False
+    registered, player_cap = seats
+    if player_cap is not None and registered >= player_cap:
+        return False
+
+    # The count is not displayed by any route, so cached event
+    # responses are left as they are
+    statement = (
+        update(Event)
+        .where(
+            Event.event_id == event_id,
+            or_(
+                Event.player_cap.is_(None),
+                Event.registration_count < Event.player_cap
+            )
+        )
+        .values(registration_count = Event.registration_count + 1)
+        .returning(Event.registration_count)
+        .execution_options(synchronize_session = False)
+    )
+    return db.session.execute(statement).first() is not None
+
+
+def claim_seats(event_id, player_ids):
+    """
+    Register a batch of players to the event in the current transaction, 
+    giving them free places in order until the event is full. The 
+    event's row is locked until the transaction ends, so the players 
+    already registered are read and the count moved on without another 
+    transaction taking the same places.
+
+    Returns the players already registered, those given a place and 
+    those left over once the event was full, or None when the event 
+    does not exist.
+    """
+    seats = db.session.execute(
+        select(Event.registration_count, Event.player_cap)
+        .where(Event.event_id == event_id)
+        .with_for_update()
+    ).first()
+    if seats is None:
+        return None
+    registered, player_cap = seats
+
+    # Players already registered keep their place
+    statement = select(Registration.player_id).where(
+        Registration.event_id == event_id,
+        Registration.player_id.in_(player_ids)
+    )
+    existing = set(db.session.scalars(statement))
+    new_players = [player_id for player_id in player_ids if player_id not in existing]
+
+    # Everyone is given a place when the event has no cap
+    if player_cap is None:
+        free = len(new_players)
+    else:
+        free = max(player_cap - registered, 0)
+    admitted, overflow = new_players[:free], new_players[free:]
+
+    if admitted:
+        db.session.execute(
+            update(Event)
+            .where(Event.event_id == event_id)
+            .values(registration_count = Event.registration_count + len(admitted))
+            .execution_options(synchronize_session = False)
+        )
+    return existing, admitted, overflow
+
+
+def release_seat(event_id, seats = 1):
+    """
+    Give back seats of the event in the current transaction, after its
+    registrations have been deleted.
+    """
+    statement = (
+        update(Event)
+        .where(Event.event_id == event_id)
+        .values(registration_count = case(
+            (Event.registration_count > seats, Event.registration_count - seats),
+            else_ = 0
+        ))
+        .execution_options(synchronize_session = False)
+    )
+    db.session.execute(statement)
+
+
+def recount_registrations():
+    """
+    Set every event's registration count from its registrations, for
+    example after loading registrations straight into the database.
+    """
+    counted = (
+        select(func.count())
+        .where(Registration.event_id == Event.event_id)
+        .scalar_subquery()
+    )
+    statement = (
+        update(Event)
+        .values(registration_count = counted)
+        .execution_options(synchronize_session = False)
+    )
+    db.session.execute(statement)
+
+
+"""
+Waitlist
+"""
+
+def lock_events(event_ids):
+    """
+    Lock the rows of several events in event ID order, so transactions 
+    changing the places of many events at once, such as deleting a 
+    player, cannot deadlock with each other.
+    """
+    statement = (
+        select(Event.event_id)
+        .where(Event.event_id.in_(event_ids))
+        .order_by(Event.event_id)
+        .with_for_update()
+    )
+    db.session.execute(statement).all()
+
+
+def _lock_event(event_id):
+    """
+    Lock the event's row until the end of the transaction, so changes 
+    to its places and waitlist take turns. Returns False when the event 
+    does not exist.
+    """
+    statement = select(Event.event_id).where(Event.event_id == event_id).with_for_update()
+    return db.session.scalar(statement) is not None
+
+
+def add_to_waitlist(event_id, players):
+    """
+    Add players to the end of the event's waitlist in the order given, 
+    in the current transaction. Players are given as (player ID, deck) 
+    pairs, and those already waiting keep their place. Returns each 
+    player's place in the queue by player ID, or None when the event 
+    does not exist.
+    """
+    if not _lock_event(event_id):
+        return None
+
+    # Players already waiting keep their place
+    statement = select(WaitlistEntry.player_id, WaitlistEntry.position).where(
+        WaitlistEntry.event_id == event_id,
+        WaitlistEntry.player_id.in_([player_id for player_id, _ in players])
+    )
+    positions = dict(db.session.execute(statement).all())
+
+    # The new players join after the last player in the queue, found 
+    # from the end of the queue index rather than by counting it
+    statement = (
+        select(WaitlistEntry.position)
+        .where(WaitlistEntry.event_id == event_id)
+        .order_by(WaitlistEntry.waitlist_id.desc())
+        .limit(1)
+    )
+    last = db.session.scalar(statement) or 0
+
+    today = date.today()
+    rows = []
+    for player_id, registered_deck in players:
+        if player_id in positions:
+            continue
+        last += 1
+        positions[player_id] = last
+        rows.append({
+            "event_id": event_id,
+            "player_id": player_id,
+            "registered_deck": registered_deck,
+            "joined_date": today,
+            "position": last
+        })
+    if rows:
+        db.session.execute(insert(WaitlistEntry), rows)
+        mark_written(db.session, WaitlistEntry.__tablename__)
+    return positions
+
+
+def remove_from_waitlist(event_id, player_id):
+    """
+    Take a player off the event's waitlist in the current transaction, 
+    moving everyone behind them up a place. Returns False when the 
+    player was not waiting.
+    """
+    if not _lock_event(event_id):
+        return False
+
+    position = db.session.scalar(
+        delete(WaitlistEntry)
+        .where(
+            WaitlistEntry.event_id == event_id,
+            WaitlistEntry.player_id == player_id
+        )
+        .returning(WaitlistEntry.position)
+        .execution_options(synchronize_session = False)
+    )
+    if position is None:
+        return False
+
+    db.session.execute(
+        update(WaitlistEntry)
+        .where(
+            WaitlistEntry.event_id == event_id,
+            WaitlistEntry.position > position
+        )
+        .values(position = WaitlistEntry.position - 1)
+        .execution_options(synchronize_session = False)
+    )
+    mark_written(db.session, WaitlistEntry.__tablename__)
+    return True
+
+
+def renumber_waitlists():
+    """
+    Number every event's waitlist from 1 in the order players joined, 
+    for example after the position column is added to an existing 
+    database or entries are loaded straight into it.
+    """
+    ahead = aliased(WaitlistEntry)
+    counted = (
+        select(func.count())
+        .where(
+            ahead.event_id == WaitlistEntry.event_id,
+            ahead.waitlist_id <= WaitlistEntry.waitlist_id
+        )
+        .scalar_subquery()
+    )
+    statement = (
+        update(WaitlistEntry)
+        .values(position = counted)
+        .execution_options(synchronize_session = False)
+    )
+    db.session.execute(statement)
+
+
+def promote_waitlisted(event_id):
+    """
+    Register the players at the front of the event's waitlist into any
+    free places, in the current transaction. Returns the IDs of the
+    players promoted.
+    """
+    # Lock the event's row while its free places are filled, so two
+    # transactions cannot hand out the same places
+    seats = db.session.execute(
+        select(Event.registration_count, Event.player_cap)
+        .where(Event.event_id == event_id)
+        .with_for_update()
+    ).first()
+    if seats is None:
+        return []
+    registered, player_cap = seats
+
+    # Everyone waiting is let in when the event has no cap
+    statement = (
+        select(
+            WaitlistEntry.waitlist_id,
+            WaitlistEntry.player_id,
+            WaitlistEntry.registered_deck
+        )
+        .where(WaitlistEntry.event_id == event_id)
+        .order_by(WaitlistEntry.waitlist_id)
+    )
+    if player_cap is not None:
+        if registered >= player_cap:
+            return []
+        statement = statement.limit(player_cap - registered)
+    promoted = db.session.execute(statement).all()
+    if not promoted:
+        return []
+
+    # Register the players, take them off the waitlist, move the rest 
+    # of the queue up and count their places in one statement each
+    today = date.today()
+    db.session.execute(insert(Registration), [
+        {
+            "event_id": event_id,
+            "player_id": player_id,
+            "registered_deck": registered_deck,
+            "registration_date": today
+        }
+        for _, player_id, registered_deck in promoted
+    ])
+    db.session.execute(
+        delete(WaitlistEntry)
+        .where(WaitlistEntry.waitlist_id.in_([waitlist_id for waitlist_id, _, _ in promoted]))
+        .execution_options(synchronize_session = False)
+    )
+    db.session.execute(
+        update(WaitlistEntry)
+        .where(WaitlistEntry.event_id == event_id)
+        .values(position = WaitlistEntry.position - len(promoted))
+        .execution_options(synchronize_session = False)
+    )
+    db.session.execute(
+        update(Event)
+        .where(Event.event_id == event_id)
+        .values(registration_count = Event.registration_count + len(promoted))
+        .execution_options(synchronize_session = False)
+    )
+    # Every place left in the queue has moved, but only the promoted 
+    # players have new registrations
+    promoted_players = [player_id for _, player_id, _ in promoted]
+    mark_written(db.session, WaitlistEntry.__tablename__)
+    mark_rows_written(
+        db.session,
+        Registration.__tablename__,
+        event_id = [event_id],
+        player_id = promoted_players
+    )
+    return promoted_players
@@ -0,0 +1,63 @@
+"""
+This file lets the list routes fetch a set of specific records by ID
+in one request ('/cards/?ids=4,8,15'). Rather than the client firing a
+'GET /cards/<card_id>' for every card on a deck page, the whole set is
+read with a single WHERE card_id IN (...) query. The records come back
+in the order they were asked for, and any IDs that do not exist are
+listed in the same response instead of as separate 404s.
+"""
+
+# Installed import packages
+from flask import abort, current_app, jsonify, request
+
+# Local imports
+from init import db
+from utils.pagination import primary_key_columns
+
+
+def requested_ids():
+    """
+    Read the IDs asked for in the '?ids=' query parameter, in order and
+    without repeats, or None when the parameter was not given. Lists
+    that are not whole numbers or are longer than the configured
+    maximum are rejected with a 400 Bad Request.
+    """
+    ids = request.args.get("ids")
+    if ids is None:
+        return None
+
+    try:
+        values = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        abort(400, description = "Invalid ids, use a comma separated list of whole numbers.")
+
+    max_ids = current_app.config["BATCH_IDS_MAX"]
+    values = list(dict.fromkeys(values))
+    if not values or len(values) > max_ids:
+        abort(400, description = f"Between 1 and {max_ids} ids can be requested at once.")
+    return values
+
+
+def get_by_ids(statement, model, ids):
+    """
+    Run a select statement for the model narrowed down to the given
+    primary key values. Returns the records in the order the IDs were
+    given, and the IDs that were not found.
+    """
+    key, = primary_key_columns(model)
+    statement = statement.where(key.in_(ids))
+    found = {
+        getattr(record, key.key): record
+        for record in db.session.scalars(statement).unique()
+    }
+    records = [found[value] for value in ids if value in found]
+    missing = [value for value in ids if value not in found]
+    return records, missing
+
+
+def batch_response(queryData, missing):
+    """
+    Build the response for a lookup by IDs, listing the records found
+    followed by the IDs that do not exist.
+    """
+    return jsonify({"data": queryData, "missing": missing})
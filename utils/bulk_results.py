@@ -0,0 +1,254 @@
+"""
+This file writes an event's rankings and registrations in bulk, for
+when an organiser submits the results of every table at the end of a
+round, or signs up a whole list of players at once. Sending them one
+POST at a time commits each row separately, so a 256 player event
+takes 256 round trips and 256 transactions.
+
+A batch is for a single event. It is validated against the model's
+schema in one pass, the valid rows are written in a single transaction
+and the invalid rows are reported back by their position in the batch,
+the same way the card import does. Rows are matched on the player and
+event, so submitting a player's result again updates it instead of
+failing. They are sent as multi-row INSERT ... ON CONFLICT DO UPDATE
+statements, which PostgreSQL and SQLite both support.
+"""
+
+# Built-in imports
+from datetime import date
+
+# Installed import packages
+from marshmallow import ValidationError
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Local imports
+from init import db
+from models.collection import Collection
+from models.player import Player
+from models.ranking import Ranking
+from models.registration import Registration
+from schemas.ranking_schema import RankingSchema
+from schemas.registration_schema import RegistrationSchema
+from utils.admission import add_to_waitlist, claim_seats, promote_waitlisted
+from utils.ratings import refresh_ratings
+from utils.standings import refresh_standings
+from utils.table_versions import mark_rows_written
+
+
+# Validate whole batches at once, returning plain dictionaries rather
+# than objects as the rows are written without the ORM
+ranking_bulk_schema = RankingSchema(many = True, load_instance = False)
+registration_bulk_schema = RegistrationSchema(many = True, load_instance = False)
+
+# The columns that identify a player's row at an event
+KEY_COLUMNS = ("event_id", "player_id")
+
+# The columns of each kind of row that refer to another table, with the
+# column they refer to and the error for a row referring to nothing
+RANKING_REFERENCES = {
+    "player_id": (Player.player_id, "Player does not exist.")
+}
+REGISTRATION_REFERENCES = {
+    **RANKING_REFERENCES,
+    "registered_deck": (Collection.collection_id, "Collection does not exist.")
+}
+
+
+def validate_event_rows(schema, records, event_id, references = None):
+    """
+    Validate a batch of rows for one event with the schema. Returns the
+    valid rows, each set to the event, along with the errors for every
+    invalid row keyed by the row's position in the batch. Rows for
+    another event, repeating a player from earlier in the batch, or
+    referring to a player or deck that does not exist, are reported as
+    errors too.
+    """
+    # Rows can leave out the event, as the whole batch is for one
+    records = [
+        {"event_id": event_id, **record} if isinstance(record, dict) else record
+        for record in records
+    ]
+    try:
+        loaded = schema.load(records)
+        errors = {}
+    except ValidationError as err:
+        # The valid data lines up with the input, with bad fields removed
+        loaded = err.valid_data
+        errors = dict(err.messages)
+
+    valid_rows = []
+    seen_players = {}
+    for index, row in enumerate(loaded):
+        if index in errors:
+            continue
+
+        if row["event_id"] != event_id:
+            errors[index] = {
+                "event_id": [f"Must be {event_id}, the event of this batch."]
+            }
+            continue
+
+        player_id = row["player_id"]
+        if player_id in seen_players:
+            errors[index] = {
+                "player_id": [
+                    f"Duplicate of row {seen_players[player_id]} in this batch."
+                ]
+            }
+            continue
+
+        seen_players[player_id] = index
+        valid_rows.append((index, row))
+
+    # Look the referred to rows up with one query per column, so a row
+    # that refers to nothing is reported rather than failing the batch
+    # on its foreign key
+    missing = {}
+    for column, (key, message) in (references or {}).items():
+        values = {row[column] for _, row in valid_rows if row.get(column) is not None}
+        if not values:
+            continue
+        existing = set(db.session.scalars(db.select(key).where(key.in_(values))))
+        for index, row in valid_rows:
+            if row.get(column) is not None and row[column] not in existing:
+                missing.setdefault(index, {})[column] = [message]
+
+    errors.update(missing)
+    return [row for index, row in valid_rows if index not in missing], errors
+
+
+def _upsert(model, rows, batch_size):
+    """
+    Insert the rows, updating the columns they give when the player
+    already has a row at the event. Rows are grouped by the columns they
+    give, so a column left out of a row is never overwritten, and each
+    group is sent in statements of up to batch_size rows.
+    """
+    dialect = db.session.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    for columns, group in groups.items():
+        updated = [column for column in columns if column not in KEY_COLUMNS]
+        for start in range(0, len(group), batch_size):
+            statement = insert(model).values(group[start:start + batch_size])
+            if updated:
+                statement = statement.on_conflict_do_update(
+                    index_elements = list(KEY_COLUMNS),
+                    set_ = {column: statement.excluded[column] for column in updated}
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(
+                    index_elements = list(KEY_COLUMNS)
+                )
+            db.session.execute(statement)
+
+
+def _error_report(errors):
+    return {str(index): message for index, message in sorted(errors.items())}
+
+
+def submit_rankings(event_id, records, batch_size = 1000):
+    """
+    Validate and upsert a batch of an event's rankings in a single
+    transaction, and move the players to their new places on the
+    event's leaderboard, rating the event again if it was rated
+    already. Returns a report of how many rankings were added and
+    updated along with the errors for each row left out.
+    """
+    rows, errors = validate_event_rows(
+        ranking_bulk_schema, records, event_id, RANKING_REFERENCES
+    )
+
+    added = updated = 0
+    if rows:
+        player_ids = [row["player_id"] for row in rows]
+        statement = db.select(Ranking.player_id).where(
+            Ranking.event_id == event_id,
+            Ranking.player_id.in_(player_ids)
+        )
+        updated = len(set(db.session.scalars(statement)))
+        added = len(rows) - updated
+
+        _upsert(Ranking, rows, batch_size)
+
+        mark_rows_written(
+            db.session,
+            Ranking.__tablename__,
+            event_id = [event_id],
+            player_id = player_ids
+        )
+
+        # Rebuild the changed players' standings in the same transaction
+        refresh_standings(event_id, player_ids)
+        refresh_ratings(event_id)
+        db.session.commit()
+
+    return {
+        "added": added,
+        "updated": updated,
+        "errors": _error_report(errors)
+    }
+
+
+def submit_registrations(event_id, records, batch_size = 1000):
+    """
+    Validate and upsert a batch of an event's registrations in a single
+    transaction. Players already on the waitlist are given the event's
+    free places first, then the players listed in the order they are
+    listed, and once it is full the rest join the end of its waitlist.
+    Returns a report of how many players were registered, updated,
+    waitlisted and promoted from the waitlist along with the errors for
+    each row left out, or None when the event does not exist.
+    """
+    rows, errors = validate_event_rows(
+        registration_bulk_schema, records, event_id, REGISTRATION_REFERENCES
+    )
+
+    # The queue is served before the batch, so the batch only finds a
+    # free place once nobody is left waiting for one
+    promoted = promote_waitlisted(event_id)
+    seats = claim_seats(event_id, [row["player_id"] for row in rows])
+    if seats is None:
+        db.session.rollback()
+        return None
+    existing, admitted, overflow = seats
+
+    admitted_players = set(admitted)
+    registrations = []
+    waitlisted = []
+    today = date.today()
+    for row in rows:
+        if row["player_id"] in existing:
+            registrations.append(row)
+        elif row["player_id"] in admitted_players:
+            row.setdefault("registration_date", today)
+            registrations.append(row)
+        else:
+            waitlisted.append((row["player_id"], row.get("registered_deck")))
+
+    if registrations:
+        _upsert(Registration, registrations, batch_size)
+        mark_rows_written(
+            db.session,
+            Registration.__tablename__,
+            event_id = [event_id],
+            player_id = [row["player_id"] for row in registrations]
+        )
+
+    # Join the end of the waitlist in the order listed, players already
+    # waiting keep their place
+    if waitlisted:
+        add_to_waitlist(event_id, waitlisted)
+    db.session.commit()
+
+    return {
+        "registered": len(admitted),
+        "updated": len(registrations) - len(admitted),
+        "waitlisted": len(overflow),
+        "promoted": promoted,
+        "errors": _error_report(errors)
+    }
@@ -0,0 +1,193 @@
+"""
+This file imports cards in bulk, for when a new set release adds 
+hundreds of cards at once. The whole batch is validated against the 
+card schema in one pass, the valid rows are written in a single 
+transaction and the invalid rows are reported back by their position 
+in the batch without stopping the rest of the import.
+
+Rows are matched on their unique card number, so importing a card 
+that already exists updates its name, type and rarity instead of 
+failing. On PostgreSQL the rows are sent with COPY into a temporary 
+staging table and merged with one INSERT ... ON CONFLICT statement. 
+SQLite, used for local benchmarking, falls back to batched multi-row 
+upserts.
+"""
+
+# Built-in imports
+import csv
+import io
+import json
+
+# Installed import packages
+from marshmallow import ValidationError
+from sqlalchemy.dialects import sqlite
+
+# Local imports
+from init import db
+from models.card import Card
+from schemas.card_schema import CardSchema
+from utils.table_versions import mark_written
+
+
+# The columns a card import can set, in the order CSV files list them
+IMPORT_COLUMNS = ("card_number", "card_name", "card_type", "card_rarity")
+
+# Validate whole batches at once, returning plain dictionaries rather 
+# than card objects as the rows are written without the ORM
+card_import_schema = CardSchema(many = True, load_instance = False)
+
+
+def parse_card_file(text, file_format):
+    """
+    Read a batch of cards from a CSV file with a header row, or from a 
+    JSON list of card objects.
+    """
+    if file_format == "csv":
+        return [dict(row) for row in csv.DictReader(io.StringIO(text))]
+
+    records = json.loads(text)
+    if not isinstance(records, list):
+        raise ValueError("A card import must be a list of cards.")
+    return records
+
+
+def validate_cards(records):
+    """
+    Validate a batch of cards with the card schema. Returns the valid 
+    rows along with the errors for every invalid row, keyed by the 
+    row's position in the batch. Cards repeating a card number from 
+    earlier in the same batch are reported as errors too.
+    """
+    try:
+        loaded = card_import_schema.load(records)
+        errors = {}
+    except ValidationError as err:
+        # The valid data lines up with the input, with bad fields removed
+        loaded = err.valid_data
+        errors = dict(err.messages)
+
+    valid_rows = []
+    seen_numbers = {}
+    for index, row in enumerate(loaded):
+        if index in errors:
+            continue
+
+        card_number = row["card_number"]
+        if card_number in seen_numbers:
+            errors[index] = {
+                "card_number": [
+                    f"Duplicate of row {seen_numbers[card_number]} in this batch."
+                ]
+            }
+            continue
+
+        seen_numbers[card_number] = index
+        valid_rows.append({column: row[column] for column in IMPORT_COLUMNS})
+    return valid_rows, errors
+
+
+def _existing_card_numbers(card_numbers, batch_size):
+    """
+    Find which of these card numbers are already in the cards table, so 
+    the import can report how many cards were added and how many updated.
+    """
+    existing = set()
+    for start in range(0, len(card_numbers), batch_size):
+        batch = card_numbers[start:start + batch_size]
+        statement = db.select(Card.card_number).where(Card.card_number.in_(batch))
+        existing.update(db.session.scalars(statement))
+    return existing
+
+
+def _copy_upsert(rows):
+    """
+    PostgreSQL: stream the rows into a temporary staging table with COPY 
+    and merge them into the cards table with a single upsert.
+    """
+    card_type = Card.__table__.c.card_type.type.name
+    card_rarity = Card.__table__.c.card_rarity.type.name
+
+    # Write the rows as CSV, enums are stored in the database by name
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            row["card_number"], 
+            row["card_name"], 
+            row["card_type"].name, 
+            row["card_rarity"].name
+        ])
+    buffer.seek(0)
+
+    # Run on the session's own connection so the import shares its 
+    # transaction
+    connection = db.session.connection().connection.dbapi_connection
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMP TABLE card_import "
+            "(card_number text, card_name text, card_type text, card_rarity text) "
+            "ON COMMIT DROP"
+        )
+        cursor.copy_expert(
+            "COPY card_import (card_number, card_name, card_type, card_rarity) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+        cursor.execute(
+            "INSERT INTO cards (card_number, card_name, card_type, card_rarity) "
+            f"SELECT card_number, card_name, card_type::{card_type}, "
+            f"card_rarity::{card_rarity} FROM card_import "
+            "ON CONFLICT (card_number) DO UPDATE SET "
+            "card_name = EXCLUDED.card_name, "
+            "card_type = EXCLUDED.card_type, "
+            "card_rarity = EXCLUDED.card_rarity"
+        )
+
+
+def _batched_upsert(rows, batch_size):
+    """
+    SQLite: send the rows as multi-row INSERT ... ON CONFLICT statements 
+    of up to batch_size rows each.
+    """
+    for start in range(0, len(rows), batch_size):
+        statement = sqlite.insert(Card).values(rows[start:start + batch_size])
+        statement = statement.on_conflict_do_update(
+            index_elements = [Card.card_number],
+            set_ = {
+                "card_name": statement.excluded.card_name,
+                "card_type": statement.excluded.card_type,
+                "card_rarity": statement.excluded.card_rarity,
+            }
+        )
+        db.session.execute(statement)
+
+
+def import_cards(records, batch_size = 1000):
+    """
+    Validate and upsert a batch of cards in a single transaction. 
+    Returns a report of how many cards were added and updated along 
+    with the errors for each row that was left out.
+    """
+    rows, errors = validate_cards(records)
+
+    added = updated = 0
+    if rows:
+        existing = _existing_card_numbers(
+            [row["card_number"] for row in rows], 
+            batch_size
+        )
+        updated = len(existing)
+        added = len(rows) - updated
+
+        if db.session.get_bind().dialect.name == "postgresql":
+            _copy_upsert(rows)
+        else:
+            _batched_upsert(rows, batch_size)
+        mark_written(db.session, Card.__tablename__)
+        db.session.commit()
+
+    return {
+        "added": added,
+        "updated": updated,
+        "errors": {str(index): message for index, message in sorted(errors.items())}
+    }
@@ -0,0 +1,408 @@
+"""
+This file keeps an in-memory search index over the card names and
+numbers, so '/cards/search?q=' can find cards by part of their name
+("Agu", "greymon"), the start of their number ("BT1-"), or a name with
+a typo in it ("Greymn"), without reading the whole cards table.
+
+The index is built from trigrams, the runs of three characters in each
+word, padded with spaces at the start and end of the word the way
+PostgreSQL's pg_trgm extension does:
+
+    'agumon' -> '  a', ' ag', 'agu', 'gum', 'umo', 'mon', 'on '
+
+Each trigram points at the cards whose name or number contains it, so
+the cards containing a piece of text are found by intersecting the
+cards of its trigrams, and names close to a misspelt query are the
+ones sharing the most trigrams with it.
+
+The index is read from the database on the first search along with
+the version of the cards table (see table_versions.py), and then kept
+up to date as cards are written:
+    - Cards created, changed or deleted through the ORM in this worker
+      are updated in the index as soon as their transaction is
+      committed, moving the index on to the version that commit gave
+      the cards table
+    - Any other write to the cards, whether made by another worker or
+      by a statement that bypasses the ORM (the bulk card import),
+      leaves the index behind the table's version, and the index is
+      rebuilt in full on the next search
+"""
+
+# Built-in imports
+import bisect
+import math
+import re
+import threading
+from collections import Counter
+
+# Installed import packages
+from flask import abort, current_app, has_app_context, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+# Local imports
+from init import db
+from models.card import Card
+from utils.table_versions import table_versions
+
+
+# How alike a name has to be to a misspelt query to be listed, as the
+# share of their combined trigrams that they have in common. This is
+# the default threshold of pg_trgm's similarity operator.
+SIMILARITY_THRESHOLD = 0.3
+
+# Sorts after every string starting with the same text
+_AFTER_PREFIX = chr(0x10FFFF)
+
+_WORDS = re.compile(r"[0-9a-z]+")
+
+
+def _normalise(text):
+    return text.casefold().strip()
+
+
+def _trigrams(text):
+    """
+    Return the padded trigrams of every word in the text.
+    """
+    grams = set()
+    for word in _WORDS.findall(text):
+        padded = f"  {word} "
+        grams.update(padded[index:index + 3] for index in range(len(padded) - 2))
+    return grams
+
+
+def _query_trigrams(query):
+    """
+    Return the trigrams a card must contain for the query to appear in
+    its name or number. Only trigrams inside the query's words are
+    used, as the query may start or end part way through a word. Words
+    too short to have one can only be matched at the start of a word.
+    """
+    grams = set()
+    for word in _WORDS.findall(query):
+        if len(word) >= 3:
+            grams.update(word[index:index + 3] for index in range(len(word) - 2))
+        else:
+            grams.add(f"  {word}"[-3:])
+    return grams
+
+
+class CardSearchIndex:
+    """
+    A thread safe trigram index over the names and numbers of every
+    card in the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._version = None
+        self._clear()
+
+    def _clear(self):
+        # Each card's normalised name, number, type and rarity
+        self._cards = {}
+
+        # The cards each trigram of a name or number appears in, and the
+        # number of trigrams in each card's name
+        self._name_grams = {}
+        self._number_grams = {}
+        self._name_sizes = {}
+
+        # (text, card ID) pairs in order, to find the names and numbers
+        # starting with a query by binary search
+        self._sorted_names = []
+        self._sorted_numbers = []
+
+    """
+    Building and Updating
+    """
+
+    def _add(self, card_id, card_number, card_name, card_type, card_rarity, in_order = False):
+        name = _normalise(card_name)
+        number = _normalise(card_number)
+        self._cards[card_id] = (name, number, card_type, card_rarity)
+
+        name_grams = _trigrams(name)
+        self._name_sizes[card_id] = len(name_grams)
+        for gram in name_grams:
+            self._name_grams.setdefault(gram, set()).add(card_id)
+        for gram in _trigrams(number):
+            self._number_grams.setdefault(gram, set()).add(card_id)
+
+        # A full rebuild appends everything and sorts once at the end
+        if in_order:
+            self._sorted_names.append((name, card_id))
+            self._sorted_numbers.append((number, card_id))
+        else:
+            bisect.insort(self._sorted_names, (name, card_id))
+            bisect.insort(self._sorted_numbers, (number, card_id))
+
+    def _remove(self, card_id):
+        entry = self._cards.pop(card_id, None)
+        if entry is None:
+            return
+        name, number, _, _ = entry
+        del self._name_sizes[card_id]
+        for postings, text in ((self._name_grams, name), (self._number_grams, number)):
+            for gram in _trigrams(text):
+                cards = postings.get(gram)
+                if cards is not None:
+                    cards.discard(card_id)
+                    if not cards:
+                        del postings[gram]
+        for entries, text in ((self._sorted_names, name), (self._sorted_numbers, number)):
+            position = bisect.bisect_left(entries, (text, card_id))
+            if position < len(entries) and entries[position] == (text, card_id):
+                del entries[position]
+
+    def rebuild(self):
+        """
+        Read every card from the database into a fresh index.
+        """
+        version, = table_versions.current((Card.__tablename__,))
+        statement = db.select(
+            Card.card_id,
+            Card.card_number,
+            Card.card_name,
+            Card.card_type,
+            Card.card_rarity
+        ).execution_options(yield_per = 5000)
+
+        with self._lock:
+            self._clear()
+            for row in db.session.execute(statement):
+                self._add(*row, in_order = True)
+            self._sorted_names.sort()
+            self._sorted_numbers.sort()
+            self._version = version
+
+    def apply(self, changes, version):
+        """
+        Update the cards written by a committed transaction, which moved
+        the cards table on to the given version. The changes map each
+        card ID to its new (number, name, type, rarity), or to None when
+        the card was deleted. The index is left to be rebuilt when it
+        has missed a write made before this one.
+        """
+        with self._lock:
+            if self._version is None or self._version != version - 1:
+                return
+            for card_id, values in changes.items():
+                self._remove(card_id)
+                if values is not None:
+                    self._add(card_id, *values)
+            self._version = version
+
+    def _ensure_current(self):
+        version, = table_versions.current((Card.__tablename__,))
+        if self._version != version:
+            self.rebuild()
+
+    """
+    Searching
+    """
+
+    def _starting_with(self, query):
+        """
+        Return the cards whose name or number is the query, and those
+        whose name or number starts with it.
+        """
+        exact = set()
+        prefixed = set()
+        for entries in (self._sorted_names, self._sorted_numbers):
+            start = bisect.bisect_left(entries, (query,))
+            end = bisect.bisect_left(entries, (query + _AFTER_PREFIX,), start)
+            for text, card_id in entries[start:end]:
+                (exact if text == query else prefixed).add(card_id)
+        return exact, prefixed
+
+    def _containing(self, query):
+        """
+        Return the cards that may contain the query in their name or
+        number. The trigrams only narrow the cards down, so the text
+        itself still has to be checked.
+        """
+        grams = _query_trigrams(query)
+        if not grams:
+            return set()
+
+        found = set()
+        for postings in (self._name_grams, self._number_grams):
+            # Intersect the smallest sets first
+            sets = sorted((postings.get(gram, set()) for gram in grams), key = len)
+            candidates = set(sets[0])
+            for cards in sets[1:]:
+                candidates &= cards
+                if not candidates:
+                    break
+            found |= candidates
+        return found
+
+    def _similar(self, query):
+        """
+        Return the cards whose names are close to the query, most alike
+        first.
+        """
+        grams = _trigrams(query)
+        if not grams:
+            return []
+
+        # A name alike enough has to share at least this many trigrams
+        # with the query, so it must have at least one of the rarest
+        # trigrams left once that many of the most common are put aside.
+        # Only those names are counted, rather than every name sharing
+        # a common trigram such as 'mon'.
+        needed = math.ceil(SIMILARITY_THRESHOLD * len(grams))
+        by_rarity = sorted(grams, key = lambda gram: len(self._name_grams.get(gram, ())))
+        probe = len(grams) - needed + 1
+
+        shared = Counter()
+        for gram in by_rarity[:probe]:
+            shared.update(self._name_grams.get(gram, ()))
+        candidates = set(shared)
+        for gram in by_rarity[probe:]:
+            shared.update(candidates & self._name_grams.get(gram, set()))
+
+        similar = []
+        for card_id, count in shared.items():
+            similarity = count / (len(grams) + self._name_sizes[card_id] - count)
+            if similarity >= SIMILARITY_THRESHOLD:
+                similar.append((-similarity, card_id))
+        similar.sort()
+        return [card_id for _, card_id in similar]
+
+    def search(self, query, card_type = None, card_rarity = None, limit = 50):
+        """
+        Return the IDs of the cards best matching the query, best first:
+        exact names or numbers, then ones starting with the query, then
+        ones containing it, then names close to it, with ties in card ID
+        order. Cards can be limited to a type and rarity.
+
+        Each kind of match is only looked for while the results are not
+        yet full, so a short query matching thousands of cards stops as
+        soon as it has found a page of the best ones.
+        """
+        query = _normalise(query)
+        results = []
+        seen = set()
+
+        def take(card_ids, contains = False):
+            # Add cards to the results in order until they are full
+            for card_id in card_ids:
+                if card_id in seen:
+                    continue
+                name, number, type_, rarity = self._cards[card_id]
+                if (
+                    (card_type is not None and type_ != card_type)
+                    or (card_rarity is not None and rarity != card_rarity)
+                    or (contains and query not in name and query not in number)
+                ):
+                    continue
+                seen.add(card_id)
+                results.append(card_id)
+                if len(results) >= limit:
+                    return True
+            return False
+
+        with self._lock:
+            self._ensure_current()
+
+            exact, prefixed = self._starting_with(query)
+            if (
+                take(sorted(exact))
+                or take(sorted(prefixed))
+                or take(sorted(self._containing(query)), contains = True)
+            ):
+                return results
+
+            # Only look for misspellings when the query was not found as
+            # it was typed often enough to fill the results
+            take(self._similar(query))
+        return results
+
+
+def search_filter(parameter, enum):
+    """
+    Read a type or rarity to limit a search to from the query string,
+    by the name the cards display it with ('?card_type=Digimon'), or
+    None when it was not given. Unknown names are rejected with a 400
+    Bad Request.
+    """
+    value = request.args.get(parameter)
+    if value is None:
+        return None
+    try:
+        return enum[value]
+    except KeyError:
+        abort(
+            400,
+            description =
+            f"Unknown {parameter}: {value}. "
+            f"Choose from: {', '.join(member.name for member in enum)}."
+        )
+
+
+def init_card_search(app):
+    """
+    Create the card search index and attach it to the Flask app. It is
+    read from the database on the first search.
+    """
+    app.extensions["card_search"] = CardSearchIndex()
+
+    listeners = (
+        ("after_flush", _record_flushed_cards),
+        ("after_commit", _apply_committed_cards),
+        ("after_rollback", _forget_rolled_back_cards),
+    )
+    for identifier, listener in listeners:
+        if not event.contains(Session, identifier, listener):
+            event.listen(Session, identifier, listener)
+
+
+"""
+Session Hooks
+"""
+
+def _record_flushed_cards(session, flush_context):
+    """
+    After each flush note down the new values of every card that was
+    added or changed, and the IDs of the cards that were deleted.
+    """
+    changes = None
+    for instance in session.new | session.dirty | session.deleted:
+        if not isinstance(instance, Card):
+            continue
+        if changes is None:
+            changes = session.info.setdefault("card_search_changes", {})
+
+        if instance in session.deleted:
+            card_id = inspect(instance).identity[0]
+            changes[card_id] = None
+        else:
+            changes[instance.card_id] = (
+                instance.card_number,
+                instance.card_name,
+                instance.card_type,
+                instance.card_rarity
+            )
+
+
+def _apply_committed_cards(session):
+    """
+    Once the transaction has been committed, update the cards it wrote
+    in the search index.
+    """
+    changes = session.info.pop("card_search_changes", None)
+    version = session.info.get("committed_versions", {}).get(Card.__tablename__)
+    if changes and version is not None and has_app_context():
+        index = current_app.extensions.get("card_search")
+        if index is not None:
+            index.apply(changes, version)
+
+
+def _forget_rolled_back_cards(session):
+    """
+    Nothing was written if the transaction was rolled back.
+    """
+    session.info.pop("card_search_changes", None)
@@ -0,0 +1,159 @@
+"""
+This file compresses the app's responses. A page of cards or events is
+the same handful of keys repeated hundreds of times, so it shrinks to
+a fraction of its size, which matters far more to a client on a phone
+connection than the little time spent compressing it.
+
+The encoding is picked from the client's 'Accept-Encoding' header:
+    - 'br' (Brotli) when the brotli package is installed
+    - 'gzip' otherwise
+    - No compression when the client accepts neither
+
+Responses smaller than COMPRESSION_MIN_SIZE bytes are sent as they
+are, as compressing them saves next to nothing. Streamed responses are
+compressed chunk by chunk as they are sent.
+
+Compressing the same cached response on every hit would throw away
+much of what caching it saved, so the compressed bodies are stored in
+the response cache entry alongside the uncompressed one (see
+response_cache.py) and handed straight back on the next hit asking
+for the same encoding.
+"""
+
+# Built-in imports
+import gzip
+import zlib
+
+# Installed import packages
+from flask import current_app, g, request
+
+# Brotli is optional, gzip is used without it
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# The response types worth compressing
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/x-ndjson"}
+
+
+def available_encodings():
+    """
+    The encodings the app can send, in the order it prefers them.
+    """
+    if brotli is None:
+        return ["gzip"]
+    return ["br", "gzip"]
+
+
+def negotiated_encoding():
+    """
+    Return the encoding to compress the current request's response
+    with, or None when it should be sent uncompressed.
+    """
+    if not current_app.config["COMPRESSION_ENABLED"]:
+        return None
+    return request.accept_encodings.best_match(available_encodings())
+
+
+def compress(body, encoding):
+    """
+    Compress a whole response body with the given encoding. gzip bodies
+    are written without a timestamp so the same body always compresses
+    to the same bytes.
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality = current_app.config["COMPRESSION_BROTLI_QUALITY"])
+    return gzip.compress(body, compresslevel = current_app.config["COMPRESSION_LEVEL"], mtime = 0)
+
+
+def _compressor(encoding):
+    """
+    Return functions compressing a stream a chunk at a time, and
+    finishing it off once the last chunk has been given.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality = current_app.config["COMPRESSION_BROTLI_QUALITY"])
+        return compressor.process, compressor.finish
+
+    # A window of 16 + MAX_WBITS writes the gzip header and trailer
+    compressor = zlib.compressobj(
+        current_app.config["COMPRESSION_LEVEL"],
+        zlib.DEFLATED,
+        16 + zlib.MAX_WBITS
+    )
+    return compressor.compress, compressor.flush
+
+
+def _compress_stream(chunks, encoding):
+    """
+    Compress a streamed response as it is sent. Compressed bytes are
+    passed on whenever the compressor has some ready, rather than after
+    every chunk, as compressing each row on its own would barely shrink
+    the response.
+    """
+    # Set up while the request is still being handled, the chunks are
+    # sent after the app context has gone
+    process, finish = _compressor(encoding)
+    return _compressed_chunks(chunks, process, finish)
+
+
+def _compressed_chunks(chunks, process, finish):
+    """
+    Pass each chunk of the response through the compressor, then send
+    whatever it still holds once the last chunk is in.
+    """
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        compressed = process(chunk)
+        if compressed:
+            yield compressed
+    yield finish()
+
+
+def init_compression(app):
+    """
+    Compress every response the client accepts a compressed copy of.
+    """
+
+    @app.after_request
+    def compress_response(response):
+        if (
+            response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.status_code != 200
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+
+        # Caches between the app and the client must keep a copy per
+        # encoding, whether or not this particular response is compressed
+        response.vary.add("Accept-Encoding")
+        encoding = negotiated_encoding()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, encoding)
+            response.headers.pop("Content-Length", None)
+            response.headers["Content-Encoding"] = encoding
+            return response
+
+        body = response.get_data()
+        if len(body) < current_app.config["COMPRESSION_MIN_SIZE"]:
+            return response
+
+        # Reuse the compressed body stored with a cached response, or
+        # store it there for the next hit
+        cached = g.get("response_cache_entry")
+        if cached is not None:
+            compressed = cached["encoded"].get(encoding)
+            if compressed is None:
+                compressed = cached["encoded"][encoding] = compress(body, encoding)
+        else:
+            compressed = compress(body, encoding)
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        return response
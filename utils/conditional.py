@@ -0,0 +1,75 @@
+"""
+This file adds conditional GET support to the read routes. Every GET 
+response carries a strong ETag made from the versions of the tables 
+(and the filtered key values) the response was built from. A client 
+that sends the ETag back in an 'If-None-Match' header is answered with 
+an empty '304 Not Modified' as long as nothing it depends on has been 
+committed since, without running a query or a schema dump.
+
+Clients polling '/rankings/?event_id=' during a live event therefore 
+only download the standings again once a result at that event is 
+actually recorded.
+"""
+
+# Built-in imports
+import hashlib
+
+# Installed import packages
+from flask import current_app, g, request
+
+# Local imports
+from utils.compression import negotiated_encoding
+from utils.response_cache import blueprint_tables
+from utils.table_versions import request_versions
+
+
+def make_etag(model, tables, filters):
+    """
+    Build the ETag for the current request from the URL, the requested 
+    format and encoding, and the versions of everything the response 
+    depends on. The versions are kept in the database, so every worker 
+    hands out the same ETag for the same data, and it stays valid for 
+    as long as that data is unchanged.
+    """
+    fingerprint = repr((
+        request.full_path,
+        request.headers.get("Accept", ""),
+        negotiated_encoding(),
+        request_versions(model, tables, filters)
+    ))
+    return hashlib.sha1(fingerprint.encode()).hexdigest()
+
+
+def conditional_blueprint(blueprint, model, schema, filters = (), extra_tables = ()):
+    """
+    Add ETags and 'If-None-Match' handling to the GET routes of a 
+    blueprint. This is registered before the response cache so a 
+    matching ETag is answered before the cache is even looked at.
+    """
+    tables = blueprint_tables(model, schema, extra_tables)
+
+    @blueprint.before_request
+    def check_if_none_match():
+        """
+        Answer with 304 Not Modified when the client already holds the 
+        current version of this response.
+        """
+        if request.method != "GET":
+            return None
+
+        g.etag = make_etag(model, tables, filters)
+        if request.if_none_match.contains(g.etag):
+            response = current_app.response_class(status = 304)
+            response.set_etag(g.etag)
+            return response
+        return None
+
+    @blueprint.after_request
+    def add_etag(response):
+        """
+        Attach the ETag to every successful GET response.
+        """
+        etag = g.get("etag")
+        if etag is not None and response.status_code == 200:
+            response.set_etag(etag)
+        return response
@@ -0,0 +1,143 @@
+"""
+This file builds the database engine and connection pool settings from 
+the environment, so each deployment can size its pool against the 
+number of gunicorn workers and PostgreSQL's connection limit without 
+changing any code. The available settings are listed in .envexample.
+
+When an external pooler such as PgBouncer sits in front of PostgreSQL, 
+set DB_EXTERNAL_POOLER to hand pooling over to it entirely. Each 
+request then opens and closes its own (cheap) connection to PgBouncer 
+rather than holding on to connections in every worker.
+
+Each checkout from the pool is watched with SQLAlchemy's 'checkout' 
+event. The connections in use are added to each request's timings, and 
+a warning is logged when a checkout takes the last connection the pool 
+can open, as the next request has to wait for one to be handed back. 
+The pool itself times how long every checkout waits for a connection, 
+which is added to the request's timings as well and logged once it 
+goes over DB_POOL_WAIT_LOG_MS. The wait is capped by DB_POOL_TIMEOUT, 
+after which the request is turned away with a 503 rather than queueing 
+behind the others. Any of these is the sign that the pool is too small 
+for the traffic it is getting.
+"""
+
+# Built-in imports
+import os
+import time
+
+# Installed import packages
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import event, make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+# Local imports
+from init import db
+
+
+# The connections QueuePool opens beyond its pool size when not told
+DEFAULT_MAX_OVERFLOW = 10
+
+
+class TimedQueuePool(QueuePool):
+    """
+    A QueuePool that times how long each checkout takes to be handed a 
+    connection, including any wait for another request to give one back.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        connection = super().connect()
+        waited = (time.perf_counter() - started) * 1000
+
+        if has_request_context():
+            g.pool_wait = g.get("pool_wait", 0.0) + waited
+        if has_app_context() and waited > current_app.config["DB_POOL_WAIT_LOG_MS"]:
+            current_app.logger.warning(
+                "Waited %.1f ms for a database connection (%s)", 
+                waited, 
+                self.status()
+            )
+        return connection
+
+
+def env_flag(name, default):
+    """
+    Read a true/false setting from the environment.
+    """
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def engine_options(database_uri):
+    """
+    Return the SQLAlchemy engine options for the database URI. PostgreSQL 
+    gets the full pool, pre-ping, recycle, statement timeout and 
+    application name settings, other databases (SQLite for local 
+    benchmarking) keep SQLAlchemy's defaults. SQLite files are still 
+    given a timed pool, in memory databases share a single connection.
+    """
+    if not database_uri:
+        return {}
+    if not database_uri.startswith("postgresql"):
+        url = make_url(database_uri)
+        if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:"):
+            return {"poolclass": TimedQueuePool}
+        return {}
+
+    application_name = os.getenv("DB_APPLICATION_NAME", "digiscan")
+    statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
+
+    if env_flag("DB_EXTERNAL_POOLER", False):
+        # PgBouncer keeps the pool, and in transaction pooling mode it 
+        # rejects the 'options' startup parameter, so the statement 
+        # timeout has to be set on the database role instead
+        return {
+            "poolclass": NullPool,
+            "connect_args": {"application_name": application_name},
+        }
+
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": env_flag("DB_POOL_PRE_PING", True),
+        "connect_args": {
+            "application_name": application_name,
+            "options": f"-c statement_timeout={statement_timeout}",
+        },
+    }
+
+
+def register_pool_logging(app):
+    """
+    Watch the checkouts from the app's connection pool. Pools that open 
+    a connection for every checkout (PgBouncer mode) have nothing to 
+    run out of and are left alone.
+    """
+    with app.app_context():
+        pool = db.engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+
+    options = app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+    capacity = pool.size() + options.get("max_overflow", DEFAULT_MAX_OVERFLOW)
+
+    def log_checkout(dbapi_connection, connection_record, connection_proxy):
+        """
+        Note the most connections the request saw in use at once, and 
+        warn when this checkout took the last one.
+        """
+        in_use = pool.checkedout()
+        if has_request_context():
+            g.pool_in_use = max(g.get("pool_in_use", 0), in_use)
+        if in_use >= capacity and has_app_context():
+            current_app.logger.warning(
+                "All %d database connections are in use, further checkouts "
+                "wait up to %s seconds (%s)", 
+                capacity, 
+                options.get("pool_timeout", 30), 
+                pool.status()
+            )
+
+    event.listen(pool, "checkout", log_checkout)
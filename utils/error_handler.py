@@ -11,7 +11,7 @@ to narrow down where failures occur.
 # adding elegant error handling to prevent system crashes.
 from flask import jsonify # Formats error messages as a JSON
 from marshmallow import ValidationError
-from sqlalchemy.exc import IntegrityError, DataError
+from sqlalchemy.exc import IntegrityError, DataError, TimeoutError
 from psycopg2 import errorcodes
 
 
@@ -103,6 +103,30 @@ def register_error_handlers(app):
             f"{err.orig.diag.message_primary}"
         }, 409
     
+    @app.errorhandler(TimeoutError)
+    def handle_pool_timeout(err):
+        """
+        This function throws a 503 error message when every database 
+        connection stayed in use for longer than DB_POOL_TIMEOUT, so the 
+        request is turned away rather than waiting any longer.
+        """
+        app.logger.warning("Gave up waiting for a database connection: %s", err)
+        return {
+            "message": 
+            "The server is busy. Please try again shortly."
+        }, 503
+
+    @app.errorhandler(400)
+    def handle_bad_request(err):
+        """
+        This function throws a 400 error message when the request 
+        itself is malformed, such as an invalid query parameter.
+        """
+        return {
+            "message": 
+            err.description
+        }, 400
+
     @app.errorhandler(404)
     def handle_404(err):
         """
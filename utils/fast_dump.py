@@ -0,0 +1,212 @@
+"""
+This file speeds up displaying query results by compiling each schema
+into a plain Python function that turns one record into a dictionary.
+
+Marshmallow works out what to do with every field of every record as
+it goes: it looks up the field, reads the value through an accessor,
+checks for missing values and defaults, then calls the field's
+formatting. For a list route returning hundreds of records with nested
+organisers, venues and players, that bookkeeping costs more than the
+query. The schemas used by the read routes only ever display plain
+columns and nested records, so the same work can be written out once
+per schema as straight line code:
+
+    def serialise(obj):
+        result = {}
+        state = obj.__dict__
+        value_0 = state['card_id'] if 'card_id' in state else obj.card_id
+        result['card_id'] = None if value_0 is None else int(value_0)
+        value_1 = state['card_name'] if 'card_name' in state else obj.card_name
+        result['card_name'] = None if value_1 is None else text(value_1)
+        return result
+
+Every conversion is the one marshmallow's own field would apply, in
+the field order the schema displays, so the output is identical to
+schema.dump(). A function is compiled for each class of record a
+schema displays, as fields the class does not have are left out.
+Schemas using anything the compiler does not know about (dump hooks,
+custom fields, dotted attributes) are displayed by marshmallow as
+before. Setting FAST_SERIALISERS to false switches the compiled
+functions off entirely.
+"""
+
+# Built-in imports
+import keyword
+
+# Installed import packages
+from flask import current_app
+from marshmallow import Schema, fields
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow.utils import ensure_text_type
+from sqlalchemy import inspect
+
+
+# Compiled functions by the schema and the class of record they were
+# built for, or None where marshmallow has to display the records.
+# Projected schemas (see sparse_fields.py) are kept for the life of the
+# app as well, so each combination is only compiled once.
+_compiled = {}
+
+# The function displaying a single record of any class, by schema
+_serialisers = {}
+
+
+def _convert(field, value, label, namespace):
+    """
+    Return the source of an expression converting the non-null value
+    in the variable 'value' the way the field would, or None when the
+    field is not one the compiler handles.
+    """
+    kind = type(field)
+
+    if kind in (fields.Integer, fields.Float) and not field.as_string:
+        return f"{field.num_type.__name__}({value})"
+
+    if kind is fields.String:
+        return f"text({value})"
+
+    if kind in (fields.Date, fields.DateTime):
+        data_format = field.format or field.DEFAULT_FORMAT
+        format_func = field.SERIALIZATION_FUNCS.get(data_format)
+        if format_func is None:
+            return None
+        namespace[f"format_{label}"] = format_func
+        return f"format_{label}({value})"
+
+    if kind is fields.Enum:
+        # Enums display their name (or value) through an inner field
+        member = f"{value}.value" if field.by_value else f"{value}.name"
+        if type(field.field) is fields.Raw:
+            return member
+        return _convert(field.field, member, f"{label}_member", namespace)
+
+    if kind is fields.Nested:
+        schema = field.schema
+        namespace[f"dump_{label}"] = record_serialiser(schema)
+        if schema.many or field.many:
+            return f"[dump_{label}(item) for item in {value}]"
+        return f"dump_{label}({value})"
+
+    if kind is fields.List:
+        item = _convert(field.inner, "item", f"{label}_item", namespace)
+        if item is None:
+            return None
+        return f"[None if item is None else {item} for item in {value}]"
+
+    return None
+
+
+def _compile(schema, cls):
+    """
+    Write out and compile the function displaying a record of the given
+    class with the schema, or return None when marshmallow has to
+    display it.
+    """
+    # Hooks, a custom accessor or an ordered dict class all change what
+    # dump() returns in ways the compiled function does not copy
+    if schema._hooks[PRE_DUMP] or schema._hooks[POST_DUMP]:
+        return None
+    if type(schema).get_attribute is not Schema.get_attribute:
+        return None
+    if schema.dict_class is not dict:
+        return None
+
+    # Marshmallow reads dictionaries and other mappings by key
+    if hasattr(cls, "__getitem__"):
+        return None
+
+    # Mapped classes keep the values they have loaded in the record's
+    # __dict__, which is much quicker to read than going through the
+    # attribute. Values that have not been loaded yet (expired after a
+    # commit, or a relationship not eager loaded) are read through the
+    # attribute as before, so they load just as they would for dump().
+    mapper = inspect(cls, raiseerr = False)
+    mapped = set(mapper.attrs.keys()) if mapper is not None else set()
+
+    namespace = {"text": ensure_text_type}
+    lines = ["def serialise(obj):", "    result = {}"]
+    if mapped:
+        lines.append("    state = obj.__dict__")
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        attribute = field.attribute or name
+        if not attribute.isidentifier() or keyword.iskeyword(attribute):
+            return None
+
+        # Fields the record's class does not have are left out, as
+        # marshmallow does for missing attributes
+        if not hasattr(cls, attribute):
+            continue
+
+        value = f"value_{index}"
+        converted = _convert(field, value, index, namespace)
+        if converted is None:
+            return None
+
+        key = field.data_key if field.data_key is not None else name
+        if attribute in mapped:
+            lines.append(f"    {value} = state[{attribute!r}] if {attribute!r} in state else obj.{attribute}")
+        else:
+            lines.append(f"    {value} = obj.{attribute}")
+        lines.append(f"    result[{key!r}] = None if {value} is None else {converted}")
+    lines.append("    return result")
+
+    source = "\n".join(lines)
+    exec(compile(source, f"<serialiser {type(schema).__name__}>", "exec"), namespace)
+    return namespace["serialise"]
+
+
+def compiled_serialiser(schema, cls):
+    """
+    Return the compiled function displaying a record of the given class
+    with the schema, or None when marshmallow has to display it.
+    """
+    key = (schema, cls)
+    try:
+        return _compiled[key]
+    except KeyError:
+        serialise = _compiled[key] = _compile(schema, cls)
+        return serialise
+
+
+def record_serialiser(schema):
+    """
+    Return a function displaying a single record with the schema. The
+    compiled function for the record's class is used where there is
+    one, otherwise the record is displayed by marshmallow.
+    """
+    serialise = _serialisers.get(schema)
+    if serialise is not None:
+        return serialise
+
+    by_class = {}
+
+    def serialise(record):
+        cls = type(record)
+        try:
+            function = by_class[cls]
+        except KeyError:
+            function = compiled_serialiser(schema, cls)
+            if function is None:
+                def function(record):
+                    return schema.dump(record, many = False)
+            by_class[cls] = function
+        return function(record)
+
+    _serialisers[schema] = serialise
+    return serialise
+
+
+def fast_dump(schema, data, many = None):
+    """
+    Display the data with the schema, through its compiled functions
+    when the app has them switched on. Returns exactly what
+    schema.dump() would.
+    """
+    many = schema.many if many is None else many
+    if not current_app.config["FAST_SERIALISERS"] or data is None:
+        return schema.dump(data, many = many)
+
+    serialise = record_serialiser(schema)
+    if many:
+        return [serialise(record) for record in data]
+    return serialise(data)
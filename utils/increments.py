@@ -0,0 +1,88 @@
+"""
+This file reads partial updates that can move a number on rather than
+overwrite it, such as recording one more win for a player:
+
+    {"wins": "+1", "points": "+3"}
+
+A plain number sets the column, while a signed number in a string adds
+to or takes away from the value in the database. The changes are
+turned into the SET clause of a single UPDATE, so the database does the
+adding:
+
+    UPDATE rankings SET wins = wins + 1, points = points + 3
+    WHERE event_id = :event_id AND player_id = :player_id
+    RETURNING ...
+
+Reading the row, changing it in Python and writing it back would let
+two table reports sent at the same moment both read the same number of
+wins and one of the wins be lost, or hold the row locked while the
+request works out the new value.
+
+Counts can never go below zero. Numbers set directly are checked when
+the body is read, and taking away from a column adds a condition to
+the UPDATE's WHERE clause, so the database only changes the row when
+the result stays at zero or above:
+
+    UPDATE rankings SET wins = wins - 1
+    WHERE ... AND wins - 1 >= 0
+"""
+
+# Built-in imports
+import re
+
+# Installed import packages
+from marshmallow import ValidationError
+from sqlalchemy import func
+
+
+# A signed whole number, '+1' or '-2'
+_INCREMENT = re.compile(r"^\s*([+-])\s*(\d+)\s*$")
+
+
+def increment_values(model, bodyData, columns):
+    """
+    Turn the request body into the values of an UPDATE of the model,
+    allowing only the given integer columns. Returns the values along 
+    with the conditions the UPDATE must be limited to so no column goes 
+    below zero. Raises a ValidationError listing every field that 
+    cannot be applied.
+    """
+    if not isinstance(bodyData, dict) or not bodyData:
+        raise ValidationError({"_schema": ["Send at least one field to update."]})
+
+    values = {}
+    conditions = []
+    errors = {}
+    for field, value in bodyData.items():
+        if field not in columns:
+            errors[field] = [f"Cannot be updated. Choose from: {', '.join(columns)}."]
+            continue
+
+        column = getattr(model, field)
+
+        # Set the column to a number, or clear it
+        if value is None or (isinstance(value, int) and not isinstance(value, bool)):
+            if value is not None and value < 0:
+                errors[field] = ["Must not be negative."]
+                continue
+            values[field] = value
+            continue
+
+        # Move the column on from its current value, counting a column
+        # that has not been set yet as 0
+        match = _INCREMENT.match(value) if isinstance(value, str) else None
+        if match is None:
+            errors[field] = ["Must be a whole number, or a signed one such as '+1' to add to it."]
+            continue
+        sign, amount = match.groups()
+        amount = int(amount)
+        current = func.coalesce(column, 0)
+        if sign == "+":
+            values[field] = current + amount
+        else:
+            values[field] = current - amount
+            conditions.append(current - amount >= 0)
+
+    if errors:
+        raise ValidationError(errors)
+    return values, conditions
@@ -0,0 +1,143 @@
+"""
+This file sets up how the app turns its responses into JSON. Flask's
+default provider uses the standard library encoder, which is written
+in Python and is the slowest part of sending a large list once the
+records have been displayed. When orjson is installed the responses
+are encoded with it instead, and when it is not the app falls back to
+the standard library encoder.
+
+Both encoders treat the types the models use the same way:
+    - Dates, such as an event's date or a registration's date, are
+      written in the ISO YYYY-MM-DD format the schemas display
+    - Enums, such as a card's type and rarity or an event's status,
+      are written as their value
+
+Set JSON_BACKEND to 'stdlib' to always use the standard library
+encoder, or to 'orjson' to require orjson.
+"""
+
+# Built-in imports
+import dataclasses
+import decimal
+from datetime import date
+from enum import Enum
+
+# Installed import packages
+from flask.json.provider import DefaultJSONProvider
+
+# orjson is optional, the standard library encoder is used without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+JSON_BACKENDS = ("auto", "orjson", "stdlib")
+
+
+def _default(value):
+    """
+    Convert the values the standard library encoder does not know how
+    to write into ones it does, matching what orjson writes for them.
+    """
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _orjson_default(value):
+    """
+    Convert the values orjson does not know how to write. Dates, enums
+    and dataclasses are written by orjson itself.
+    """
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """
+    Flask's default provider, writing dates in the ISO format rather
+    than as HTTP dates.
+    """
+    default = staticmethod(_default)
+
+
+class OrjsonJSONProvider(DefaultJSONProvider):
+    """
+    Encode JSON with orjson. The output is always compact unless it is
+    being indented, so the separators argument is accepted and ignored.
+    Arguments orjson has no equivalent for are passed to the standard
+    library encoder instead.
+    """
+    default = staticmethod(_default)
+
+    def _options(self, indent = None, sort_keys = None):
+        # Dictionaries with whole number keys are written with string
+        # keys, as the standard library encoder does
+        options = orjson.OPT_NON_STR_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        if self.sort_keys if sort_keys is None else sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def _encode(self, obj, **kwargs):
+        """
+        Encode the object to bytes with orjson, or return None when the
+        arguments need the standard library encoder.
+        """
+        kwargs.pop("separators", None)
+        indent = kwargs.pop("indent", None)
+        sort_keys = kwargs.pop("sort_keys", None)
+        if kwargs or indent not in (None, 2):
+            return None
+        return orjson.dumps(obj, default = _orjson_default, option = self._options(indent, sort_keys))
+
+    def dumps(self, obj, **kwargs):
+        encoded = self._encode(obj, **kwargs)
+        if encoded is None:
+            return super().dumps(obj, **kwargs)
+        return encoded.decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Same as Flask's response, without decoding and re-encoding
+        # the body on its way out
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default = _orjson_default, option = self._options(2 if indent else None))
+        return self._app.response_class(body + b"\n", mimetype = self.mimetype)
+
+
+def init_json_provider(app):
+    """
+    Attach the JSON provider chosen by JSON_BACKEND to the Flask app.
+    """
+    backend = app.config["JSON_BACKEND"]
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"JSON_BACKEND must be one of {', '.join(JSON_BACKENDS)}, not {backend!r}")
+    if backend == "orjson" and orjson is None:
+        raise RuntimeError("JSON_BACKEND is set to orjson but orjson is not installed")
+
+    if backend == "stdlib" or orjson is None:
+        app.json = StdlibJSONProvider(app)
+    else:
+        app.json = OrjsonJSONProvider(app)
+
+    # Keep the order of keys in JSON response
+    app.json.sort_keys = False
@@ -0,0 +1,301 @@
+"""
+This file works out how often each card is played at events and how
+the decks playing it did, known as the metagame. A deck is counted as
+played when a player registers it for an event (registrations point
+at a collection, which points at the deck), and its results come from
+the player's ranking at that event.
+
+The totals are built from GROUP BY queries in the database, one row
+per event and card, rather than by reading every decklist. Only
+completed events are counted, as their results are final.
+
+Each event's totals are kept in a cache against the versions of the
+tables they were read from (see table_versions.py), so a report over
+a date range only queries the events it has not seen before, or whose
+registrations or rankings have changed since. When a new event is
+completed, only that event is read and added to the running totals.
+"""
+
+# Built-in imports
+from datetime import date, timedelta
+
+# Installed import packages
+from flask import abort, current_app, request
+from sqlalchemy import and_, case, cast, func
+
+# Local imports
+from init import db
+from models.card import Card
+from models.collection import Collection
+from models.decklist import Decklist
+from models.event import Event, EventStatus
+from models.ranking import Ranking
+from models.registration import Registration
+from models.standing import Standing
+from utils.response_cache import LRUCache, NullCache
+from utils.table_versions import filter_key, table_versions, whole_table_key
+
+
+# Placements counted as a top finish
+TOP_CUT = 8
+
+# The totals kept for each card, in the order they are stored
+USAGE_FIELDS = (
+    "entries",
+    "copies",
+    "weighted_copies",
+    "wins",
+    "losses",
+    "ties",
+    "top_finishes"
+)
+
+
+def init_metagame_cache(app):
+    """
+    Create the cache of per event totals and attach it to the Flask
+    app. It is switched off along with the response cache.
+    """
+    if app.config["RESPONSE_CACHE_BACKEND"] == "none":
+        cache = NullCache()
+    else:
+        cache = LRUCache(
+            max_entries = app.config["METAGAME_CACHE_EVENTS"],
+            ttl = app.config["METAGAME_CACHE_TTL"]
+        )
+    app.extensions["metagame_cache"] = cache
+
+
+def report_since():
+    """
+    Read the start of the report from the '?since=' query parameter
+    (YYYY-MM-DD), falling back to the configured number of days ago.
+    """
+    since = request.args.get("since")
+    if since is None:
+        return date.today() - timedelta(days = current_app.config["METAGAME_WINDOW_DAYS"])
+    try:
+        return date.fromisoformat(since)
+    except ValueError:
+        abort(400, "Invalid since date, use the YYYY-MM-DD format.")
+
+
+"""
+Per Event Totals
+"""
+
+def _event_version_keys(event_id):
+    """
+    The version keys an event's totals depend on. Changes to any deck
+    or collection can change what was played, so those use their table
+    wide versions.
+    """
+    return (
+        filter_key("events", "event_id", event_id),
+        filter_key("registrations", "event_id", event_id),
+        filter_key("rankings", "event_id", event_id),
+        filter_key("standings", "event_id", event_id),
+        whole_table_key("events"),
+        whole_table_key("registrations"),
+        whole_table_key("rankings"),
+        whole_table_key("standings"),
+        "decklists",
+        "collections",
+    )
+
+
+def _read_event_totals(event_ids):
+    """
+    Query the deck count and the totals of every card played at each of
+    the given events, in two GROUP BY queries.
+    """
+    totals = {event_id: {"decks": 0, "cards": {}} for event_id in event_ids}
+
+    # Decks registered at each event
+    statement = (
+        db.select(Registration.event_id, func.count())
+        .where(
+            Registration.event_id.in_(event_ids),
+            Registration.registered_deck.is_not(None)
+        )
+        .group_by(Registration.event_id)
+    )
+    for event_id, decks in db.session.execute(statement):
+        totals[event_id]["decks"] = decks
+
+    # Each registered deck's cards, weighted by the share of match
+    # points the player won, and the player's placing. Rankings without
+    # a placement fall back to the precomputed standings.
+    matches = Ranking.wins + Ranking.losses + Ranking.ties
+    performance = cast(Ranking.points, db.Float) / (3 * func.nullif(matches, 0))
+    placement = func.coalesce(func.nullif(Ranking.placement, 0), Standing.position)
+    statement = (
+        db.select(
+            Registration.event_id,
+            Decklist.card_id,
+            func.count(),
+            func.sum(Decklist.card_quantity),
+            func.sum(Decklist.card_quantity * func.coalesce(performance, 0)),
+            func.sum(func.coalesce(Ranking.wins, 0)),
+            func.sum(func.coalesce(Ranking.losses, 0)),
+            func.sum(func.coalesce(Ranking.ties, 0)),
+            func.sum(case((placement.between(1, TOP_CUT), 1), else_ = 0))
+        )
+        .select_from(Registration)
+        .join(Collection, Collection.collection_id == Registration.registered_deck)
+        .join(Decklist, Decklist.deck_id == Collection.deck_id)
+        .outerjoin(
+            Ranking,
+            and_(
+                Ranking.event_id == Registration.event_id,
+                Ranking.player_id == Registration.player_id
+            )
+        )
+        .outerjoin(
+            Standing,
+            and_(
+                Standing.event_id == Registration.event_id,
+                Standing.player_id == Registration.player_id
+            )
+        )
+        .where(Registration.event_id.in_(event_ids))
+        .group_by(Registration.event_id, Decklist.card_id)
+    )
+    for event_id, card_id, *values in db.session.execute(statement):
+        totals[event_id]["cards"][card_id] = values
+
+    return totals
+
+
+def _event_totals(event_ids):
+    """
+    Return the totals of each of the given events, reading only the
+    events that are not cached at their current versions.
+    """
+    cache = current_app.extensions["metagame_cache"]
+
+    # The versions of every event are read in one query
+    event_keys = {event_id: _event_version_keys(event_id) for event_id in event_ids}
+    keys = [key for version_keys in event_keys.values() for key in version_keys]
+    versions = dict(zip(keys, table_versions.current(keys)))
+
+    totals = {}
+    missing = {}
+    for event_id, version_keys in event_keys.items():
+        cache_key = (event_id, tuple(versions[key] for key in version_keys))
+        cached = cache.get(cache_key)
+        if cached is None:
+            missing[event_id] = cache_key
+        else:
+            totals[event_id] = cached
+
+    if missing:
+        for event_id, event_totals in _read_event_totals(list(missing)).items():
+            cache.set(missing[event_id], event_totals)
+            totals[event_id] = event_totals
+    return totals
+
+
+"""
+Reports
+"""
+
+def _usage_row(card, values, decks):
+    """
+    Build the report of a single card from its totals.
+    """
+    usage = dict(zip(USAGE_FIELDS, values))
+    matches = usage["wins"] + usage["losses"] + usage["ties"]
+    usage.update(
+        card_id = card.card_id,
+        card_number = card.card_number,
+        card_name = card.card_name,
+        share = usage["entries"] / decks if decks else 0.0,
+        average_copies = usage["copies"] / usage["entries"] if usage["entries"] else 0.0,
+        win_rate = (usage["wins"] + usage["ties"] / 2) / matches if matches else None
+    )
+    return usage
+
+
+def metagame(since, card_id = None):
+    """
+    Add up the totals of every completed event held since the given
+    date. Returns the number of events, the number of decks registered
+    to them, and the totals of each card played (or only of the given
+    card) by card ID.
+    """
+    statement = db.select(Event.event_id).where(
+        Event.event_status == EventStatus.Completed,
+        Event.event_date >= since
+    )
+    event_ids = list(db.session.scalars(statement))
+
+    decks = 0
+    cards = {}
+    for event_totals in _event_totals(event_ids).values():
+        decks += event_totals["decks"]
+        for played_card, values in event_totals["cards"].items():
+            if card_id is not None and played_card != card_id:
+                continue
+            running = cards.setdefault(played_card, [0] * len(USAGE_FIELDS))
+            for index, value in enumerate(values):
+                running[index] += value or 0
+
+    return len(event_ids), decks, cards
+
+
+def metagame_report(since, limit):
+    """
+    The most played cards at the completed events held since the given
+    date, most played first.
+    """
+    events, decks, cards = metagame(since)
+
+    # Most entries first, then most copies, then card ID
+    ranked = sorted(
+        cards.items(),
+        key = lambda item: (-item[1][0], -item[1][1], item[0])
+    )[:limit]
+    card_ids = [card_id for card_id, _ in ranked]
+    details = {
+        card.card_id: card
+        for card in db.session.scalars(db.select(Card).where(Card.card_id.in_(card_ids)))
+    }
+
+    return {
+        "since": since,
+        "events": events,
+        "decks": decks,
+        "cards": [
+            _usage_row(details[card_id], values, decks)
+            for card_id, values in ranked if card_id in details
+        ]
+    }
+
+
+def card_usage_report(card, since):
+    """
+    How often a single card has been built into decks overall, and how
+    often and how well it was played at the completed events held
+    since the given date.
+    """
+    events, decks, cards = metagame(since, card.card_id)
+    usage = _usage_row(
+        card,
+        cards.get(card.card_id, [0] * len(USAGE_FIELDS)),
+        decks
+    )
+
+    # Decks built with the card, whether or not they were played
+    statement = db.select(
+        func.count(),
+        func.coalesce(func.sum(Decklist.card_quantity), 0)
+    ).where(Decklist.card_id == card.card_id)
+    usage["decklists"], usage["decklist_copies"] = db.session.execute(statement).one()
+
+    return {
+        "since": since,
+        "events": events,
+        "decks": decks,
+        "card": usage
+    }
@@ -0,0 +1,138 @@
+"""
+This file brings a database created by an older version of the app up
+to date with the models, for deployments that already hold data and
+cannot be dropped and recreated. 'flask db create' only creates tables
+that do not exist yet, so tables, columns and indexes added to the
+models later are missing from existing databases.
+
+Upgrading compares the database with the models and adds what is
+missing, so it is safe to run again and again:
+    - Tables that do not exist are created along with their indexes
+    - Columns that do not exist are added, filled with their default
+    - Indexes that do not exist are created. On PostgreSQL they are
+      built CONCURRENTLY, so the tables can still be written to while
+      an index is built over millions of rows
+
+Nothing is ever dropped or changed, only added.
+"""
+
+# Installed import packages
+from sqlalchemy import inspect, literal
+from sqlalchemy.schema import CreateIndex
+
+# Local imports
+from init import db
+
+
+class MigrationError(Exception):
+    """
+    The database cannot be brought up to date without losing data or
+    a decision only a person can make.
+    """
+
+
+def _column_default(column, dialect):
+    """
+    Return the SQL default existing rows are filled with when the column
+    is added, or None if the column has no default.
+    """
+    if column.server_default is not None:
+        return dialect.ddl_compiler(dialect, None).get_column_default_string(column)
+    if column.default is not None and column.default.is_scalar:
+        value = literal(column.default.arg, column.type)
+        return str(value.compile(dialect = dialect, compile_kwargs = {"literal_binds": True}))
+    return None
+
+
+def _add_column_sql(table, column, dialect):
+    """
+    Build the ALTER TABLE statement adding the column to the table.
+    """
+    preparer = dialect.identifier_preparer
+    sql = (
+        f"ALTER TABLE {preparer.format_table(table)} "
+        f"ADD COLUMN {preparer.format_column(column)} "
+        f"{column.type.compile(dialect = dialect)}"
+    )
+
+    default = _column_default(column, dialect)
+    if default is not None:
+        sql += f" DEFAULT {default}"
+    if not column.nullable:
+        if default is None:
+            raise MigrationError(
+                f"{table.name}.{column.name} cannot be added to existing rows: "
+                "it cannot be null and has no default."
+            )
+        sql += " NOT NULL"
+    return sql
+
+
+def pending_changes():
+    """
+    Compare the database with the models. Returns the tables, columns
+    and indexes that are missing from the database.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+
+    tables, columns, indexes = [], [], []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            tables.append(table)
+            continue
+
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        columns.extend(
+            (table, column) for column in table.columns
+            if column.name not in existing_columns
+        )
+
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        indexes.extend(
+            index for index in table.indexes
+            if index.name not in existing_indexes
+        )
+    return tables, columns, indexes
+
+
+def upgrade_database(report = print):
+    """
+    Add the missing tables, columns and indexes to the database. Returns
+    the names of the tables and columns that were added, so callers can
+    fill in any that are worked out from other tables.
+    """
+    tables, columns, indexes = pending_changes()
+    dialect = db.engine.dialect
+
+    # New tables come with their own indexes
+    added = []
+    if tables:
+        db.metadata.create_all(db.engine, tables = tables)
+        for table in tables:
+            added.append(table.name)
+            report(f"Table created: {table.name}")
+
+    # Columns are added in one transaction, so a failure adds none
+    if columns:
+        statements = [_add_column_sql(table, column, dialect) for table, column in columns]
+        with db.engine.begin() as connection:
+            for statement in statements:
+                connection.exec_driver_sql(statement)
+        for table, column in columns:
+            added.append(f"{table.name}.{column.name}")
+            report(f"Column added: {table.name}.{column.name}")
+
+    # Indexes are built one at a time outside of a transaction, which
+    # PostgreSQL needs to build them without blocking writes
+    with db.engine.connect().execution_options(isolation_level = "AUTOCOMMIT") as connection:
+        for index in indexes:
+            statement = str(CreateIndex(index, if_not_exists = True).compile(dialect = dialect))
+            if dialect.name == "postgresql":
+                statement = statement.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+            connection.exec_driver_sql(statement)
+            report(f"Index created: {index.name} on {index.table.name}")
+
+    if not (tables or columns or indexes):
+        report("Database is up to date.")
+    return added
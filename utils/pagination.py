@@ -0,0 +1,146 @@
+"""
+This file adds cursor based (keyset) pagination to the list routes. 
+Rather than skipping over rows with an OFFSET, every page remembers 
+the primary key of the last row it returned and the next page starts 
+straight after it. The database can jump directly to that key through 
+the primary key index, so fetching page 1,000 is as quick as fetching 
+page 1 no matter how large the table grows.
+"""
+
+# Built-in imports
+import base64
+import json
+from collections import namedtuple
+
+# Installed import packages
+from flask import abort, current_app, jsonify, request, url_for
+from sqlalchemy import inspect, tuple_
+
+# Local imports
+from init import db
+
+
+# A single page of results and the cursor pointing at the page after it.
+# The cursor is None when there are no more rows to fetch.
+Page = namedtuple("Page", ["items", "next_cursor"])
+
+
+def primary_key_columns(model):
+    """
+    Return the primary key columns of a model in the order they are 
+    declared. Composite keys such as the decklist (deck_id, card_id) 
+    and ranking (player_id, event_id) keys are returned as a tuple of 
+    both columns.
+    """
+    return tuple(inspect(model).primary_key)
+
+
+def encode_cursor(values):
+    """
+    Turn the primary key values of the last row on a page into an 
+    opaque, URL safe string that the client hands back to us to fetch 
+    the next page.
+    """
+    raw = json.dumps(list(values), separators = (",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, key_length):
+    """
+    Turn a cursor string back into the key values it was made from. 
+    Cursors that have been tampered with or belong to a different table 
+    are rejected with a 400 Bad Request.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError):
+        abort(400, description = "Invalid pagination cursor.")
+
+    # Each value in the cursor must line up with a primary key column
+    if (
+        not isinstance(values, list) 
+        or len(values) != key_length 
+        or not all(
+            isinstance(value, (int, float)) and not isinstance(value, bool) 
+            for value in values
+        )
+    ):
+        abort(400, description = "Invalid pagination cursor.")
+    return values
+
+
+def page_size():
+    """
+    Read the requested page size from the '?limit=' query parameter, 
+    falling back to the configured default and never going past the 
+    configured maximum.
+    """
+    default_size = current_app.config["PAGE_SIZE_DEFAULT"]
+    max_size = current_app.config["PAGE_SIZE_MAX"]
+    limit = request.args.get("limit", default_size, type = int)
+    return max(1, min(limit, max_size))
+
+
+def paginate(statement, model, key_columns = None, descending = False):
+    """
+    Apply keyset pagination to a select statement for the given model 
+    and run it. The rows are ordered by the model's primary key, or by 
+    the given key columns which must end in a unique column, and only 
+    the rows after the '?cursor=' position are fetched. One extra row is 
+    requested to find out whether another page exists without running 
+    a separate COUNT query.
+    """
+    key_columns = tuple(key_columns or primary_key_columns(model))
+    limit = page_size()
+
+    # Start after the last row of the previous page, if there was one
+    cursor = request.args.get("cursor")
+    if cursor:
+        values = decode_cursor(cursor, len(key_columns))
+        if len(key_columns) == 1:
+            position, after = key_columns[0], values[0]
+        else:
+            # Compare composite keys as a row value so the database 
+            # can still walk the composite index
+            position, after = tuple_(*key_columns), tuple_(*values)
+        if descending:
+            statement = statement.where(position < after)
+        else:
+            statement = statement.where(position > after)
+
+    if descending:
+        statement = statement.order_by(*(column.desc() for column in key_columns))
+    else:
+        statement = statement.order_by(*key_columns)
+    statement = statement.limit(limit + 1)
+    items = list(db.session.scalars(statement))
+
+    # The extra row only tells us there is more to come, drop it from 
+    # this page and point the cursor at the last row we are returning
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last_row = items[-1]
+        next_cursor = encode_cursor(
+            getattr(last_row, column.key) for column in key_columns
+        )
+    return Page(items, next_cursor)
+
+
+def page_response(queryData, next_cursor):
+    """
+    Return a page of serialised rows as JSON. When there is another 
+    page, the opaque cursor is sent in the 'X-Next-Cursor' header along 
+    with a ready to follow 'Link' header, so the body stays the same 
+    list of records the routes have always returned.
+    """
+    response = jsonify(queryData)
+    if next_cursor:
+        arguments = request.args.to_dict()
+        arguments.update(request.view_args or {})
+        arguments["cursor"] = next_cursor
+        next_url = url_for(request.endpoint, **arguments)
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response
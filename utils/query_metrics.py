@@ -0,0 +1,267 @@
+"""
+This file measures how much database work each request does. Every SQL 
+statement run through the engine is counted and timed against the 
+request that ran it, along with the rows its queries fetched. The 
+totals are sent back on every response in the 'X-Query-Count', 
+'X-Query-Rows' and 'Server-Timing' headers (the latter shows up in the 
+browser's network tools), and fed into a rolling histogram per 
+endpoint.
+
+Rows are counted as the session hands them over rather than from the 
+cursor's rowcount, which SQLite always reports as -1 for a SELECT. 
+Queries that stream their rows in batches (yield_per) are sent after 
+the headers have gone out, so they are left uncounted rather than read 
+into memory all at once.
+
+Requests that run more statements or spend longer in the database than 
+the configured thresholds are logged as warnings, which is usually the 
+first sign of a missing eager load or index.
+"""
+
+# Built-in imports
+import bisect
+import threading
+import time
+from collections import deque
+
+# Installed import packages
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Local imports
+from init import db
+
+
+# Upper bounds (in milliseconds and statements) of the histogram buckets
+DURATION_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+
+"""
+Engine Hooks
+"""
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """
+    Note the time each statement starts on the connection.
+    """
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """
+    Add the statement's time to the totals of the request running it. 
+    Statements run outside of a request, such as the CLI commands, are 
+    not counted.
+    """
+    started = conn.info["query_started"].pop()
+    if not has_request_context():
+        return
+
+    g.query_count = g.get("query_count", 0) + 1
+    g.query_time = g.get("query_time", 0.0) + time.perf_counter() - started
+
+
+def _count_fetched_rows(orm_execute_state):
+    """
+    Read the rows of each query the session runs for a request and add 
+    them to the request's total, handing the session a copy of the 
+    result to read them from. Streamed queries, writes and anything run 
+    outside of a request go through untouched.
+    """
+    if not has_request_context() or not orm_execute_state.is_select:
+        return None
+    options = orm_execute_state.execution_options
+    if options.get("yield_per") or options.get("stream_results"):
+        return None
+
+    frozen = orm_execute_state.invoke_statement().freeze()
+    g.query_rows = g.get("query_rows", 0) + len(frozen.data)
+    return frozen()
+
+
+def _handle_error(exception_context):
+    """
+    A statement that fails never reaches after_cursor_execute, so drop 
+    the time it started at. Otherwise it would be left on the 
+    connection and taken as the start of the connection's next statement.
+    """
+    conn = exception_context.connection
+    if conn is None or exception_context.execution_context is None:
+        return
+    started = conn.info.get("query_started")
+    if started:
+        started.pop()
+
+
+"""
+Rolling Histograms
+"""
+
+class EndpointHistogram:
+    """
+    Keeps the duration, statement count, database time and rows fetched 
+    of the most recent requests to a single endpoint.
+    """
+
+    def __init__(self, window):
+        self.samples = deque(maxlen = window)
+        self.lock = threading.Lock()
+
+    def add(self, duration, query_count, query_time, query_rows):
+        with self.lock:
+            self.samples.append((duration, query_count, query_time, query_rows))
+
+    def summary(self):
+        """
+        Summarise the recent requests as bucket counts and percentiles.
+        """
+        with self.lock:
+            samples = list(self.samples)
+
+        durations = sorted(sample[0] for sample in samples)
+        query_counts = sorted(sample[1] for sample in samples)
+        query_rows = sorted(sample[3] for sample in samples)
+        duration_buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        query_buckets = [0] * (len(QUERY_BUCKETS) + 1)
+        row_buckets = [0] * (len(ROW_BUCKETS) + 1)
+        for duration, query_count, _, rows in samples:
+            duration_buckets[bisect.bisect_left(DURATION_BUCKETS, duration)] += 1
+            query_buckets[bisect.bisect_left(QUERY_BUCKETS, query_count)] += 1
+            row_buckets[bisect.bisect_left(ROW_BUCKETS, rows)] += 1
+
+        def percentile(values, percent):
+            if not values:
+                return None
+            return values[min(len(values) - 1, int(percent / 100 * len(values)))]
+
+        return {
+            "requests": len(samples),
+            "duration_ms": {
+                "p50": percentile(durations, 50),
+                "p95": percentile(durations, 95),
+                "p99": percentile(durations, 99),
+                "buckets": dict(zip(
+                    [f"<={bound}" for bound in DURATION_BUCKETS] + ["inf"], 
+                    duration_buckets
+                )),
+            },
+            "queries": {
+                "p50": percentile(query_counts, 50),
+                "p95": percentile(query_counts, 95),
+                "max": query_counts[-1] if query_counts else None,
+                "buckets": dict(zip(
+                    [f"<={bound}" for bound in QUERY_BUCKETS] + ["inf"], 
+                    query_buckets
+                )),
+            },
+            "rows": {
+                "p50": percentile(query_rows, 50),
+                "p95": percentile(query_rows, 95),
+                "max": query_rows[-1] if query_rows else None,
+                "buckets": dict(zip(
+                    [f"<={bound}" for bound in ROW_BUCKETS] + ["inf"], 
+                    row_buckets
+                )),
+            },
+            "db_time_ms": round(sum(sample[2] for sample in samples), 3),
+        }
+
+
+class QueryMetrics:
+    """
+    The rolling histograms of every endpoint that has been requested.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.endpoints = {}
+        self.lock = threading.Lock()
+
+    def record(self, endpoint, duration, query_count, query_time, query_rows):
+        with self.lock:
+            histogram = self.endpoints.get(endpoint)
+            if histogram is None:
+                histogram = EndpointHistogram(self.window)
+                self.endpoints[endpoint] = histogram
+        histogram.add(duration, query_count, query_time, query_rows)
+
+    def summary(self):
+        with self.lock:
+            endpoints = dict(self.endpoints)
+        return {
+            endpoint: histogram.summary() 
+            for endpoint, histogram in sorted(endpoints.items())
+        }
+
+
+"""
+Request Hooks
+"""
+
+def register_query_metrics(app):
+    """
+    Attach the statement counting to the database engine, the row 
+    counting to the sessions and the timing headers, histograms and slow 
+    request logging to the Flask app.
+    """
+    app.extensions["query_metrics"] = QueryMetrics(app.config["QUERY_METRICS_WINDOW"])
+
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    if not event.contains(Session, "do_orm_execute", _count_fetched_rows):
+        event.listen(Session, "do_orm_execute", _count_fetched_rows)
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def report_query_metrics(response):
+        """
+        Add the request's database totals to the response headers, the 
+        endpoint's histogram and, if over the thresholds, the log.
+        """
+        duration = (time.perf_counter() - g.request_started) * 1000
+        query_count = g.get("query_count", 0)
+        query_time = g.get("query_time", 0.0) * 1000
+        query_rows = g.get("query_rows", 0)
+        pool_in_use = g.get("pool_in_use", 0)
+        pool_wait = g.get("pool_wait", 0.0)
+
+        response.headers["X-Query-Count"] = str(query_count)
+        response.headers["X-Query-Rows"] = str(query_rows)
+        response.headers["Server-Timing"] = (
+            f'db;dur={query_time:.2f};desc="{query_count} queries, {query_rows} rows", '
+            f'pool;dur={pool_wait:.2f};desc="{pool_in_use} connections in use", '
+            f'app;dur={duration:.2f}'
+        )
+
+        endpoint = request.endpoint or "unmatched"
+        app.extensions["query_metrics"].record(
+            endpoint, 
+            round(duration, 3), 
+            query_count, 
+            query_time, 
+            query_rows
+        )
+
+        if (
+            query_count > app.config["SLOW_REQUEST_QUERY_THRESHOLD"] 
+            or query_time > app.config["SLOW_REQUEST_DB_MS_THRESHOLD"]
+        ):
+            app.logger.warning(
+                "%s %s ran %d queries taking %.1f ms (%d rows)", 
+                request.method, 
+                request.full_path, 
+                query_count, 
+                query_time, 
+                query_rows
+            )
+        return response
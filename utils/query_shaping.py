@@ -0,0 +1,134 @@
+"""
+This file shapes the select statements used by the controllers so 
+that everything a schema is about to serialise is fetched up front. 
+Schemas such as the event and ranking schemas nest the organiser, 
+venue, player and event names, and without eager loading every row 
+serialised fires its own lazy SELECT for each nested object. Reading 
+the Nested fields of the schema and adding the matching loader options 
+keeps a list route at a fixed number of round trips however many rows 
+it returns. Schemas projected to a few fields ('?fields=') also only 
+read the columns they display.
+"""
+
+# Installed import packages
+from marshmallow import fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+
+# Loader options already worked out for each schema instance, the 
+# schemas are created once at import time so this never grows past the 
+# number of schema instances
+_loader_plans = {}
+
+
+def _nested_relationships(model, schema):
+    """
+    Yield each relationship on the model that the schema serialises 
+    through a Nested field, along with the schema used to display it. 
+    Nested fields that do not line up with a relationship on the model 
+    are skipped, marshmallow leaves these out of the dump anyway.
+    """
+    relationships = inspect(model).relationships
+
+    for field_name, field in schema.dump_fields.items():
+        # Only nested objects can trigger lazy loads
+        if isinstance(field, fields.List):
+            field = field.inner
+        if not isinstance(field, fields.Nested):
+            continue
+
+        relationship = relationships.get(field.attribute or field_name)
+        if relationship is not None:
+            yield relationship, field.schema
+
+
+def nested_tables(model, schema):
+    """
+    Return the name of the model's table and of every table the schema 
+    reads nested data from, such as the organisers and venues tables 
+    for the event schema.
+    """
+    tables = {model.__tablename__}
+    for relationship, nested_schema in _nested_relationships(model, schema):
+        tables |= nested_tables(relationship.mapper.class_, nested_schema)
+    return tables
+
+
+def _relationship_loaders(model, schema, parent_loader = None):
+    """
+    Walk the Nested fields of a schema and build a loader option for 
+    every one that maps to a relationship on the model. Many-to-one 
+    relationships (an event's organiser, a ranking's player) are joined 
+    into the same query, while one-to-many collections are fetched with 
+    a single extra SELECT ... WHERE id IN (...) so the joined rows do 
+    not multiply. Nested schemas inside nested schemas are followed too.
+    """
+    loaders = []
+
+    for relationship, nested_schema in _nested_relationships(model, schema):
+        attribute = getattr(model, relationship.key)
+        if relationship.uselist:
+            strategy = selectinload
+        else:
+            strategy = joinedload
+
+        if parent_loader is None:
+            loader = strategy(attribute)
+        else:
+            loader = getattr(parent_loader, strategy.__name__)(attribute)
+
+        loaders.append(loader)
+        loaders.extend(
+            _relationship_loaders(relationship.mapper.class_, nested_schema, loader)
+        )
+    return loaders
+
+
+def _column_loaders(model, schema):
+    """
+    Limit the columns read for the model to the fields displayed by a 
+    schema projected to a set of fields (see sparse_fields.py), along 
+    with the key columns of the nested records it displays. The full 
+    schemas read every column.
+    """
+    if schema.only is None:
+        return []
+
+    names = {field.attribute or name for name, field in schema.dump_fields.items()}
+    key_columns = set()
+    for relationship, _ in _nested_relationships(model, schema):
+        key_columns |= set(relationship.local_columns)
+
+    attributes = [
+        getattr(model, attribute.key) 
+        for attribute in inspect(model).column_attrs 
+        if attribute.key in names or attribute.columns[0] in key_columns
+    ]
+    if not attributes:
+        return []
+    return [load_only(*attributes)]
+
+
+def loader_options(model, schema):
+    """
+    Return the loader options needed to serialise the model with the 
+    given schema without any lazy loading, reading only the columns 
+    the schema displays.
+    """
+    plan = _loader_plans.get(schema)
+    if plan is None:
+        plan = _column_loaders(model, schema) + _relationship_loaders(model, schema)
+        _loader_plans[schema] = plan
+    return plan
+
+
+def eager_load(statement, model, schema):
+    """
+    Add the loader options a schema needs to a select statement, so the 
+    rows come back with their nested objects already populated.
+    """
+    options = loader_options(model, schema)
+    if options:
+        statement = statement.options(*options)
+    return statement
@@ -0,0 +1,287 @@
+"""
+This file calculates the global player ratings from event results. 
+Ratings follow the Elo system: every player starts at 1500 and after 
+each completed event moves towards the score they actually achieved 
+from the score their rating predicted.
+
+The rankings table records each player's wins, losses and ties at an 
+event but not who they played, so each player is rated against the 
+field: their expected score is worked out against the average rating 
+of everyone else at the event, and their actual score is the share of 
+their matches they won (a tie counting as half). The database works 
+out each ranking's match count and score as it reads them, and every 
+event is rated as a whole, one list per column.
+
+Results are always applied in the order the events were held, so a 
+change to one event changes every rating worked out since. Each 
+player's rating after every event is kept in the rating history, so 
+the ratings are replayed from the changed event onwards, starting from 
+each player's rating before it, rather than from the first event ever 
+held. Completing the latest event replays that event alone, while an 
+event completed out of date order, or a change to the results of an 
+event that has already been rated, replays the events from it on.
+"""
+
+# Built-in imports
+from datetime import date
+from itertools import groupby
+
+# Installed import packages
+from sqlalchemy import Float, case, cast, delete, func, insert, select, true, tuple_, update
+
+# Local imports
+from init import db
+from models.event import Event, EventStatus
+from models.ranking import Ranking
+from models.rating import Rating
+from models.rating_history import RatingHistory
+from utils.table_versions import mark_rows_written, mark_written, table_versions
+
+
+STARTING_RATING = 1500.0
+
+# How far a single match can move a rating. New players move faster 
+# until their rating has settled.
+K_FACTOR = 24
+PROVISIONAL_K_FACTOR = 40
+PROVISIONAL_EVENTS = 5
+
+
+def _expected_scores(ratings):
+    """
+    Return the expected score of every player against the average 
+    rating of the rest of the field, worked out in one pass over the 
+    event using the running total of the ratings.
+    """
+    count = len(ratings)
+    if count < 2:
+        return [0.5] * count
+
+    total = sum(ratings)
+    return [
+        1 / (1 + 10 ** (((total - rating) / (count - 1) - rating) / 400))
+        for rating in ratings
+    ]
+
+
+def _rate_event(players, matches, scores, ratings, events_played):
+    """
+    Apply one event's results to the ratings. players, matches and 
+    scores are the columns of the event's rankings, ratings and 
+    events_played are dictionaries keyed by player ID that are updated 
+    in place. Players who played no matches keep their rating but the 
+    event still counts towards their events played.
+    """
+    current = [ratings.get(player_id, STARTING_RATING) for player_id in players]
+    played = [events_played.get(player_id, 0) for player_id in players]
+    expected = _expected_scores(current)
+    k_factors = [
+        PROVISIONAL_K_FACTOR if count < PROVISIONAL_EVENTS else K_FACTOR 
+        for count in played
+    ]
+
+    ratings.update(zip(players, (
+        rating + k_factor * count * (score - expectation) if count else rating
+        for rating, k_factor, count, score, expectation 
+        in zip(current, k_factors, matches, scores, expected)
+    )))
+    events_played.update(zip(players, (count + 1 for count in played)))
+
+
+def _event_order():
+    """
+    The columns events are rated in order of, their date and then their 
+    ID for events held on the same day. Events without a date go first.
+    """
+    return tuple_(func.coalesce(Event.event_date, date.min), Event.event_id)
+
+
+def _completed_rankings_statement(start):
+    """
+    Select the match count and score of every ranking at a completed 
+    event, from the start onwards, in the order the events were held.
+    """
+    wins = func.coalesce(Ranking.wins, 0)
+    ties = func.coalesce(Ranking.ties, 0)
+    matches = wins + func.coalesce(Ranking.losses, 0) + ties
+    score = case(
+        (matches > 0, (cast(wins, Float) + 0.5 * ties) / matches), 
+        else_ = 0.0
+    )
+    return (
+        select(Ranking.event_id, Event.event_date, Ranking.player_id, matches, score)
+        .join(Event, Event.event_id == Ranking.event_id)
+        .where(Event.event_status == EventStatus.Completed, start)
+        .order_by(*_event_order().clauses, Ranking.player_id)
+    )
+
+
+def _ratings_before(start, players):
+    """
+    Return the rating, events played and last event date of each of the 
+    players just before the start, read from their latest history.
+    """
+    latest = (
+        select(
+            RatingHistory.player_id, 
+            RatingHistory.rating, 
+            RatingHistory.events_played, 
+            Event.event_date,
+            func.row_number().over(
+                partition_by = RatingHistory.player_id,
+                order_by = [column.desc() for column in _event_order().clauses]
+            ).label("latest")
+        )
+        .join(Event, Event.event_id == RatingHistory.event_id)
+        .where(~start, RatingHistory.player_id.in_(players))
+        .subquery()
+    )
+    statement = select(
+        latest.c.player_id, 
+        latest.c.rating, 
+        latest.c.events_played, 
+        latest.c.event_date
+    ).where(latest.c.latest == 1)
+    return db.session.execute(statement).all()
+
+
+def _replay_ratings(start_event = None, batch_size = 5000):
+    """
+    Replay the results of every completed event from the start event 
+    onwards, or of every event when none is given, in the current 
+    transaction. The history and ratings of the players at those events 
+    are replaced. The rankings are read as plain rows in batches and 
+    the history is written as the replay goes. Returns the players 
+    whose rating was worked out again.
+    """
+    if start_event is not None:
+        start = _event_order() >= tuple_(start_event.event_date or date.min, start_event.event_id)
+    else:
+        start = true()
+
+    ratings = {}
+    events_played = {}
+    last_played = {}
+    if start_event is None:
+        db.session.execute(delete(Rating))
+        db.session.execute(delete(RatingHistory))
+        player_ids = None
+    else:
+        # The players at the events replayed, or rated at them before 
+        # their results were changed
+        players = (
+            select(Ranking.player_id)
+            .join(Event, Event.event_id == Ranking.event_id)
+            .where(Event.event_status == EventStatus.Completed, start)
+            .union(
+                select(RatingHistory.player_id)
+                .join(Event, Event.event_id == RatingHistory.event_id)
+                .where(start)
+            )
+        )
+        player_ids = list(db.session.scalars(players))
+
+        for player_id, rating, played, event_date in _ratings_before(start, players):
+            ratings[player_id] = rating
+            events_played[player_id] = played
+            last_played[player_id] = event_date
+
+        db.session.execute(
+            delete(Rating)
+            .where(Rating.player_id.in_(players))
+            .execution_options(synchronize_session = False)
+        )
+        db.session.execute(
+            delete(RatingHistory)
+            .where(RatingHistory.event_id.in_(select(Event.event_id).where(start)))
+            .execution_options(synchronize_session = False)
+        )
+
+    # Replay each event's results in the order they were played, 
+    # writing down every player's rating after each event
+    history = []
+    statement = _completed_rankings_statement(start).execution_options(yield_per = batch_size)
+    rows = db.session.execute(statement)
+    for (event_id, event_date), event_rankings in groupby(rows, key = lambda row: row[:2]):
+        _, _, players, matches, scores = zip(*event_rankings)
+        _rate_event(players, matches, scores, ratings, events_played)
+        last_played.update((player_id, event_date) for player_id in players)
+        history.extend({
+            "event_id": event_id,
+            "player_id": player_id,
+            "rating": ratings[player_id],
+            "events_played": events_played[player_id],
+        } for player_id in players)
+        if len(history) >= batch_size:
+            db.session.execute(insert(RatingHistory), history)
+            history = []
+    if history:
+        db.session.execute(insert(RatingHistory), history)
+
+    # Save the new ratings, players left without any rated event have 
+    # their rating removed
+    rows = [{
+        "player_id": player_id,
+        "rating": rating,
+        "events_played": events_played[player_id],
+        "last_event_date": last_played.get(player_id),
+    } for player_id, rating in ratings.items()]
+    for first in range(0, len(rows), batch_size):
+        db.session.execute(insert(Rating), rows[first:first + batch_size])
+
+    # Every completed event replayed has now been counted
+    changed = db.session.scalars(
+        update(Event)
+        .where(start, Event.ratings_applied != (Event.event_status == EventStatus.Completed))
+        .values(ratings_applied = Event.event_status == EventStatus.Completed)
+        .returning(Event.event_id)
+        .execution_options(synchronize_session = False)
+    ).all()
+
+    # Once most players have been replayed, moving on the version of 
+    # each of them costs more than moving on the whole table
+    if player_ids is None or len(player_ids) > table_versions.batch_size:
+        mark_written(db.session, Rating.__tablename__, Event.__tablename__)
+        return player_ids or list(ratings)
+    mark_rows_written(db.session, Rating.__tablename__, player_id = player_ids)
+    mark_rows_written(db.session, Event.__tablename__, event_id = changed)
+    return player_ids
+
+
+def rebuild_ratings(batch_size = 5000):
+    """
+    Work out every player's rating from scratch by replaying the results 
+    of every completed event in date order, and commit them. Returns 
+    the number of players rated.
+    """
+    _replay_ratings(batch_size = batch_size)
+    db.session.commit()
+    return db.session.scalar(select(func.count()).select_from(Rating))
+
+
+def apply_event_ratings(event):
+    """
+    Count the results of a newly completed event towards the ratings. 
+    The events from this one onwards are replayed, which is just this 
+    event unless a later event has already been rated, so results are 
+    always applied in date order. The changes are committed by the 
+    caller.
+    """
+    if event.ratings_applied:
+        return
+
+    _replay_ratings(event)
+    event.ratings_applied = True
+
+
+def refresh_ratings(event_id):
+    """
+    Bring the ratings up to date after an event's rankings were added 
+    to or changed. Nothing needs doing until the event has been rated, 
+    as its results are counted once it is completed, but the events 
+    from a rated event onwards are replayed with its new results. The 
+    changes are committed by the caller.
+    """
+    event = db.session.get(Event, event_id)
+    if event is not None and event.ratings_applied:
+        _replay_ratings(event)
@@ -0,0 +1,210 @@
+"""
+This file caches the responses of the read (GET) routes. Card, deck, 
+venue and organiser data is read far more often than it is written, so 
+once a response has been built it is kept and handed straight back on 
+the next identical request without touching the database or the 
+schemas.
+
+Each blueprint declares which tables its responses are built from. A 
+response is stored against the current version of those tables (see 
+table_versions.py), so as soon as a commit writes to one of them the 
+stored copy can no longer be found and is left for the least recently 
+used eviction to clean up.
+
+Responses are stored uncompressed, along with a compressed copy of the 
+body for each encoding clients have asked for since.
+"""
+
+# Built-in imports
+import threading
+import time
+from collections import OrderedDict
+
+# Installed import packages
+from flask import current_app, g, request
+
+# Local imports
+from utils.query_shaping import nested_tables
+from utils.table_versions import request_versions
+
+
+"""
+Cache Backends
+"""
+
+class NullCache:
+    """
+    A cache that never stores anything, used to switch response 
+    caching off without changing any of the routes.
+    """
+
+    @classmethod
+    def from_config(cls, config):
+        return cls()
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LRUCache:
+    """
+    An in-process cache holding up to a fixed number of entries. When 
+    it is full the least recently used entry is evicted, and entries 
+    older than the time to live are treated as missing.
+    """
+
+    def __init__(self, max_entries = 1024, ttl = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            max_entries = config["RESPONSE_CACHE_MAX_ENTRIES"],
+            ttl = config["RESPONSE_CACHE_TTL"]
+        )
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            # Expired entries are removed as they are found
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            # Mark this entry as the most recently used
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            # Evict the least recently used entries once over the limit
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last = False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# The cache backends that can be selected with RESPONSE_CACHE_BACKEND
+CACHE_BACKENDS = {
+    "lru": LRUCache,
+    "none": NullCache,
+}
+
+
+def init_response_cache(app):
+    """
+    Create the cache backend chosen in the app configuration and attach 
+    it to the Flask app.
+    """
+    backend = CACHE_BACKENDS[app.config["RESPONSE_CACHE_BACKEND"]]
+    app.extensions["response_cache"] = backend.from_config(app.config)
+
+
+"""
+Blueprint Hooks
+"""
+
+def _cache_key(model, tables, filters):
+    """
+    Build the key a response is stored under. Two requests share a key 
+    only when they ask for the same URL in the same format while the 
+    tables behind the response are at the same versions.
+    """
+    return (
+        request.full_path,
+        request.headers.get("Accept", ""),
+        request_versions(model, tables, filters)
+    )
+
+
+def blueprint_tables(model, schema, extra_tables = ()):
+    """
+    Return the tables the responses of a blueprint are built from. These 
+    are worked out from the model and the nested fields of its schema, 
+    any other tables read by the routes can be added with extra_tables.
+    """
+    return tuple(sorted(nested_tables(model, schema) | set(extra_tables)))
+
+
+def cache_blueprint(blueprint, model, schema, filters = (), extra_tables = ()):
+    """
+    Cache the GET responses of every route in a blueprint. The filters 
+    are the key columns the list route can be narrowed down by through 
+    the query string, such as '?event_id='.
+    """
+    tables = blueprint_tables(model, schema, extra_tables)
+
+    @blueprint.before_request
+    def serve_cached_response():
+        """
+        Hand back a stored copy of the response if there is one, 
+        skipping the database and serialisation entirely.
+        """
+        if request.method != "GET":
+            return None
+
+        # Clients can ask to skip the cache for a fresh copy
+        g.response_cache_key = _cache_key(model, tables, filters)
+        if "no-cache" in request.headers.get("Cache-Control", ""):
+            return None
+
+        cached = current_app.extensions["response_cache"].get(g.response_cache_key)
+        if cached is None:
+            return None
+
+        # The compression hook reuses any compressed copies of the body
+        # stored with it (see compression.py)
+        g.response_cache_hit = True
+        g.response_cache_entry = cached
+        response = current_app.response_class(
+            cached["body"], 
+            status = cached["status"], 
+            headers = cached["headers"]
+        )
+        response.headers["X-Cache"] = "HIT"
+        return response
+
+    @blueprint.after_request
+    def store_response(response):
+        """
+        Keep a copy of each successful GET response that was built 
+        from scratch.
+        """
+        cache_key = g.get("response_cache_key")
+        if (
+            cache_key is None 
+            or g.get("response_cache_hit") 
+            or response.status_code != 200 
+            or response.is_streamed
+        ):
+            return response
+
+        # Compressed copies of the body are added to 'encoded' by the
+        # compression hook as clients ask for them
+        g.response_cache_entry = {
+            "body": response.get_data(),
+            "status": response.status_code,
+            "headers": list(response.headers.items()),
+            "encoded": {}
+        }
+        current_app.extensions["response_cache"].set(cache_key, g.response_cache_entry)
+        response.headers["X-Cache"] = "MISS"
+        return response
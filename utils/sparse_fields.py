@@ -0,0 +1,97 @@
+"""
+This file lets clients ask the read routes for only the fields they
+need. '?fields=card_id,card_name' limits the columns displayed, and
+'?include=organiser,venue' picks which nested records are displayed
+along with them:
+    - Neither given: every field and nested record, as before
+    - Only fields given: those fields and no nested records
+    - Only include given: every field and only those nested records
+
+The controllers display their results with a projected copy of their
+schema limited to the requested fields. The select statement is then
+narrowed to match when it is shaped with eager_load, reading only the
+requested columns and skipping the joins for nested records that are
+not displayed.
+"""
+
+# Installed import packages
+from flask import abort, request
+from marshmallow import fields
+
+
+# Projected schemas already built, by the schema they were projected
+# from and the requested field names. The names are checked against the
+# schema before a projection is built, so this can only ever hold the
+# combinations of fields the schemas actually have.
+_projections = {}
+
+
+def _field_names(schema):
+    """
+    Return the names of the plain fields and of the nested fields a
+    schema displays, in the order it displays them.
+    """
+    plain = []
+    nested = []
+    for name, field in schema.dump_fields.items():
+        if isinstance(field, fields.List):
+            field = field.inner
+        if isinstance(field, fields.Nested):
+            nested.append(name)
+        else:
+            plain.append(name)
+    return plain, nested
+
+
+def _requested_names(parameter, available):
+    """
+    Read a comma separated list of field names from a query parameter,
+    or None when the parameter was not given. Names the schema does not
+    have are rejected with a 400 Bad Request.
+    """
+    value = request.args.get(parameter)
+    if value is None:
+        return None
+
+    names = frozenset(name.strip() for name in value.split(",") if name.strip())
+    unknown = sorted(names - set(available))
+    if unknown:
+        abort(
+            400,
+            description =
+            f"Unknown {parameter}: {', '.join(unknown)}. "
+            f"Choose from: {', '.join(available) or 'none'}."
+        )
+    return names
+
+
+def projected_schema(schema):
+    """
+    Return the schema to display the current request's results with.
+    This is the given schema itself unless the request asked for
+    particular fields, in which case it is a copy limited to them.
+    """
+    plain, nested = _field_names(schema)
+    requested_fields = _requested_names("fields", plain)
+    requested_include = _requested_names("include", nested)
+
+    if requested_fields is None and requested_include is None:
+        return schema
+    if requested_fields is None:
+        requested_fields = frozenset(plain)
+    elif not requested_fields:
+        abort(400, description = "At least one field must be requested.")
+    if requested_include is None:
+        requested_include = frozenset()
+
+    key = (schema, requested_fields, requested_include)
+    projected = _projections.get(key)
+    if projected is None:
+        # Keep the field order the schema displays them in
+        only = [
+            name for name in schema.dump_fields
+            if name in requested_fields or name in requested_include
+        ]
+        projected = schema.__class__(only = only, many = schema.many)
+        _projections[key] = projected
+    return projected
@@ -0,0 +1,218 @@
+"""
+This file keeps each event's leaderboard (the standings table) up to 
+date with its rankings. Rather than sorting every ranking of an event 
+each time the leaderboard is read, the order is worked out when a 
+ranking is written and stored as each player's position.
+
+Writing a single result only recalculates the record of the players 
+involved. Their entries are taken out of the already sorted leaderboard 
+and put back in their new places, and only the rows whose position 
+actually moved are updated.
+
+Positions are worked out from the whole leaderboard, so two results 
+written to the same event at once would each move players around their 
+own copy of it and overwrite each other's positions. The event's row is 
+locked while its leaderboard is updated, so results for one event take 
+turns and each sees the positions written by the one before. Results 
+for different events never wait on each other.
+
+Players are ordered by:
+    1. Points
+    2. Opponent win percentage (once rounds have been recorded)
+    3. Match win percentage
+    4. Player ID, so the order is always the same
+"""
+
+# Built-in imports
+import bisect
+
+# Installed import packages
+from sqlalchemy.orm.attributes import flag_modified
+
+# Local imports
+from init import db
+from models.event import Event
+from models.ranking import Ranking
+from models.standing import Standing
+from schemas.standing_schema import standings_schema
+from utils.query_shaping import eager_load
+
+
+# The lowest match win percentage counted, so a player who drops out 
+# early does not drag their opponents' tie-breakers down too far
+MIN_MATCH_WIN_PCT = 1 / 3
+
+# Columns written back for every recalculated standing, even those that 
+# did not change, so a batch of standings is sent as one multi-row 
+# UPDATE rather than split up by which columns each row changed
+RECORD_COLUMNS = (
+    "position", 
+    "points", 
+    "wins", 
+    "losses", 
+    "ties", 
+    "match_win_pct", 
+    "opponent_win_pct"
+)
+
+
+def match_win_pct(points, wins, losses, ties):
+    """
+    The share of the available match points (3 per match) a player has 
+    won, never lower than a third once they have played.
+    """
+    matches = wins + losses + ties
+    if matches == 0:
+        return 0.0
+    return max(points / (3 * matches), MIN_MATCH_WIN_PCT)
+
+
+def leaderboard_key(standing):
+    """
+    The sort key of a standing, the leaders sort first.
+    """
+    return (
+        -standing.points,
+        -(standing.opponent_win_pct or 0),
+        -standing.match_win_pct,
+        standing.player_id
+    )
+
+
+def _copy_record(standing, ranking):
+    """
+    Copy a player's record from their ranking onto their standing.
+    """
+    standing.points = ranking.points or 0
+    standing.wins = ranking.wins or 0
+    standing.losses = ranking.losses or 0
+    standing.ties = ranking.ties or 0
+    standing.match_win_pct = match_win_pct(
+        standing.points, 
+        standing.wins, 
+        standing.losses, 
+        standing.ties
+    )
+
+
+def update_standings(event_id, player_ids, opponent_win_pcts = None):
+    """
+    Recalculate the standings of the given players at an event after 
+    their rankings were created, changed or removed, and move them to 
+    their new places on the leaderboard. Opponent win percentages can 
+    be given for the players once the event's matches are known. The 
+    changes are added to the current session for the caller to commit 
+    along with the rankings.
+    """
+    player_ids = set(player_ids)
+
+    # Take the event's leaderboard lock before reading it, so the 
+    # leaderboard and rankings read below include every result written 
+    # before ours
+    db.session.execute(
+        db.select(Event.event_id)
+        .where(Event.event_id == event_id)
+        .with_for_update()
+    )
+
+    # The current leaderboard, already in order
+    statement = (
+        db.select(Standing)
+        .where(Standing.event_id == event_id)
+        .order_by(Standing.position)
+    )
+    leaderboard = list(db.session.scalars(statement))
+    standings = {standing.player_id: standing for standing in leaderboard}
+
+    # The latest records of the players that changed
+    statement = db.select(Ranking).where(
+        Ranking.event_id == event_id, 
+        Ranking.player_id.in_(player_ids)
+    )
+    rankings = {ranking.player_id: ranking for ranking in db.session.scalars(statement)}
+
+    # Take the changed players out of the leaderboard
+    order = [
+        standing for standing in leaderboard 
+        if standing.player_id not in player_ids
+    ]
+
+    for player_id in player_ids:
+        standing = standings.get(player_id)
+        ranking = rankings.get(player_id)
+
+        # The player no longer has a ranking at this event
+        if ranking is None:
+            if standing is not None:
+                db.session.delete(standing)
+            continue
+
+        if standing is None:
+            standing = Standing(event_id = event_id, player_id = player_id, position = 0)
+            db.session.add(standing)
+        else:
+            for column in RECORD_COLUMNS:
+                flag_modified(standing, column)
+        _copy_record(standing, ranking)
+        if opponent_win_pcts is not None:
+            standing.opponent_win_pct = opponent_win_pcts.get(player_id)
+
+        # Put the player back in their new place
+        bisect.insort(order, standing, key = leaderboard_key)
+
+    # Only the rows that moved are written back
+    for position, standing in enumerate(order, 1):
+        if standing.position != position:
+            standing.position = position
+
+
+def refresh_standings(event_id, player_ids):
+    """
+    Recalculate the standings of the given players at an event after 
+    rankings were written without the ORM, building the whole 
+    leaderboard instead if the event does not have one yet.
+    """
+    statement = db.select(Standing.player_id).where(Standing.event_id == event_id).limit(1)
+    if db.session.scalar(statement) is None:
+        rebuild_standings(event_id)
+    else:
+        update_standings(event_id, player_ids)
+
+
+def rebuild_standings(event_id):
+    """
+    Work out an event's whole leaderboard from its rankings, used the 
+    first time an event's standings are read and after rankings have 
+    been written without going through update_standings.
+    """
+    statement = db.select(Ranking.player_id).where(Ranking.event_id == event_id)
+    ranked_players = set(db.session.scalars(statement))
+    statement = db.select(Standing.player_id).where(Standing.event_id == event_id)
+    standing_players = set(db.session.scalars(statement))
+    update_standings(event_id, ranked_players | standing_players)
+
+
+def event_standings(event_id):
+    """
+    Return an event's leaderboard in position order, building it from 
+    the rankings if it has not been built before.
+    """
+    statement = (
+        db.select(Standing)
+        .where(Standing.event_id == event_id)
+        .order_by(Standing.position)
+    )
+    statement = eager_load(statement, Standing, standings_schema)
+    standings = list(db.session.scalars(statement))
+    if standings:
+        return standings
+
+    # Build the leaderboard once if the event has rankings
+    has_rankings = db.session.scalar(
+        db.select(Ranking.player_id).where(Ranking.event_id == event_id).limit(1)
+    )
+    if has_rankings is None:
+        return []
+    rebuild_standings(event_id)
+    db.session.commit()
+    return list(db.session.scalars(statement))
@@ -0,0 +1,92 @@
+"""
+This file lets the list routes stream their results instead of 
+building the whole response in memory first. The rows are read from 
+the database in batches, serialised one at a time and sent to the 
+client as they are ready, so a full export of the cards or rankings 
+tables uses a small, fixed amount of memory per worker and the first 
+bytes leave the server straight away.
+
+Streaming is opt in. Clients ask for it with either:
+    - 'Accept: application/x-ndjson' for one JSON record per line, or
+    - '?stream=1' for a regular JSON list sent in chunks.
+"""
+
+# Installed import packages
+from flask import current_app, request, stream_with_context
+
+# Local imports
+from init import db
+from utils.pagination import primary_key_columns
+from utils.fast_dump import fast_dump
+
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def wants_ndjson():
+    """
+    Check whether the client prefers newline delimited JSON over a 
+    regular JSON response.
+    """
+    best = request.accept_mimetypes.best_match(
+        ["application/json", NDJSON_MIMETYPE]
+    )
+    return best == NDJSON_MIMETYPE
+
+
+def wants_stream():
+    """
+    Check whether the client has asked for the results to be streamed.
+    """
+    stream = request.args.get("stream", "").lower()
+    return stream in ("1", "true", "yes") or wants_ndjson()
+
+
+def _stream_rows(statement, schema):
+    """
+    Run the statement and serialise its rows one at a time. The rows are 
+    fetched from the database in batches of STREAM_BATCH_SIZE rather 
+    than all at once.
+    """
+    batch_size = current_app.config["STREAM_BATCH_SIZE"]
+    statement = statement.execution_options(yield_per = batch_size)
+    for row in db.session.scalars(statement):
+        yield fast_dump(schema, row, many = False)
+
+
+def stream_response(statement, model, schema):
+    """
+    Return a streamed response holding every row the statement selects, 
+    ordered by the model's primary key. Newline delimited JSON is sent 
+    when the client accepts it, otherwise a JSON list is sent in chunks.
+    """
+    statement = statement.order_by(*primary_key_columns(model))
+
+    def dumps(record):
+        # Match the compact separators used by jsonify
+        return current_app.json.dumps(record, separators = (",", ":"))
+
+    def generate_ndjson():
+        for record in _stream_rows(statement, schema):
+            yield dumps(record) + "\n"
+
+    def generate_json_list():
+        separator = "["
+        for record in _stream_rows(statement, schema):
+            yield separator + dumps(record)
+            separator = ","
+
+        # Close the list, or send an empty one if there were no rows
+        yield "]" if separator == "," else "[]"
+
+    if wants_ndjson():
+        generator, mimetype = generate_ndjson, NDJSON_MIMETYPE
+    else:
+        generator, mimetype = generate_json_list, "application/json"
+
+    # Keep the request (and its database session) open until the last 
+    # row has been sent
+    return current_app.response_class(
+        stream_with_context(generator()), 
+        mimetype = mimetype
+    )
@@ -0,0 +1,389 @@
+"""
+This file pairs the rounds of a running event using the Swiss system
+and records their results. Each round, players are matched against
+others on the same number of points without ever meeting the same
+opponent twice, and an odd player out is given a bye.
+
+Pairing is a single pass over the players in standings order rather
+than a search of every possible set of matches:
+    1. The lowest placed player who has not had a bye yet gets the bye.
+    2. Within each group of players on the same points, the top half
+       is paired against the bottom half (seeded by points then
+       rating), and an odd player out floats down to the next group.
+    3. Each player takes the closest player below them they have not
+       played before.
+    4. A player left without a new opponent swaps into an earlier
+       match instead, and a rematch is only made if no swap works.
+
+A player can only run out of new opponents once the players left are
+no more than the rounds played, so step 4 only ever searches a handful
+of players and a round of 1,024 players is paired in milliseconds.
+
+Results are written straight onto the players' rankings, and the event
+standings are updated with each player's opponent win percentage.
+"""
+
+# Installed import packages
+from sqlalchemy import and_, func, insert
+from sqlalchemy.orm.attributes import flag_modified
+
+# Local imports
+from init import db
+from models.event import EventStatus
+from models.pairing import MatchResult, Pairing
+from models.ranking import Ranking
+from models.rating import Rating
+from models.registration import Registration
+from utils.ratings import STARTING_RATING
+from utils.standings import match_win_pct, update_standings
+from utils.table_versions import mark_written
+
+
+# Match points for each result, a bye counts as a win
+WIN_POINTS = 3
+TIE_POINTS = 1
+
+# Columns written back for every ranking a result touches, so a round
+# of results is sent as one multi-row UPDATE rather than split up by
+# which columns each row changed
+RECORD_COLUMNS = ("points", "wins", "losses", "ties")
+
+
+"""
+Pairing
+"""
+
+def _fold_score_groups(players, points):
+    """
+    Reorder the players so pairing each one with the next matches the
+    top half of every points group against its bottom half. Players
+    must already be in standings order.
+    """
+    order = []
+    group = []
+    for player in players:
+        if group and points[player] != points[group[0]]:
+            order.extend(_fold(group))
+            group = []
+        group.append(player)
+    order.extend(_fold(group))
+    return order
+
+
+def _fold(group):
+    """
+    Interleave the top and bottom halves of a points group, leaving an
+    odd player out last so they float down to the next group.
+    """
+    half = len(group) // 2
+    order = []
+    for top, bottom in zip(group[:half], group[half:2 * half]):
+        order.extend((top, bottom))
+    order.extend(group[2 * half:])
+    return order
+
+
+def _swap_into_match(player, remaining, pairs, opponents):
+    """
+    Find an earlier match the player can join, giving the player they
+    replace a new opponent from the players still waiting. The match
+    list is updated in place and the new opponent returned, or None if
+    no swap avoids a rematch.
+    """
+    for index in range(len(pairs) - 1, -1, -1):
+        first, second = pairs[index]
+        for other in remaining:
+            if other == player:
+                continue
+            if first not in opponents[player] and second not in opponents[other]:
+                pairs[index] = (first, player)
+                pairs.append((second, other))
+                return other
+            if second not in opponents[player] and first not in opponents[other]:
+                pairs[index] = (second, player)
+                pairs.append((first, other))
+                return other
+    return None
+
+
+def pair_round(players, points, opponents, had_bye):
+    """
+    Pair the next round of an event.
+        - players: Player IDs in standings order, leaders first
+        - points: Each player's match points so far
+        - opponents: Each player's set of previous opponents
+        - had_bye: Players that have already been given a bye
+    Returns the matches as (player one, player two) tuples in table
+    order, and the player given the bye (or None).
+    """
+    players = list(players)
+
+    # The lowest placed player who has not had a bye sits this round out
+    bye = None
+    if len(players) % 2:
+        bye = next(
+            (player for player in reversed(players) if player not in had_bye),
+            players[-1]
+        )
+        players.remove(bye)
+
+    seeding = {player: position for position, player in enumerate(players)}
+    remaining = _fold_score_groups(players, points)
+    pairs = []
+
+    while remaining:
+        player = remaining.pop(0)
+
+        # The closest player below who has not been played before
+        opponent = next(
+            (other for other in remaining if other not in opponents[player]),
+            None
+        )
+        if opponent is not None:
+            remaining.remove(opponent)
+            pairs.append((player, opponent))
+            continue
+
+        # Otherwise swap into an earlier match, and only as a last
+        # resort play someone again
+        opponent = _swap_into_match(player, remaining, pairs, opponents)
+        if opponent is None:
+            opponent = remaining[0]
+            pairs.append((player, opponent))
+        remaining.remove(opponent)
+
+    # Seat the higher placed player first and the leaders on table 1
+    pairs = [
+        tuple(sorted(pair, key = seeding.__getitem__))
+        for pair in pairs
+    ]
+    pairs.sort(key = lambda pair: seeding[pair[0]])
+    return pairs, bye
+
+
+"""
+Results
+"""
+
+def _outcomes(pairing):
+    """
+    The (player ID, wins, losses, ties) each seat earns from a
+    pairing's result.
+    """
+    one, two = pairing.player_one_id, pairing.player_two_id
+    if pairing.result == MatchResult.Bye:
+        return [(one, 1, 0, 0)]
+    if pairing.result == MatchResult.Draw:
+        return [(one, 0, 0, 1), (two, 0, 0, 1)]
+    if pairing.result == MatchResult.PlayerOne:
+        return [(one, 1, 0, 0), (two, 0, 1, 0)]
+    if pairing.result == MatchResult.PlayerTwo:
+        return [(one, 0, 1, 0), (two, 1, 0, 0)]
+    return []
+
+
+def _apply_result(rankings, event_id, pairing, sign):
+    """
+    Add (sign 1) or take back (sign -1) a pairing's result on the
+    players' rankings, creating a ranking for a player's first result.
+    """
+    for player_id, wins, losses, ties in _outcomes(pairing):
+        ranking = rankings.get(player_id)
+        if ranking is None:
+            ranking = Ranking(
+                event_id = event_id,
+                player_id = player_id,
+                points = 0,
+                wins = 0,
+                losses = 0,
+                ties = 0
+            )
+            db.session.add(ranking)
+            rankings[player_id] = ranking
+        ranking.wins += sign * wins
+        ranking.losses += sign * losses
+        ranking.ties += sign * ties
+        ranking.points += sign * (wins * WIN_POINTS + ties * TIE_POINTS)
+        for column in RECORD_COLUMNS:
+            flag_modified(ranking, column)
+
+
+def _refresh_standings(event_id, rankings, pairings):
+    """
+    Work out every player's opponent win percentage from the matches
+    played so far and update the event's leaderboard.
+    """
+    win_pcts = {
+        player_id: match_win_pct(
+            ranking.points or 0,
+            ranking.wins or 0,
+            ranking.losses or 0,
+            ranking.ties or 0
+        )
+        for player_id, ranking in rankings.items()
+    }
+
+    # Byes have no opponent and unreported matches do not count yet
+    opponents = {}
+    for pairing in pairings:
+        if pairing.player_two_id is None or pairing.result is None:
+            continue
+        opponents.setdefault(pairing.player_one_id, []).append(pairing.player_two_id)
+        opponents.setdefault(pairing.player_two_id, []).append(pairing.player_one_id)
+
+    opponent_win_pcts = {
+        player_id: sum(win_pcts.get(other, 0) for other in played) / len(played)
+        for player_id, played in opponents.items()
+    }
+    update_standings(event_id, rankings.keys(), opponent_win_pcts)
+
+
+def _event_rankings(event_id):
+    """
+    Every ranking at the event by player ID.
+    """
+    statement = db.select(Ranking).where(Ranking.event_id == event_id)
+    return {ranking.player_id: ranking for ranking in db.session.scalars(statement)}
+
+
+def _event_pairings(event_id):
+    """
+    Every pairing made at the event so far, in round and table order.
+    """
+    statement = (
+        db.select(Pairing)
+        .where(Pairing.event_id == event_id)
+        .order_by(Pairing.round_number, Pairing.table_number)
+    )
+    return list(db.session.scalars(statement))
+
+
+def pair_next_round(event):
+    """
+    Pair the next round of a running event from its registrations and
+    the results so far, and write the pairings in the current
+    transaction for the caller to commit. A bye is recorded as a win
+    straight away. Returns the new round's number, or raises a
+    ValueError if the event cannot be paired yet.
+    """
+    if event.event_status != EventStatus.Running:
+        raise ValueError("Only running events can be paired.")
+
+    pairings = _event_pairings(event.event_id)
+    if any(pairing.result is None for pairing in pairings):
+        raise ValueError("Every result of the current round must be reported first.")
+
+    # The registered players seeded by their points so far, then
+    # their rating
+    statement = (
+        db.select(
+            Registration.player_id,
+            func.coalesce(Ranking.points, 0),
+            func.coalesce(Rating.rating, STARTING_RATING)
+        )
+        .outerjoin(
+            Ranking,
+            and_(
+                Ranking.event_id == Registration.event_id,
+                Ranking.player_id == Registration.player_id
+            )
+        )
+        .outerjoin(Rating, Rating.player_id == Registration.player_id)
+        .where(Registration.event_id == event.event_id)
+    )
+    seeds = db.session.execute(statement).all()
+    if len(seeds) < 2:
+        raise ValueError("At least two players must be registered to pair a round.")
+    seeds.sort(key = lambda seed: (-seed[1], -seed[2], seed[0]))
+    players = [seed[0] for seed in seeds]
+    points = {seed[0]: seed[1] for seed in seeds}
+
+    # Who everyone has played and who has already sat a round out
+    opponents = {player: set() for player in players}
+    had_bye = set()
+    for pairing in pairings:
+        if pairing.player_two_id is None:
+            had_bye.add(pairing.player_one_id)
+            continue
+        opponents.setdefault(pairing.player_one_id, set()).add(pairing.player_two_id)
+        opponents.setdefault(pairing.player_two_id, set()).add(pairing.player_one_id)
+
+    pairs, bye = pair_round(players, points, opponents, had_bye)
+
+    # Seat the new round, the bye taking the last table, and write
+    # every match in one multi-row INSERT
+    round_number = max((pairing.round_number for pairing in pairings), default = 0) + 1
+    rows = [
+        {
+            "event_id": event.event_id,
+            "round_number": round_number,
+            "table_number": table_number,
+            "player_one_id": player_one,
+            "player_two_id": player_two,
+            "result": None
+        }
+        for table_number, (player_one, player_two) in enumerate(pairs, 1)
+    ]
+    if bye is not None:
+        rows.append({
+            "event_id": event.event_id,
+            "round_number": round_number,
+            "table_number": len(pairs) + 1,
+            "player_one_id": bye,
+            "player_two_id": None,
+            "result": MatchResult.Bye
+        })
+    db.session.execute(insert(Pairing), rows)
+    mark_written(db.session, Pairing.__tablename__)
+
+    # Count the bye straight away
+    if bye is not None:
+        rankings = _event_rankings(event.event_id)
+        pairings = _event_pairings(event.event_id)
+        _apply_result(rankings, event.event_id, pairings[-1], 1)
+        _refresh_standings(event.event_id, rankings, pairings)
+
+    return round_number
+
+
+def record_results(event, round_number, results):
+    """
+    Record a batch of match results for a round of a running event and
+    add the changes to the players' rankings and the standings to the
+    session for the caller to commit. Each result is a dictionary with
+    the table number and the result. A result reported again replaces
+    the earlier one. Returns the number of results recorded and the
+    problems with the rest by their position in the batch.
+    """
+    if event.event_status != EventStatus.Running:
+        raise ValueError("Results can only be recorded for running events.")
+
+    pairings = _event_pairings(event.event_id)
+    tables = {
+        pairing.table_number: pairing
+        for pairing in pairings if pairing.round_number == round_number
+    }
+    if not tables:
+        raise ValueError(f"Round {round_number} has not been paired.")
+
+    rankings = _event_rankings(event.event_id)
+    recorded = 0
+    errors = {}
+    for index, entry in enumerate(results):
+        pairing = tables.get(entry["table_number"])
+        if pairing is None:
+            errors[index] = f"Table {entry['table_number']} is not in round {round_number}."
+            continue
+        if pairing.player_two_id is None:
+            errors[index] = "Byes are recorded when the round is paired."
+            continue
+
+        # Swap the earlier result for the new one
+        _apply_result(rankings, event.event_id, pairing, -1)
+        pairing.result = entry["result"]
+        _apply_result(rankings, event.event_id, pairing, 1)
+        recorded += 1
+
+    if recorded:
+        _refresh_standings(event.event_id, rankings, pairings)
+    return recorded, errors
@@ -0,0 +1,393 @@
+"""
+This file generates large amounts of realistic, made up data across 
+every table for load testing and benchmarking. The data is consistent 
+with itself, so every decklist points at real decks and cards, every 
+registration uses a deck from the player's own collection and every 
+ranking belongs to a player registered at a completed or running event.
+
+Rows are written with batched executemany INSERT statements rather than 
+through the ORM, and the same seed always produces the same data so 
+benchmark databases can be rebuilt exactly. Event dates are spread 
+around a fixed reference date rather than the day the data is made, 
+so a data set rebuilt on another day is the same too.
+"""
+
+# Built-in imports
+import math
+import random
+from datetime import date, timedelta
+
+# Installed import packages
+from sqlalchemy import insert
+
+# Local imports
+from init import db
+from models.card import Card, CardRarity, CardType
+from models.deck import Deck
+from models.player import Player
+from models.organiser import Organiser
+from models.venue import Venue
+from models.decklist import Decklist
+from models.collection import Collection
+from models.event import Event, EventStatus
+from models.registration import Registration
+from models.ranking import Ranking
+from utils.table_versions import mark_written
+from utils.admission import recount_registrations
+
+
+"""
+Distributions
+"""
+
+# How often each card type and rarity is printed in a set
+CARD_TYPE_WEIGHTS = {
+    CardType.Digimon: 60,
+    CardType.Option: 15,
+    CardType.Tamer: 15,
+    CardType.Digiegg: 10,
+}
+CARD_RARITY_WEIGHTS = {
+    CardRarity.Common: 45,
+    CardRarity.Uncommon: 30,
+    CardRarity.Rare: 15,
+    CardRarity.SuperRare: 7,
+    CardRarity.SecretRare: 3,
+}
+
+# Events are mostly locals with the odd large regional
+PLAYER_CAP_WEIGHTS = {16: 30, 32: 30, 64: 20, 128: 12, 256: 6, 512: 2}
+
+# Main decks are 50 cards with at most 4 copies of each card
+DECK_SIZE = 50
+MAX_COPIES = 4
+
+# The day the events are spread around, and which decides whether an 
+# event has been completed, is running or is still to come
+REFERENCE_DATE = date(2025, 10, 1)
+
+# Spread of events around the reference date, in days
+EVENT_DAYS_BEFORE = 3 * 365
+EVENT_DAYS_AFTER = 180
+
+NAME_PARTS = (
+    "Agu", "Gabu", "Pata", "Tento", "Goma", "Pal", "Piyo", "Tera", 
+    "Guil", "Renamon", "Impmon", "Veemon", "Hawk", "Arma", "Worm", 
+    "Greymon", "Garuru", "Angemon", "Kabuteri", "Ikkaku", "Lillymon"
+)
+
+
+def _weighted_choice(generator, weights):
+    """
+    Pick one key of the weights dictionary, in proportion to its weight.
+    """
+    return generator.choices(list(weights), weights = list(weights.values()))[0]
+
+
+def _name(generator, index):
+    """
+    Make a readable name that stays unique through its index.
+    """
+    return f"{generator.choice(NAME_PARTS)}{generator.choice(NAME_PARTS).lower()} {index}"
+
+
+"""
+Batched Writes
+"""
+
+def _insert_returning_ids(model, rows, batch_size):
+    """
+    Insert the rows in batches and return their new primary keys in the 
+    same order the rows were given.
+    """
+    key = getattr(model, model.__mapper__.primary_key[0].key)
+    ids = []
+    for start in range(0, len(rows), batch_size):
+        statement = insert(model).returning(key, sort_by_parameter_order = True)
+        ids.extend(db.session.scalars(statement, rows[start:start + batch_size]))
+    db.session.commit()
+    return ids
+
+
+class _BatchWriter:
+    """
+    Collects rows for a table without generated keys and writes them in 
+    executemany batches, so the full set never has to sit in memory.
+    """
+
+    def __init__(self, model, batch_size):
+        self.model = model
+        self.batch_size = batch_size
+        self.rows = []
+        self.written = 0
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            db.session.execute(insert(self.model), self.rows)
+            db.session.commit()
+            self.written += len(self.rows)
+            self.rows = []
+
+
+"""
+Table Generators
+"""
+
+def _cards(generator, count, prefix, batch_size):
+    rows = [{
+        "card_number": f"{prefix}-{index:07d}",
+        "card_name": _name(generator, index),
+        "card_type": _weighted_choice(generator, CARD_TYPE_WEIGHTS),
+        "card_rarity": _weighted_choice(generator, CARD_RARITY_WEIGHTS),
+    } for index in range(count)]
+    return _insert_returning_ids(Card, rows, batch_size)
+
+
+def _simple_rows(model, generator, count, batch_size, make_row):
+    rows = [make_row(generator, index) for index in range(count)]
+    return _insert_returning_ids(model, rows, batch_size)
+
+
+def _decklists(generator, deck_ids, card_ids, batch_size):
+    """
+    Fill every deck with 50 cards, made up of up to 4 copies of each 
+    distinct card.
+    """
+    writer = _BatchWriter(Decklist, batch_size)
+    for deck_id in deck_ids:
+        remaining = DECK_SIZE
+        used_cards = set()
+        while remaining > 0 and len(used_cards) < len(card_ids):
+            card_id = generator.choice(card_ids)
+            if card_id in used_cards:
+                continue
+            used_cards.add(card_id)
+
+            # Most cards in a competitive list are run as a full playset
+            quantity = min(
+                generator.choices((1, 2, 3, 4), weights = (10, 15, 20, 55))[0],
+                remaining
+            )
+            remaining -= quantity
+            writer.add({
+                "deck_id": deck_id, 
+                "card_id": card_id, 
+                "card_quantity": quantity
+            })
+    writer.flush()
+    return writer.written
+
+
+def _collections(generator, player_ids, deck_ids, batch_size):
+    """
+    Give every player between 1 and 5 decks. Returns each player's 
+    collection IDs so registrations can use a deck the player owns.
+    """
+    rows = []
+    owners = []
+    for player_id in player_ids:
+        owned = min(generator.randint(1, 5), len(deck_ids))
+        for deck_id in generator.sample(deck_ids, owned):
+            rows.append({"player_id": player_id, "deck_id": deck_id})
+            owners.append(player_id)
+
+    collection_ids = _insert_returning_ids(Collection, rows, batch_size)
+    player_collections = {}
+    for player_id, collection_id in zip(owners, collection_ids):
+        player_collections.setdefault(player_id, []).append(collection_id)
+    return player_collections
+
+
+def _event_status(generator, event_date, reference_date):
+    """
+    Past events have mostly been completed, events happening on the 
+    reference date are running and future events are planned or on 
+    hold. A few of each are cancelled.
+    """
+    if generator.random() < 0.05:
+        return EventStatus.Cancelled
+    if event_date < reference_date:
+        return EventStatus.Completed
+    if event_date == reference_date:
+        return EventStatus.Running
+    return EventStatus.Onhold if generator.random() < 0.1 else EventStatus.Planned
+
+
+def _events(generator, count, organiser_ids, venue_ids, batch_size, reference_date):
+    rows = []
+    for index in range(count):
+        event_date = reference_date + timedelta(
+            days = generator.randint(-EVENT_DAYS_BEFORE, EVENT_DAYS_AFTER)
+        )
+        rows.append({
+            "organiser_id": generator.choice(organiser_ids),
+            "venue_id": generator.choice(venue_ids),
+            "event_name": f"{generator.choice(NAME_PARTS)} Cup {index}",
+            "player_cap": _weighted_choice(generator, PLAYER_CAP_WEIGHTS),
+            "event_date": event_date,
+            "event_details": "Synthetic event generated for load testing.",
+            "event_status": _event_status(generator, event_date, reference_date),
+        })
+    return list(zip(_insert_returning_ids(Event, rows, batch_size), rows))
+
+
+def _swiss_results(generator, player_count, finished):
+    """
+    Play out a Swiss event for the given number of players. Every player 
+    has a hidden skill that decides how often they win. Finished events 
+    play every round, running events are part way through.
+    """
+    rounds = max(1, math.ceil(math.log2(max(player_count, 2))))
+    if not finished:
+        rounds = generator.randint(1, rounds)
+
+    results = []
+    for _ in range(player_count):
+        skill = generator.random()
+        wins = losses = ties = 0
+        for _ in range(rounds):
+            roll = generator.random()
+            if roll < 0.04:
+                ties += 1
+            elif roll < 0.04 + 0.96 * (0.25 + 0.5 * skill):
+                wins += 1
+            else:
+                losses += 1
+        results.append((wins, losses, ties))
+    return results
+
+
+def _registrations_and_rankings(generator, events, player_ids, player_collections, batch_size):
+    """
+    Register players for every event that is not cancelled, filling it 
+    close to its player cap, and record W/L/T results for the events 
+    that are running or completed.
+    """
+    registrations = _BatchWriter(Registration, batch_size)
+    rankings = _BatchWriter(Ranking, batch_size)
+
+    for event_id, event in events:
+        if event["event_status"] == EventStatus.Cancelled:
+            continue
+
+        # Popular events sell out, smaller ones come close
+        attendance = int(event["player_cap"] * generator.uniform(0.85, 1.0))
+        attendees = generator.sample(player_ids, min(attendance, len(player_ids)))
+
+        for player_id in attendees:
+            # A few players register before choosing a deck
+            collections = player_collections.get(player_id)
+            if collections and generator.random() > 0.05:
+                registered_deck = generator.choice(collections)
+            else:
+                registered_deck = None
+
+            registrations.add({
+                "event_id": event_id,
+                "player_id": player_id,
+                "registered_deck": registered_deck,
+                "registration_date": event["event_date"] - timedelta(
+                    days = generator.randint(1, 60)
+                ),
+            })
+
+        if event["event_status"] not in (EventStatus.Completed, EventStatus.Running):
+            continue
+
+        # Place players by points, placements are only final once the 
+        # event has been completed
+        finished = event["event_status"] == EventStatus.Completed
+        results = _swiss_results(generator, len(attendees), finished)
+        standings = sorted(
+            zip(attendees, results), 
+            key = lambda entry: 3 * entry[1][0] + entry[1][2], 
+            reverse = True
+        )
+        for placement, (player_id, (wins, losses, ties)) in enumerate(standings, 1):
+            rankings.add({
+                "player_id": player_id,
+                "event_id": event_id,
+                "placement": placement if finished else 0,
+                "points": 3 * wins + ties,
+                "wins": wins,
+                "losses": losses,
+                "ties": ties,
+            })
+
+    registrations.flush()
+    rankings.flush()
+    return registrations.written, rankings.written
+
+
+def generate(counts, seed = 0, batch_size = 5000, report = print, reference_date = REFERENCE_DATE):
+    """
+    Generate a full synthetic data set. The counts dictionary gives the 
+    number of cards, decks, players, organisers, venues and events to 
+    create, decklists, collections, registrations and rankings follow 
+    from those. Every date is worked out from the reference date. The 
+    report function is called with a line of progress after each table.
+    """
+    generator = random.Random(seed)
+
+    # Card numbers include the seed so data sets with different seeds 
+    # can be loaded into the same database
+    card_ids = _cards(generator, counts["cards"], f"SYN{seed}", batch_size)
+    report(f"{len(card_ids)} cards generated.")
+
+    deck_ids = _simple_rows(Deck, generator, counts["decks"], batch_size, 
+        lambda generator, index: {"deck_name": _name(generator, index)})
+    report(f"{len(deck_ids)} decks generated.")
+
+    player_ids = _simple_rows(Player, generator, counts["players"], batch_size, 
+        lambda generator, index: {"player_name": _name(generator, index)})
+    report(f"{len(player_ids)} players generated.")
+
+    organiser_ids = _simple_rows(Organiser, generator, counts["organisers"], batch_size, 
+        lambda generator, index: {
+            "organiser_name": f"{generator.choice(NAME_PARTS)} Games {index}",
+            "organiser_email": f"events{index}@example.com",
+            "organiser_number": f"02{generator.randint(0, 99999999):08d}",
+        })
+    report(f"{len(organiser_ids)} organisers generated.")
+
+    venue_ids = _simple_rows(Venue, generator, counts["venues"], batch_size, 
+        lambda generator, index: {
+            "venue_name": f"{generator.choice(NAME_PARTS)} Hall {index}",
+            "venue_address": f"{generator.randint(1, 999)} Synthetic St",
+            "venue_number": f"03{generator.randint(0, 99999999):08d}",
+        })
+    report(f"{len(venue_ids)} venues generated.")
+
+    decklist_count = _decklists(generator, deck_ids, card_ids, batch_size)
+    report(f"{decklist_count} decklist entries generated.")
+
+    player_collections = _collections(generator, player_ids, deck_ids, batch_size)
+    report(f"{sum(map(len, player_collections.values()))} collections generated.")
+
+    events = _events(
+        generator, counts["events"], organiser_ids, venue_ids, batch_size, reference_date
+    )
+    report(f"{len(events)} events generated.")
+
+    registration_count, ranking_count = _registrations_and_rankings(
+        generator, events, player_ids, player_collections, batch_size
+    )
+    report(f"{registration_count} registrations generated.")
+    report(f"{ranking_count} rankings generated.")
+
+    # Fill in the event registration counts the player caps are 
+    # checked against
+    recount_registrations()
+
+    mark_written(db.session, *(
+        model.__tablename__ for model in (
+            Card, Deck, Player, Organiser, Venue, Decklist, 
+            Collection, Event, Registration, Ranking
+        )
+    ))
+    db.session.commit()
@@ -0,0 +1,251 @@
+"""
+This file keeps version numbers for every table in the database. 
+Whenever a commit writes to a table, whether through a create, update 
+or delete route or through a cascade (deleting a card also deletes 
+its decklists), the version of each table touched is bumped. Cached 
+responses and ETags are built from the versions of the tables they 
+were read from, so a single write makes every stale copy unreachable 
+without having to hunt each one down.
+
+Alongside the table wide version, each primary and foreign key value 
+of a written row gets its own version (for example 'rankings.event_id=3'). 
+A request filtered on '?event_id=3' then only changes version when a 
+ranking at that event is written, not on every ranking in the table.
+
+The versions are kept in the 'table_versions' table and bumped by the 
+transaction that made the writes, just before it is committed, so every 
+gunicorn worker sees a write the moment it is committed and a rolled 
+back transaction never bumps anything. All the keys of a transaction 
+are bumped with one multi-row INSERT ... ON CONFLICT DO UPDATE, in key 
+order so two transactions never wait on each other's keys in turn, and 
+the rows are only locked for the length of the commit.
+"""
+
+# Installed import packages
+from flask import request
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Local imports
+from init import db
+from models.table_version import TableVersion
+
+
+class TableVersions:
+    """
+    The current version number of each table and filter key, read from 
+    and written to the database. Keys that have never been written to 
+    are at version 0.
+    """
+
+    # Keys bumped per statement, keeping well under the limit on bound 
+    # parameters of a statement
+    batch_size = 1000
+
+    def current(self, keys):
+        """
+        Return the current version of each of the given keys, in the 
+        same order as they were given, read in a single query.
+        """
+        statement = select(TableVersion.version_key, TableVersion.version).where(
+            TableVersion.version_key.in_(set(keys))
+        )
+        versions = dict(db.session.execute(statement).all())
+        return tuple(versions.get(key, 0) for key in keys)
+
+    def bump(self, session, keys):
+        """
+        Move each of the given keys on to its next version in the 
+        session's transaction. Returns the new version of each key.
+        """
+        dialect = session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+        keys = sorted(keys)
+        versions = {}
+        for start in range(0, len(keys), self.batch_size):
+            statement = insert(TableVersion).values([
+                {"version_key": key, "version": 1} 
+                for key in keys[start:start + self.batch_size]
+            ])
+            statement = statement.on_conflict_do_update(
+                index_elements = [TableVersion.version_key],
+                set_ = {"version": TableVersion.version + 1}
+            ).returning(TableVersion.version_key, TableVersion.version)
+            versions.update(session.execute(statement).all())
+        return versions
+
+
+# Create a single instance of the version store that the rest of the 
+# code refers to
+table_versions = TableVersions()
+
+
+def filter_key(table, column, value):
+    """
+    The version key for the rows of a table with the given column value.
+    """
+    return f"{table}.{column}={value}"
+
+
+def whole_table_key(table):
+    """
+    The version key bumped when a statement writes to a table without 
+    saying which rows it changed. Every filtered version of the table 
+    includes it.
+    """
+    return f"{table}.*"
+
+
+def tracked_columns(model):
+    """
+    Return the names of the columns that get their own versions, these 
+    are the primary and foreign keys the routes filter and look up on.
+    """
+    table = inspect(model).local_table
+    return tuple(
+        column.key for column in table.columns 
+        if column.primary_key or column.foreign_keys
+    )
+
+
+def mark_written(session, *tables):
+    """
+    Record that the current transaction has written to these tables. 
+    The ORM does this automatically on every flush, but statements that 
+    bypass the ORM, such as bulk inserts and updates, are never seen by 
+    the flush hooks. Call this after any of them, before the commit, or 
+    the cached responses and ETags built from these tables will go on 
+    being served. As it is not known which rows were written, every 
+    filtered version of these tables is moved on as well.
+    """
+    written = session.info.setdefault("written_tables", set())
+    for table in tables:
+        written.add(table)
+        written.add(whole_table_key(table))
+
+
+def mark_rows_written(session, table, **columns):
+    """
+    Record that the current transaction has written the rows of a table
+    with these key values, given as a list of values for each column
+    (event_id = [3], player_id = [1, 2]). Like mark_written this is for
+    statements that bypass the ORM, but when it is known which rows
+    they wrote. Only the versions of those key values are moved on, so
+    the filtered versions of the table for other key values are kept.
+    """
+    written = session.info.setdefault("written_tables", set())
+    written.add(table)
+    for column, values in columns.items():
+        written.update(filter_key(table, column, value) for value in values)
+
+
+def _record_flushed_tables(session, flush_context):
+    """
+    After each flush note down the tables and key values of every 
+    object that was added, changed or deleted, including those removed 
+    by a cascade. Both the old and new values of a changed key are 
+    recorded, as the row has left one filter and joined another.
+    """
+    written = session.info.setdefault("written_tables", set())
+    for instance in session.new | session.dirty | session.deleted:
+        state = inspect(instance)
+        table = state.mapper.local_table.name
+        written.add(table)
+
+        for column in tracked_columns(state.mapper):
+            history = state.attrs[column].history
+            for value in (*history.added, *history.unchanged, *history.deleted):
+                if value is not None:
+                    written.add(filter_key(table, column, value))
+
+
+def _bump_written_tables(session):
+    """
+    Just before the transaction is committed, bump the version of every 
+    table and key it wrote to. The session is flushed first, as the 
+    commit's own flush comes after this hook. The new versions are kept 
+    for hooks that run once the commit has gone through.
+    """
+    session.flush()
+    session.info.pop("committed_versions", None)
+    written = session.info.pop("written_tables", None)
+    if written:
+        session.info["committed_versions"] = table_versions.bump(session, written)
+
+
+def _forget_rolled_back_tables(session):
+    """
+    Nothing was written if the transaction was rolled back.
+    """
+    session.info.pop("written_tables", None)
+    session.info.pop("committed_versions", None)
+
+
+def track_table_writes():
+    """
+    Attach the version tracking to every SQLAlchemy session. This is 
+    safe to call more than once, for example when the app factory is 
+    called again in a test or benchmark run.
+    """
+    listeners = (
+        ("after_flush", _record_flushed_tables),
+        ("before_commit", _bump_written_tables),
+        ("after_rollback", _forget_rolled_back_tables),
+    )
+    for identifier, listener in listeners:
+        if not event.contains(Session, identifier, listener):
+            event.listen(Session, identifier, listener)
+
+
+def _key_value(value):
+    """
+    Return a filter value as the controllers would read it, or None if 
+    the controllers would ignore it ('?event_id=abc' or '?event_id=0').
+    """
+    try:
+        return int(value) or None
+    except (TypeError, ValueError):
+        return None
+
+
+def request_version_keys(model, tables, filters = ()):
+    """
+    Work out the version keys a read of the model depends on for the 
+    current request. When the route looks the model's table up on a key 
+    column ('/cards/<card_id>') or the request uses one of the route's 
+    key filters ('?event_id='), only the versions of those key values 
+    are used for it. The other tables the response reads nested data 
+    from use their table wide versions.
+    """
+    table = model.__tablename__
+    columns = tracked_columns(model)
+    arguments = {
+        name: request.args.get(name) for name in filters if name in columns
+    }
+    arguments.update(
+        (name, value) for name, value in (request.view_args or {}).items() 
+        if name in columns
+    )
+
+    keyed = [
+        filter_key(table, name, _key_value(value)) 
+        for name, value in arguments.items() 
+        if _key_value(value) is not None
+    ]
+    if keyed:
+        keys = [whole_table_key(table), *keyed]
+    else:
+        keys = [table]
+    keys.extend(other for other in tables if other != table)
+    return tuple(keys)
+
+
+def request_versions(model, tables, filters = ()):
+    """
+    Return the version keys and their current versions for a read of 
+    the model in the current request.
+    """
+    keys = request_version_keys(model, tables, filters)
+    return tuple(zip(keys, table_versions.current(keys)))